@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+"""
+Benchmark comparing the memory usage and throughput of the slotted ApiObject,
+with and without declared fields, with the previous, dictionary based,
+implementation.
+
+Run from the root of the repository using:
+
+    $ python -m benchmarks.objects
+"""
+
+from typing import Any, Callable, Dict, List
+import argparse
+import timeit
+import tracemalloc
+
+from transip.base import ApiObject
+from transip.v6.objects import DnsEntry
+
+
+class LegacyApiObject:
+    """The ApiObject as it was before using __slots__."""
+
+    _id_attr = None
+
+    def __init__(self, service, attrs) -> None:
+        self.__dict__.update(
+            {
+                "service": service,
+                "_attrs": attrs,
+                "_updated_attrs": {}
+            }
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self.__dict__["_updated_attrs"][name]
+        except KeyError:
+            try:
+                return self.__dict__["_attrs"][name]
+            except KeyError:
+                raise AttributeError(name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self.__dict__["_updated_attrs"][name] = value
+
+    @property
+    def attrs(self):
+        attrs = self.__dict__["_updated_attrs"].copy()
+        attrs.update(self.__dict__["_attrs"])
+        return attrs
+
+
+def _make_entries(count: int) -> List[Dict[str, Any]]:
+    """Return the attributes of the given number of DNS entries."""
+    return [
+        {
+            "name": f"host{i}",
+            "expire": 86400,
+            "type": "A",
+            "content": f"10.0.{i // 256 % 256}.{i % 256}"
+        }
+        for i in range(count)
+    ]
+
+
+def _measure_memory(cls: Callable, entries: List[Dict[str, Any]]) -> float:
+    """Return the memory used by the objects, excluding the attributes."""
+    tracemalloc.start()
+    objs = [cls(None, attrs) for attrs in entries]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objs
+    return size / len(entries)
+
+
+def _measure(func: Callable[[], object], number: int) -> float:
+    """Return the average duration of a single call in nanoseconds."""
+    return min(timeit.repeat(func, number=1, repeat=3)) / number * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-n", "--number", type=int, default=200000)
+    args = parser.parse_args()
+
+    entries = _make_entries(args.number)
+    print(f"{'':<16} {'bytes/obj':>10} {'create':>10} {'getattr':>10} "
+          f"{'attrs':>10}")
+    classes = (
+        ("legacy", LegacyApiObject),
+        ("ApiObject", ApiObject),
+        ("DnsEntry", DnsEntry),
+    )
+    for name, cls in classes:
+        objs = [cls(None, attrs) for attrs in entries]
+        results = (
+            _measure_memory(cls, entries),
+            _measure(lambda: [cls(None, attrs) for attrs in entries],
+                     args.number),
+            _measure(lambda: [obj.content for obj in objs], args.number),
+            _measure(lambda: [obj.attrs for obj in objs], args.number),
+        )
+        print(f"{name:<16} {results[0]:>10.1f} {results[1]:>8.1f}ns "
+              f"{results[2]:>8.1f}ns {results[3]:>8.1f}ns")
+
+
+if __name__ == "__main__":
+    main()
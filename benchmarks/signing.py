@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+"""
+Micro-benchmark comparing signing messages with and without reusing the parsed
+private key.
+
+Run from the root of the repository using:
+
+    $ python -m benchmarks.signing
+"""
+
+from typing import Callable
+import argparse
+import json
+import timeit
+
+from transip.utils import (
+    MessageSigner, load_rsa_private_key, generate_nonce
+)
+from tests.utils import PRIVATE_KEY
+
+
+def _sign_parsing_key(message: str) -> str:
+    """Sign a message, parsing the private key for every message."""
+    return MessageSigner(load_rsa_private_key(PRIVATE_KEY)).sign(message)
+
+
+def _measure(func: Callable[[], object], number: int) -> float:
+    """Return the average duration of a single call in microseconds."""
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-n", "--number", type=int, default=200)
+    args = parser.parse_args()
+
+    message: str = json.dumps({
+        "login": "testuser",
+        "nonce": generate_nonce(32),
+        "read_only": False,
+        "global_key": False
+    })
+    signer = MessageSigner(PRIVATE_KEY)
+    messages = [message] * args.number
+
+    results = {
+        "parse key per message": _measure(
+            lambda: _sign_parsing_key(message), args.number
+        ),
+        "MessageSigner.sign": _measure(
+            lambda: signer.sign(message), args.number
+        ),
+        "MessageSigner.sign_many": _measure(
+            lambda: signer.sign_many(messages), 1
+        ) / args.number,
+    }
+
+    baseline = results["parse key per message"]
+    for name, duration in results.items():
+        print(f"{name:<24} {duration:>10.1f} us/message "
+              f"{baseline / duration:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
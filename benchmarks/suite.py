@@ -0,0 +1,360 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+"""
+Benchmark suite for the hot paths of the client, running offline against the
+API responses in tests/fixtures scaled up to a large synthetic account.
+
+For every benchmark the throughput, the number of memory blocks allocated and
+still held after a single call, and the peak memory used by a single call are
+measured. The results can be stored as a baseline to compare later runs with,
+failing if any benchmark regressed by more than the tolerance.
+
+Run from the root of the repository using:
+
+    $ python -m benchmarks.suite --save before.json
+    $ python -m benchmarks.suite --compare before.json
+
+Without a path the baseline in benchmarks/baseline.json is used, which is
+stored using the json codec. As the throughput depends on the machine, only
+its memory usage is compared by default when using tox:
+
+    $ tox -e benchmark
+
+Update the baseline along with changes which intentionally affect the
+memory usage, using:
+
+    $ python -m benchmarks.suite --codec json --save
+"""
+
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+import argparse
+import copy
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+import requests
+from requests.adapters import BaseAdapter
+
+from transip import TransIP
+from transip.transport import (
+    MemoryTransport, RequestsTransport, TransportResponse
+)
+from transip.utils import generate_message_signature, generate_nonce
+from transip.v6.objects import DnsEntry
+from tests.utils import PRIVATE_KEY
+
+
+FIXTURES: str = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.realpath(__file__))),
+    "tests", "fixtures"
+)
+
+BASELINE: str = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), "baseline.json"
+)
+
+# The keys of the fixtures which are made unique when scaling up a list
+_UNIQUE_KEYS: Tuple[str, ...] = ("name", "invoiceNumber", "id", "content")
+
+
+class _StaticAdapter(BaseAdapter):
+    """
+    Transport adapter answering every request with the same response, to
+    measure the requests library without any network access.
+    """
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> Any:
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'{"ping": "pong"}'
+        response.request = request
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+def scale(body: Any, count: int) -> Any:
+    """
+    Return the response with every list of objects repeated up to the given
+    number of objects, making the identifying attributes unique.
+    """
+    if not isinstance(body, dict):
+        return body
+    scaled: Dict[str, Any] = {}
+    for key, value in body.items():
+        if (isinstance(value, list) and value and
+                isinstance(value[0], dict)):
+            value = [
+                _make_unique(copy.deepcopy(value[i % len(value)]), i)
+                for i in range(count)
+            ]
+        scaled[key] = value
+    return scaled
+
+
+def _make_unique(obj: Dict[str, Any], index: int) -> Dict[str, Any]:
+    for key in _UNIQUE_KEYS:
+        if isinstance(obj.get(key), str):
+            obj[key] = f"{index}-{obj[key]}"
+            break
+        if isinstance(obj.get(key), int):
+            obj[key] = obj[key] + index
+            break
+    return obj
+
+
+def load_fixtures(count: int) -> Dict[Tuple[str, str], Tuple[int, Any]]:
+    """
+    Return the status code and JSON body of all fixtures by method and URL,
+    scaled up to count objects.
+    """
+    fixtures: Dict[Tuple[str, str], Tuple[int, Any]] = {}
+    for name in sorted(os.listdir(FIXTURES)):
+        if not name.endswith(".json"):
+            continue
+        with open(os.path.join(FIXTURES, name)) as fixture:
+            for item in json.load(fixture):
+                fixtures[(item["method"].upper(), item["url"])] = (
+                    item["status"], scale(item.get("json"), count)
+                )
+    return fixtures
+
+
+def make_client(count: int, codec: str = "auto") -> TransIP:
+    """
+    Return a client of which the requests are answered by the fixtures from
+    memory, so only the client itself is measured.
+    """
+    transport = MemoryTransport()
+    for (method, url), (status, body) in load_fixtures(count).items():
+        transport.add(method, url, status, json=body)
+    return TransIP(
+        access_token="ACCESS_TOKEN", transport=transport, codec=codec
+    )
+
+
+def _bench_list(client: TransIP, count: int) -> Callable[[], Any]:
+    dns = client.domains.get("example.com").dns  # type: ignore
+    return dns.list
+
+
+def _bench_objects(client: TransIP, count: int) -> Callable[[], Any]:
+    service = client.domains.get("example.com").dns  # type: ignore
+    entries = client.get(service.path)["dnsEntries"]
+    return lambda: [DnsEntry(service, attrs) for attrs in entries]
+
+
+def _bench_replace(client: TransIP, count: int) -> Callable[[], Any]:
+    service = client.domains.get("example.com").dns  # type: ignore
+    entries = service.list()
+    for entry in entries[::2]:
+        entry.expire = 300
+    return lambda: service._get_replace_data(entries)
+
+
+def _bench_encode(client: TransIP, count: int) -> Callable[[], Any]:
+    service = client.domains.get("example.com").dns  # type: ignore
+    data = service._get_replace_data(service.list())
+    return lambda: client.codec.encode(data)
+
+
+def _bench_path(client: TransIP, count: int) -> Callable[[], Any]:
+    service = client.domains.get("example.com").dns  # type: ignore
+    return lambda: service.path
+
+
+def _bench_prepare(client: TransIP, count: int) -> Callable[[], Any]:
+    return lambda: client._prepare_request(
+        "PATCH", "/domains/example.com/dns", json={"dnsEntry": {}}
+    )
+
+
+def _bench_requests_transport(
+    client: TransIP,
+    count: int
+) -> Callable[[], Any]:
+    transport = RequestsTransport()
+    transport.session.mount("https://", _StaticAdapter())
+    request = client._prepare_request("GET", "/api-test")
+    return lambda: transport.send(request)
+
+
+def _bench_signature(client: TransIP, count: int) -> Callable[[], Any]:
+    message: str = json.dumps({
+        "login": "testuser",
+        "nonce": generate_nonce(32),
+        "read_only": False,
+        "global_key": False
+    })
+    return lambda: generate_message_signature(message, PRIVATE_KEY)
+
+
+def _bench_validate(client: TransIP, count: int) -> Callable[[], Any]:
+    response: TransportResponse = client.transport.send(
+        client._prepare_request("GET", "/domains")
+    )
+    return lambda: client._validate_response(response)
+
+
+# The benchmarks by name, each returning the function to measure
+BENCHMARKS: Dict[str, Callable[[TransIP, int], Callable[[], Any]]] = {
+    "ListMixin.list": _bench_list,
+    "ApiObject": _bench_objects,
+    "ReplaceMixin.replace": _bench_replace,
+    "JSONCodec.encode": _bench_encode,
+    "ApiService.path": _bench_path,
+    "TransIP._prepare_request": _bench_prepare,
+    "RequestsTransport.send": _bench_requests_transport,
+    "generate_message_signature": _bench_signature,
+    "_validate_response": _bench_validate,
+}
+
+
+def measure(func: Callable[[], Any], number: int) -> Dict[str, float]:
+    """
+    Return the calls per second, the number of memory blocks allocated and
+    still held after a single call, and the peak memory in KiB of a single
+    call.
+    """
+    # Warm up any caches before measuring
+    func()
+    duration = min(timeit.repeat(func, number=number, repeat=3)) / number
+
+    tracemalloc.start()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    del result
+
+    return {
+        "calls_per_second": 1 / duration,
+        "blocks": sum(stat.count for stat in snapshot.statistics("filename")),
+        "peak_kib": peak / 1024,
+    }
+
+
+def compare(
+    results: Mapping[str, Mapping[str, float]],
+    baseline: Mapping[str, Mapping[str, float]],
+    tolerance: float,
+    throughput: bool = True
+) -> List[str]:
+    """
+    Return the regressions compared to the baseline, i.e. a throughput which
+    dropped, or memory usage which grew, by more than the tolerance. The
+    throughput is only compared if enabled.
+    """
+    regressions: List[str] = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if throughput and result["calls_per_second"] < (
+                base["calls_per_second"] * (1 - tolerance)):
+            regressions.append(f"{name}: throughput")
+        for metric in ("blocks", "peak_kib"):
+            if result[metric] > base[metric] * (1 + tolerance) + 1:
+                regressions.append(f"{name}: {metric}")
+    return regressions
+
+
+def _format_change(value: float, base: Optional[float]) -> str:
+    if not base:
+        return ""
+    return f"{(value - base) / base * 100:+6.1f}%"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "-c", "--count", type=int, default=1000,
+        help="the number of objects in every list response"
+    )
+    parser.add_argument(
+        "-n", "--number", type=int, default=20,
+        help="the number of calls per measurement"
+    )
+    parser.add_argument(
+        "-b", "--benchmark", action="append", choices=sorted(BENCHMARKS),
+        help="the benchmark to run, defaults to all benchmarks"
+    )
+    parser.add_argument(
+        "--codec", default="auto", choices=("auto", "orjson", "ujson", "json"),
+        help="the JSON codec of the client, default auto"
+    )
+    parser.add_argument(
+        "--save", nargs="?", const=BASELINE,
+        help="store the results as baseline, default benchmarks/baseline.json"
+    )
+    parser.add_argument(
+        "--compare", nargs="?", const=BASELINE,
+        help="compare with a stored baseline, default benchmarks/baseline.json"
+    )
+    parser.add_argument(
+        "--memory-only", action="store_true",
+        help="only compare the memory usage, e.g. with a baseline stored on "
+             "another machine"
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.1,
+        help="the allowed relative regression when comparing, default 0.1"
+    )
+    args = parser.parse_args()
+
+    baseline: Dict[str, Dict[str, float]] = {}
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+
+    client = make_client(args.count, args.codec)
+    results: Dict[str, Dict[str, float]] = {}
+    print(f"{'':<28} {'calls/s':>12} {'':>7} {'blocks':>8} {'':>7} "
+          f"{'peak KiB':>10} {'':>7}")
+    for name in args.benchmark or BENCHMARKS:
+        result = measure(BENCHMARKS[name](client, args.count), args.number)
+        results[name] = result
+        base = baseline.get(name, {})
+        changes = [
+            _format_change(result[metric], base.get(metric))
+            for metric in ("calls_per_second", "blocks", "peak_kib")
+        ]
+        print(f"{name:<28} {result['calls_per_second']:>12.1f} "
+              f"{changes[0]:>7} {result['blocks']:>8} {changes[1]:>7} "
+              f"{result['peak_kib']:>10.1f} {changes[2]:>7}")
+
+    if args.save:
+        with open(args.save, "w") as baseline_file:
+            json.dump(results, baseline_file, indent=2, sort_keys=True)
+    if baseline:
+        regressions = compare(
+            results, baseline, args.tolerance, not args.memory_only
+        )
+        for regression in regressions:
+            print(f"Regression in {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -40,7 +40,12 @@ setup(
     url="https://github.com/roaldnefs/python-transip",
     packages=find_packages(),
     include_package_data=True,
-    install_requires=["cryptography>=3.3.1", "requests>=2.25.1"],
+    install_requires=[
+        "cryptography>=3.3.1",
+        "requests>=2.25.1",
+        "urllib3>=1.21.1,<3",
+        "contextvars>=2.4; python_version < '3.7'",
+    ],
     python_requires=">=3.6",
     entry_points={},
     classifiers=[
@@ -23,7 +23,9 @@ import unittest
 from typing import List, Dict, Any, Union
 
 from transip import TransIP
-from transip.v6.objects import Domain, WhoisContact, Nameserver, DnsEntry
+from transip.v6.objects import (
+    Domain, WhoisContact, Nameserver, DnsEntry, DnsEntryKey
+)
 from tests.utils import load_responses_fixtures
 
 
@@ -99,6 +101,18 @@ class DomainsTest(unittest.TestCase):
         entry: DnsEntry = entries[0]
         self.assertEqual(entry.content, "127.0.0.1")  # type: ignore
 
+    @responses.activate
+    def test_dns_stream(self) -> None:
+        """
+        Check if the DNS records for a single domain can be streamed.
+        """
+        domain: Domain = self.client.domains.get("example.com")  # type: ignore
+        entries: List[DnsEntry] = list(domain.dns.stream())  # type: ignore
+
+        self.assertEqual(len(entries), 1)
+        self.assertIsInstance(entries[0], DnsEntry)
+        self.assertEqual(entries[0].content, "127.0.0.1")  # type: ignore
+
     @responses.activate
     def test_dns_replace(self) -> None:
         """
@@ -215,3 +229,182 @@ class DomainsTest(unittest.TestCase):
         # the listing of the DNS entries and the deletion of a single DNS
         # entry.
         self.assertEqual(len(responses.calls), 3)
+
+    @responses.activate
+    def test_dns_sync_unchanged(self) -> None:
+        """Check if syncing the current DNS entries doesn't change any."""
+        domain: Domain = self.client.domains.get("example.com")  # type: ignore
+        report = domain.dns.sync(domain.dns.list())  # type: ignore
+
+        self.assertFalse(report.changed)
+        self.assertEqual(report.unchanged, 1)
+        self.assertEqual(report.calls, 0)
+        self.assertEqual(len(responses.calls), 3)
+
+    @responses.activate
+    def test_dns_sync_update(self) -> None:
+        """Check if the content of a DNS entry is updated in place."""
+        domain: Domain = self.client.domains.get("example.com")  # type: ignore
+        report = domain.dns.sync([{  # type: ignore
+            "name": "www", "expire": 86400, "type": "A", "content": "127.0.0.2"
+        }])
+
+        self.assertEqual(report.updated, [(
+            DnsEntryKey("www", "A", "127.0.0.1", 86400),
+            DnsEntryKey("www", "A", "127.0.0.2", 86400)
+        )])
+        self.assertEqual(report.created, [])
+        self.assertEqual(report.deleted, [])
+        self.assertFalse(report.replaced)
+        self.assertEqual(responses.calls[-1].request.method, "PATCH")
+
+    @responses.activate
+    def test_dns_sync_replace(self) -> None:
+        """Check if all DNS entries can be replaced at once when syncing."""
+        domain: Domain = self.client.domains.get("example.com")  # type: ignore
+        report = domain.dns.sync([{  # type: ignore
+            "name": "www", "expire": 86400, "type": "A", "content": "127.0.0.2"
+        }], replace=True)
+
+        self.assertTrue(report.replaced)
+        self.assertEqual(report.calls, 1)
+        self.assertEqual(responses.calls[-1].request.method, "PUT")
+
+    @responses.activate
+    def test_dns_sync_delete(self) -> None:
+        """Check if the DNS entries which aren't desired are deleted."""
+        domain: Domain = self.client.domains.get("example.com")  # type: ignore
+        report = domain.dns.sync([])  # type: ignore
+
+        self.assertEqual(report.deleted, [
+            DnsEntryKey("www", "A", "127.0.0.1", 86400)
+        ])
+        self.assertEqual(responses.calls[-1].request.method, "DELETE")
+
+    def test_dns_sync_plan(self) -> None:
+        """Check if the cheapest way to apply the changes is chosen."""
+        domain = Domain(self.client.domains, {"name": "example.com"})
+        zone = [
+            {"name": f"host{i}", "expire": 300, "type": "A", "content": "::1"}
+            for i in range(500)
+        ]
+
+        # Changing a few entries of a large zone is done one by one
+        desired = zone[:-2] + [
+            {"name": "www", "expire": 300, "type": "CNAME", "content": "@"}
+        ]
+        report = domain.dns._get_sync_report(zone, desired)  # type: ignore
+        self.assertEqual(len(report.created), 1)
+        self.assertEqual(len(report.deleted), 2)
+        self.assertEqual(report.unchanged, 498)
+        self.assertFalse(report.replaced)
+
+        # Changing the expire of all entries is done at once
+        desired = [dict(entry, expire=60) for entry in zone]
+        report = domain.dns._get_sync_report(zone, desired)  # type: ignore
+        self.assertEqual(len(report.created), 500)
+        self.assertEqual(len(report.deleted), 500)
+        self.assertTrue(report.replaced)
+        self.assertEqual(report.calls, 1)
+
+        # Never replace all entries at once, if told so
+        report = domain.dns._get_sync_report(  # type: ignore
+            zone, desired, replace=False
+        )
+        self.assertEqual(report.calls, 1000)
+
+    def test_dns_sync_threshold(self) -> None:
+        """Check if all entries are replaced once half the zone changes."""
+        domain = Domain(self.client.domains, {"name": "example.com"})
+        zone = [
+            {"name": f"host{i}", "expire": 300, "type": "A", "content": "::1"}
+            for i in range(10)
+        ]
+
+        # A few changes in a small zone are applied one by one
+        desired = zone[:8] + [dict(entry, expire=60) for entry in zone[8:]]
+        report = domain.dns._get_sync_report(zone, desired)  # type: ignore
+        self.assertEqual(report.calls, 4)
+        self.assertFalse(report.replaced)
+
+        # Changing half of the entries is still done one by one
+        desired = zone[:5] + [
+            dict(entry, content="::2") for entry in zone[5:]
+        ]
+        report = domain.dns._get_sync_report(zone, desired)  # type: ignore
+        self.assertEqual(len(report.updated), 5)
+        self.assertFalse(report.replaced)
+
+        # Changing more than half of the entries is done at once
+        desired = zone[:4] + [
+            dict(entry, content="::2") for entry in zone[4:]
+        ]
+        report = domain.dns._get_sync_report(zone, desired)  # type: ignore
+        self.assertEqual(report.calls, 1)
+        self.assertTrue(report.replaced)
+
+    def test_dns_entry_key(self) -> None:
+        entry = DnsEntry(None, {
+            "name": "www", "expire": 86400, "type": "A", "content": "127.0.0.1"
+        })
+        self.assertEqual(
+            entry.key, DnsEntryKey("www", "A", "127.0.0.1", 86400)
+        )
+        entry.content = "127.0.0.2"
+        self.assertEqual(entry.key.content, "127.0.0.2")
+
+
+class DomainsPaginationTest(unittest.TestCase):
+    """Test listing the domains page by page."""
+
+    client: TransIP
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Set up a minimal TransIP client for using the domain services."""
+        cls.client = TransIP(access_token='ACCESS_TOKEN')
+
+    def setUp(self) -> None:
+        """Setup mocked responses for two pages of domains."""
+        pages: List[List[str]] = [
+            ["example.com", "example.net"], ["example.org"]
+        ]
+        for page, names in enumerate(pages, start=1):
+            responses.add(
+                responses.GET,
+                "https://api.transip.nl/v6/domains",
+                json={"domains": [{"name": name} for name in names]},
+                match=[
+                    responses.matchers.query_param_matcher(  # type: ignore
+                        {"page": str(page), "pageSize": "2"}
+                    )
+                ]
+            )
+
+    @responses.activate
+    def test_iter(self) -> None:
+        domains = self.client.domains.iter(page_size=2)  # type: ignore
+
+        self.assertEqual(
+            [domain.get_id() for domain in domains],
+            ["example.com", "example.net", "example.org"]
+        )
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_iter_prefetch(self) -> None:
+        domains = self.client.domains.iter(  # type: ignore
+            page_size=2, prefetch=True
+        )
+
+        self.assertEqual(next(domains).get_id(), "example.com")
+        self.assertEqual(len(list(domains)), 2)
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_list_page_size(self) -> None:
+        domains: List[Domain] = self.client.domains.list(  # type: ignore
+            page_size=2
+        )
+
+        self.assertEqual(len(domains), 3)
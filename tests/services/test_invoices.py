@@ -21,9 +21,11 @@ from typing import List, Tuple, Any, Dict, Optional
 import responses  # type: ignore
 import unittest
 import tempfile
+import datetime
 import os
 
 from transip import TransIP
+from transip.exceptions import TransIPHTTPError, TransIPIOError
 from transip.v6.objects import Invoice, InvoiceItem
 from tests.utils import load_responses_fixtures
 
@@ -82,3 +84,64 @@ class InvoicesTest(unittest.TestCase):
             expected = os.path.join(tmp_dir, f"{invoice_id}.pdf")
             actual = invoice.pdf(tmp_dir)
             self.assertEqual(actual, expected)
+
+            # The PDF data is decoded while it's streamed
+            with open(expected, 'rb') as pdf_file:
+                self.assertTrue(pdf_file.read().startswith(b"cm9zZXMgYXJl"))
+            self.assertEqual(os.listdir(tmp_dir), [f"{invoice_id}.pdf"])
+
+            # Existing files aren't overwritten
+            self.assertRaises(TransIPIOError, invoice.pdf, tmp_dir)
+
+    @responses.activate
+    def test_download_all(self) -> None:
+        """
+        Check if all invoices are downloaded once, skipping existing files.
+        """
+        invoice_id = "F0000.1911.0000.0004"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            report = self.client.invoices.download_all(  # type: ignore
+                tmp_dir, since="2020-01-01", max_workers=2
+            )
+            expected = os.path.join(tmp_dir, f"{invoice_id}.pdf")
+            self.assertEqual(report.downloaded, [expected])
+            self.assertEqual(report.skipped, [])
+            self.assertEqual(report.failed, {})
+            self.assertEqual(report.bytes, os.path.getsize(expected))
+            self.assertGreater(report.bytes_per_second, 0)
+
+            report = self.client.invoices.download_all(tmp_dir)  # type: ignore
+            self.assertEqual(report.downloaded, [])
+            self.assertEqual(report.skipped, [expected])
+
+        # Invoices created before the given date are ignored
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            report = self.client.invoices.download_all(  # type: ignore
+                tmp_dir, since=datetime.date(2020, 1, 2)
+            )
+            self.assertEqual(report.downloaded, [])
+            self.assertEqual(report.skipped, [])
+
+        with self.assertRaises(TransIPIOError):
+            self.client.invoices.download_all(  # type: ignore
+                os.path.join(tmp_dir, "missing")
+            )
+
+    @responses.activate
+    def test_download_all_failure(self) -> None:
+        """
+        Check if a failing download is reported without leaving a file behind.
+        """
+        invoice_id = "F0000.1911.0000.0004"
+        responses.replace(
+            responses.GET,
+            f"https://api.transip.nl/v6/invoices/{invoice_id}/pdf",
+            json={"error": "Internal error"}, status=500
+        )
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            report = self.client.invoices.download_all(tmp_dir)  # type: ignore
+            self.assertEqual(report.downloaded, [])
+            self.assertIsInstance(report.failed[invoice_id], TransIPHTTPError)
+            self.assertEqual(os.listdir(tmp_dir), [])
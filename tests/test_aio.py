@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+
+from typing import Any, Awaitable, List
+import asyncio
+import os
+import tempfile
+import responses  # type: ignore
+import unittest
+
+from transip.aio import AsyncTransIP
+from transip.aio.v6.objects import Domain, DnsEntry, Invoice, SshKey
+from tests.utils import load_responses_fixtures
+
+
+def run(coro: Awaitable[Any]) -> Any:
+    """
+    Run a coroutine until it is completed, in a new event loop as
+    asyncio.run() requires Python 3.7.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class AsyncTransIPTest(unittest.TestCase):
+    """Test the asynchronous TransIP client class and its services."""
+
+    client: AsyncTransIP
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Set up a minimal asynchronous TransIP client."""
+        cls.client = AsyncTransIP(access_token='ACCESS_TOKEN')
+
+    def setUp(self) -> None:
+        """Setup mocked responses for the used endpoints."""
+        load_responses_fixtures("general.json")
+        load_responses_fixtures("account.json")
+        load_responses_fixtures("domains.json")
+
+    @responses.activate
+    def test_api_test(self) -> None:
+        self.assertTrue(run(self.client.api_test.test()))  # type: ignore
+
+    def test_lazy_authentication(self) -> None:
+        """
+        Test if the private key is only read when the first request is made,
+        instead of when the client is created on the event loop.
+        """
+        async def test() -> None:
+            client = AsyncTransIP(
+                login="testuser", private_key_file="/nonexistent.pem"
+            )
+            with self.assertRaises(RuntimeError):
+                await client.api_test.test()  # type: ignore
+            await client.close()
+
+        run(test())
+
+    @responses.activate
+    def test_domains_get(self) -> None:
+        domain: Domain = run(
+            self.client.domains.get("example.com")  # type: ignore
+        )
+
+        self.assertIsInstance(domain, Domain)
+        self.assertEqual(domain.get_id(), "example.com")  # type: ignore
+
+    @responses.activate
+    def test_dns_list_and_update(self) -> None:
+        async def list_and_update() -> List[DnsEntry]:
+            domain = await self.client.domains.get(  # type: ignore
+                "example.com"
+            )
+            entries = await domain.dns.list()
+            entries[0].content = "127.0.0.2"
+            await entries[0].update()
+            return entries
+
+        entries: List[DnsEntry] = run(list_and_update())
+
+        self.assertEqual(len(entries), 1)
+        self.assertIsInstance(entries[0], DnsEntry)
+        self.assertEqual(len(responses.calls), 3)
+
+    @responses.activate
+    def test_dns_sync(self) -> None:
+        async def sync() -> Any:
+            domain = await self.client.domains.get(  # type: ignore
+                "example.com"
+            )
+            return await domain.dns.sync([{
+                "name": "www", "expire": 86400, "type": "A",
+                "content": "127.0.0.2"
+            }])
+
+        report = run(sync())
+
+        self.assertEqual(len(report.updated), 1)
+        self.assertEqual(responses.calls[-1].request.method, "PATCH")
+
+    @responses.activate
+    def test_concurrent_requests(self) -> None:
+        async def list_concurrently() -> List[Any]:
+            return await asyncio.gather(
+                self.client.invoices.list(),  # type: ignore
+                self.client.ssh_keys.list(),  # type: ignore
+                self.client.products.list(),  # type: ignore
+            )
+
+        invoices, ssh_keys, products = run(list_concurrently())
+
+        self.assertIsInstance(invoices[0], Invoice)
+        self.assertIsInstance(ssh_keys[0], SshKey)
+        self.assertEqual(len(products), 5)
+
+    @responses.activate
+    def test_map(self) -> None:
+        async def fail(name: str) -> Any:
+            raise ValueError(name)
+
+        async def list_dns() -> List[Any]:
+            domains = await self.client.domains.list()  # type: ignore
+            return await self.client.map(
+                lambda domain: domain.dns.list(), domains, max_workers=2
+            ) + await self.client.map(fail, ["example.com"])
+
+        results = run(list_dns())
+
+        self.assertEqual(len(results[0]), 1)
+        self.assertIsInstance(results[0][0], DnsEntry)
+        self.assertIsInstance(results[-1], ValueError)
+
+    @responses.activate
+    def test_stream(self) -> None:
+        async def stream() -> List[Any]:
+            return [
+                ssh_key async for ssh_key in self.client.ssh_keys.stream()  # type: ignore
+            ]
+
+        ssh_keys = run(stream())
+
+        self.assertEqual(len(ssh_keys), 1)
+        self.assertIsInstance(ssh_keys[0], SshKey)
+
+    @responses.activate
+    def test_invoice_items_list(self) -> None:
+        async def list_items() -> List[Any]:
+            invoice = await self.client.invoices.get(  # type: ignore
+                "F0000.1911.0000.0004"
+            )
+            return await invoice.items.list()
+
+        items = run(list_items())
+
+        self.assertEqual(len(items), 1)
+        self.assertEqual(items[0].product, "Big Storage Disk 2000 GB")
+
+    @responses.activate
+    def test_invoices_download_all(self) -> None:
+        invoice_id = "F0000.1911.0000.0004"
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            report = run(
+                self.client.invoices.download_all(tmp_dir)  # type: ignore
+            )
+            expected = os.path.join(tmp_dir, f"{invoice_id}.pdf")
+            self.assertEqual(report.downloaded, [expected])
+            self.assertEqual(report.failed, {})
+            self.assertEqual(report.bytes, os.path.getsize(expected))
+
+    @responses.activate
+    def test_ssh_key_delete_object(self) -> None:
+        async def delete() -> None:
+            ssh_key = await self.client.ssh_keys.get(123)  # type: ignore
+            await ssh_key.delete()
+
+        run(delete())
+
+        self.assertEqual(len(responses.calls), 2)
+        self.assertEqual(responses.calls[1].request.method, "DELETE")
+
+    @responses.activate
+    def test_iter_prefetch(self) -> None:
+        responses.reset()
+        for page, names in enumerate([["a.com", "b.com"], []], start=1):
+            responses.add(
+                responses.GET,
+                "https://api.transip.nl/v6/domains",
+                json={"domains": [{"name": name} for name in names]},
+                match=[
+                    responses.matchers.query_param_matcher(  # type: ignore
+                        {"page": str(page), "pageSize": "2"}
+                    )
+                ]
+            )
+
+        async def iterate() -> List[Any]:
+            return [
+                domain async for domain in self.client.domains.iter(  # type: ignore
+                    page_size=2, prefetch=True
+                )
+            ]
+
+        domains = run(iterate())
+
+        self.assertEqual([domain.name for domain in domains], ["a.com", "b.com"])
+        self.assertEqual(len(responses.calls), 2)
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import responses  # type: ignore
+import threading
+import time
+import unittest
+
+from transip import TransIP
+from transip.exceptions import TransIPHTTPError
+from transip.testing import make_access_token
+from tests.utils import PRIVATE_KEY
+
+
+AUTH_URL: str = "https://api.transip.nl/v6/auth"
+API_TEST_URL: str = "https://api.transip.nl/v6/api-test"
+
+
+class AccessTokenRefreshTest(unittest.TestCase):
+    """Test refreshing the access token of the TransIP client."""
+
+    def setUp(self) -> None:
+        self.old_token: str = make_access_token(time.time() + 1800)
+        self.new_token: str = make_access_token(time.time() + 3600)
+
+    def _create_client(self) -> TransIP:
+        responses.add(
+            responses.POST, AUTH_URL, json={"token": self.old_token}
+        )
+        responses.add(
+            responses.POST, AUTH_URL, json={"token": self.new_token}
+        )
+        return TransIP(login="testuser", private_key=PRIVATE_KEY)
+
+    @responses.activate
+    def test_reauthenticate_on_401(self) -> None:
+        client: TransIP = self._create_client()
+        responses.add(responses.GET, API_TEST_URL, status=401)
+        responses.add(responses.GET, API_TEST_URL, json={"ping": "pong"})
+
+        self.assertTrue(client.api_test.test())  # type: ignore
+
+        # The initial authentication, the failed request, the
+        # reauthentication and the retried request
+        self.assertEqual(len(responses.calls), 4)
+        self.assertEqual(
+            responses.calls[3].request.headers["Authorization"],
+            f"Bearer {self.new_token}"
+        )
+
+    @responses.activate
+    def test_reauthenticate_once(self) -> None:
+        client: TransIP = self._create_client()
+        responses.add(responses.GET, API_TEST_URL, status=401)
+
+        with self.assertRaises(TransIPHTTPError) as context:
+            client.api_test.test()  # type: ignore
+
+        self.assertEqual(context.exception.response_code, 401)
+        self.assertEqual(len(responses.calls), 4)
+
+    @responses.activate
+    def test_no_reauthenticate_with_access_token(self) -> None:
+        client: TransIP = TransIP(access_token="ACCESS_TOKEN")
+        responses.add(responses.GET, API_TEST_URL, status=401)
+
+        with self.assertRaises(TransIPHTTPError):
+            client.api_test.test()  # type: ignore
+
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_refresh_stale_token_once(self) -> None:
+        client: TransIP = self._create_client()
+
+        client._refresh_access_token(self.old_token)
+        # The access token has already been replaced
+        client._refresh_access_token(self.old_token)
+
+        self.assertEqual(len(responses.calls), 2)
+        self.assertEqual(
+            client.headers["Authorization"], f"Bearer {self.new_token}"
+        )
+
+    @responses.activate
+    def test_refresh_expiring_token(self) -> None:
+        client: TransIP = self._create_client()
+        responses.add(responses.GET, API_TEST_URL, json={"ping": "pong"})
+        client._token_expires = time.time() + 10
+
+        client.api_test.test()  # type: ignore
+
+        self.assertEqual(responses.calls[1].request.url, AUTH_URL)
+        self.assertEqual(
+            responses.calls[2].request.headers["Authorization"],
+            f"Bearer {self.new_token}"
+        )
+
+    @responses.activate
+    def test_refresh_token_in_background(self) -> None:
+        client: TransIP = self._create_client()
+        responses.add(responses.GET, API_TEST_URL, json={"ping": "pong"})
+        client._token_expires = time.time() + 120
+
+        client.api_test.test()  # type: ignore
+        client._refresh_thread.join()  # type: ignore
+
+        self.assertEqual(
+            client.headers["Authorization"], f"Bearer {self.new_token}"
+        )
+
+    @responses.activate
+    def test_request_during_background_refresh(self) -> None:
+        release = threading.Event()
+
+        def slow_auth(request):
+            release.wait(5)
+            return 201, {}, json.dumps({"token": self.new_token})
+
+        responses.add(
+            responses.POST, AUTH_URL, json={"token": self.old_token}
+        )
+        responses.add_callback(responses.POST, AUTH_URL, callback=slow_auth)
+        responses.add(responses.GET, API_TEST_URL, json={"ping": "pong"})
+        client: TransIP = TransIP(login="testuser", private_key=PRIVATE_KEY)
+        client._token_expires = time.time() + 120
+
+        try:
+            # The first request starts the refresh, the second one is made
+            # while the refresh is still running
+            start: float = time.monotonic()
+            client.api_test.test()  # type: ignore
+            client.api_test.test()  # type: ignore
+            self.assertLess(time.monotonic() - start, 1)
+            self.assertTrue(client._refresh_thread.is_alive())  # type: ignore
+            self.assertEqual(
+                responses.calls[-1].request.headers["Authorization"],
+                f"Bearer {self.old_token}"
+            )
+        finally:
+            release.set()
+        client._refresh_thread.join()  # type: ignore
+
+        self.assertEqual(
+            client.headers["Authorization"], f"Bearer {self.new_token}"
+        )
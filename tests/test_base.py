@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+
+import copy
+import pickle
+import unittest
+
+from transip.v6.objects import DnsEntry, Domain
+
+
+class ApiObjectTest(unittest.TestCase):
+    """Test the ApiObject."""
+
+    def setUp(self) -> None:
+        self.attrs = {"name": "www", "type": "A", "content": "127.0.0.1"}
+        self.entry = DnsEntry(None, self.attrs)
+
+    def test_fields(self) -> None:
+        self.assertEqual(
+            DnsEntry._fields, ("name", "expire", "type", "content")
+        )
+        for field in DnsEntry._fields:
+            self.assertIn(field, DnsEntry.__slots__)  # type: ignore
+
+    def test_getattr(self) -> None:
+        self.assertEqual(self.entry.content, "127.0.0.1")  # type: ignore
+        # Fields missing from the API response aren't set
+        self.assertFalse(hasattr(self.entry, "expire"))
+        with self.assertRaises(AttributeError):
+            self.entry.unknown  # type: ignore
+
+    def test_getattr_unknown_field(self) -> None:
+        domain = Domain(None, {"name": "example.com", "isPremium": True})
+        self.assertEqual(domain.name, "example.com")  # type: ignore
+        self.assertTrue(domain.isPremium)  # type: ignore
+        self.assertEqual(domain.get_id(), "example.com")
+
+    def test_setattr(self) -> None:
+        self.assertEqual(self.entry._updated_attrs, {})
+
+        self.entry.content = "127.0.0.2"
+        self.entry.name = "www"
+        self.entry.comment = "Web server"
+
+        self.assertEqual(self.entry.content, "127.0.0.2")  # type: ignore
+        self.assertEqual(self.entry.comment, "Web server")  # type: ignore
+        # Fields set to the value returned by the API aren't changed
+        self.assertEqual(self.entry._updated_attrs, {
+            "content": "127.0.0.2", "comment": "Web server"
+        })
+        # The attributes returned by the API are left untouched
+        self.assertEqual(self.attrs["content"], "127.0.0.1")
+
+    def test_attrs(self) -> None:
+        attrs = self.entry.attrs
+        self.assertEqual(dict(attrs), self.attrs)
+        with self.assertRaises(TypeError):
+            attrs["content"] = "127.0.0.2"  # type: ignore
+
+        self.entry.expire = 300
+        self.entry.content = "127.0.0.2"
+        # The original value is given for changed attributes
+        self.assertEqual(self.entry.attrs["content"], "127.0.0.1")
+        self.assertEqual(self.entry.attrs["expire"], 300)
+        self.assertEqual(len(self.entry.attrs), 4)
+
+    def test_no_instance_dict(self) -> None:
+        self.assertFalse(hasattr(self.entry, "__dict__"))
+        self.assertIs(type(self.entry), DnsEntry)
+        # Reading the attributes doesn't create the updated attributes
+        self.entry.attrs
+        self.entry._updated_attrs
+        self.assertIsNone(self.entry._updated)
+
+        class CustomDnsEntry(DnsEntry):
+            pass
+
+        entry = CustomDnsEntry(None, self.attrs)
+        self.assertIs(type(entry), CustomDnsEntry)
+        self.assertEqual(entry.content, "127.0.0.1")  # type: ignore
+
+    def test_init_error(self) -> None:
+        class FailingAttrs(dict):
+            def __getitem__(self, key):
+                raise ValueError(key)
+
+        entry = DnsEntry.__new__(DnsEntry)
+        with self.assertRaises(ValueError):
+            entry.__init__(None, FailingAttrs(self.attrs))  # type: ignore
+        # The object is left as an instance of its own class
+        self.assertIs(type(entry), DnsEntry)
+
+    def test_copy(self) -> None:
+        self.entry.content = "127.0.0.2"
+        self.entry.comment = "Web server"
+        for entry in (copy.copy(self.entry), pickle.loads(
+                pickle.dumps(self.entry))):
+            self.assertEqual(entry.name, "www")  # type: ignore
+            self.assertEqual(entry.content, "127.0.0.2")  # type: ignore
+            self.assertIsNone(entry.service)
+            self.assertEqual(entry._updated_attrs, {
+                "content": "127.0.0.2", "comment": "Web server"
+            })
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+
+from typing import Any
+from unittest import mock
+import responses  # type: ignore
+import unittest
+
+from transip import TransIP
+from transip.cache import ResponseCache
+from transip.transport import MemoryTransport, TransportResponse
+from tests.utils import load_responses_fixtures
+
+
+class ResponseCacheTest(unittest.TestCase):
+    """Test the in-memory response cache."""
+
+    def test_lookup(self) -> None:
+        cache = ResponseCache()
+        key = cache.make_key("/domains", {"page": 1})
+        cache.store(key, {"domains": []})
+
+        self.assertEqual(cache.lookup(key), (True, {"domains": []}))
+        self.assertEqual(
+            cache.lookup(cache.make_key("/domains")), (False, None)
+        )
+        self.assertEqual(cache.stats["hits"], 1)
+        self.assertEqual(cache.stats["misses"], 1)
+
+    def test_make_key(self) -> None:
+        cache = ResponseCache()
+        key = cache.make_key("/domains", {"tags": ["a", "b"], "page": 1})
+        cache.store(key, {"domains": []})
+
+        self.assertTrue(cache.lookup(cache.make_key(
+            "/domains", {"page": 1, "tags": ["a", "b"]}
+        ))[0])
+        self.assertFalse(cache.lookup(cache.make_key(
+            "/domains", {"page": 1, "tags": ["a", "b"]}, scope="other"
+        ))[0])
+
+    def test_ttl(self) -> None:
+        cache = ResponseCache(ttl=10, ttls={"/products": 3600})
+        self.assertEqual(cache.get_ttl("/domains"), 10)
+        self.assertEqual(cache.get_ttl("/products"), 3600)
+        self.assertEqual(cache.get_ttl("/products/vps/elements"), 3600)
+        self.assertEqual(cache.get_ttl("/products-other"), 10)
+
+        key = cache.make_key("/domains")
+        with mock.patch("transip.cache.time.monotonic", return_value=100.0):
+            cache.store(key, {})
+        with mock.patch("transip.cache.time.monotonic", return_value=111.0):
+            self.assertEqual(cache.lookup(key), (False, None))
+        self.assertEqual(len(cache), 0)
+
+    def test_lru_eviction(self) -> None:
+        cache = ResponseCache(maxsize=2)
+        keys = [cache.make_key(f"/vps/{index}") for index in range(3)]
+        cache.store(keys[0], 0)
+        cache.store(keys[1], 1)
+        # Use the first response to make the second the least recently used
+        cache.lookup(keys[0])
+        cache.store(keys[2], 2)
+
+        self.assertTrue(cache.lookup(keys[0])[0])
+        self.assertFalse(cache.lookup(keys[1])[0])
+        self.assertTrue(cache.lookup(keys[2])[0])
+        self.assertEqual(cache.stats["evictions"], 1)
+
+    def test_invalidate(self) -> None:
+        cache = ResponseCache()
+        for path in ["/ssh-keys", "/ssh-keys/123", "/ssh-keys/1234", "/vps"]:
+            cache.store(cache.make_key(path), path)
+
+        cache.invalidate("/ssh-keys/123")
+
+        self.assertFalse(cache.lookup(cache.make_key("/ssh-keys"))[0])
+        self.assertFalse(cache.lookup(cache.make_key("/ssh-keys/123"))[0])
+        self.assertTrue(cache.lookup(cache.make_key("/ssh-keys/1234"))[0])
+        self.assertTrue(cache.lookup(cache.make_key("/vps"))[0])
+
+    def test_store_after_invalidate(self) -> None:
+        cache = ResponseCache()
+        key = cache.make_key("/ssh-keys")
+        generation = cache.generation
+
+        # A response received before an invalidation isn't stored
+        cache.invalidate("/vps")
+        cache.store(key, "stale", generation)
+        self.assertFalse(cache.lookup(key)[0])
+
+        cache.store(key, "fresh", cache.generation)
+        self.assertEqual(cache.lookup(key), (True, "fresh"))
+
+
+class ClientCacheTest(unittest.TestCase):
+    """Test caching the responses of the TransIP client."""
+
+    def setUp(self) -> None:
+        load_responses_fixtures("account.json")
+        self.cache = ResponseCache()
+        self.client = TransIP(access_token='ACCESS_TOKEN', cache=self.cache)
+
+    @responses.activate
+    def test_list_cached(self) -> None:
+        self.client.ssh_keys.list()  # type: ignore
+        ssh_keys = self.client.ssh_keys.list()  # type: ignore
+
+        self.assertEqual(len(ssh_keys), 1)
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(self.cache.stats["hits"], 1)
+
+    @responses.activate
+    def test_get_cached(self) -> None:
+        self.client.ssh_keys.get(123)  # type: ignore
+        ssh_key = self.client.ssh_keys.get(123)  # type: ignore
+
+        self.assertEqual(ssh_key.get_id(), 123)
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_update_invalidates(self) -> None:
+        self.client.ssh_keys.list()  # type: ignore
+        self.client.ssh_keys.update(  # type: ignore
+            123, {"description": "Jim key"}
+        )
+        self.client.ssh_keys.list()  # type: ignore
+
+        self.assertEqual(len(responses.calls), 3)
+        self.assertEqual(self.cache.stats["hits"], 0)
+
+    def test_invalidate_in_flight(self) -> None:
+        transport = MemoryTransport()
+        transport.add(
+            "GET", "https://api.transip.nl/v6/ssh-keys", json={"sshKeys": []}
+        )
+        client = TransIP(
+            access_token='ACCESS_TOKEN', cache=self.cache, transport=transport
+        )
+
+        def send(*args: Any, **kwargs: Any) -> TransportResponse:
+            # A modification completes while the request is in flight
+            self.cache.invalidate("/ssh-keys")
+            return MemoryTransport.send(transport, *args, **kwargs)
+
+        with mock.patch.object(transport, "send", send):
+            client.ssh_keys.list()  # type: ignore
+        client.ssh_keys.list()  # type: ignore
+
+        # The response from before the modification wasn't cached
+        self.assertEqual(len(transport.requests), 2)
+
+    def test_shared_cache(self) -> None:
+        transport = MemoryTransport()
+        for base_url in ("https://api.transip.nl", "https://example.com"):
+            transport.add(
+                "GET", f"{base_url}/v6/ssh-keys",
+                json={"sshKeys": [{"id": base_url}]}
+            )
+        clients = [
+            TransIP(access_token='ACCESS_TOKEN', cache=self.cache,
+                    transport=transport, base_url=base_url)
+            for base_url in ("https://api.transip.nl", "https://example.com")
+        ]
+
+        for client in clients * 2:
+            ssh_keys = client.ssh_keys.list()  # type: ignore
+            self.assertEqual(ssh_keys[0].get_id(), client.url[:-3])
+
+        # Every client only gets its own responses from the cache
+        self.assertEqual(len(transport.requests), 2)
+        self.assertEqual(self.cache.stats["hits"], 2)
+
+    @responses.activate
+    def test_uncached_request(self) -> None:
+        invoice = self.client.invoices.get(  # type: ignore
+            "F0000.1911.0000.0004"
+        )
+        self.client.get(f"/invoices/{invoice.get_id()}/pdf")
+        self.client.get(f"/invoices/{invoice.get_id()}/pdf")
+
+        self.assertEqual(len(responses.calls), 3)
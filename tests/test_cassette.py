@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+
+from typing import Any, List
+from unittest import mock
+import json
+import os
+import responses  # type: ignore
+import tempfile
+import unittest
+
+from transip import TransIP
+from transip.cassette import REDACTED, Cassette
+from transip.exceptions import TransIPCassetteError
+from tests.utils import PRIVATE_KEY, load_responses_fixtures
+
+
+class CassetteTest(unittest.TestCase):
+    """Test recording and replaying requests using a cassette."""
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path: str = os.path.join(self.tmp_dir.name, "session.jsonl")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def _session(self, client: TransIP) -> List[Any]:
+        """Make some requests, returning the retrieved attributes."""
+        domain = client.domains.get("example.com")  # type: ignore
+        return [
+            dict(domain.attrs),
+            [dict(entry.attrs) for entry in domain.dns.list()],
+            [dict(key.attrs) for key in client.ssh_keys.stream()],  # type: ignore
+        ]
+
+    @responses.activate
+    def _record(self, path: str) -> List[Any]:
+        load_responses_fixtures("auth.json")
+        load_responses_fixtures("account.json")
+        load_responses_fixtures("domains.json")
+        with Cassette(path, mode="record") as cassette:
+            client = TransIP(
+                login="testuser", private_key=PRIVATE_KEY, cassette=cassette
+            )
+            return self._session(client)
+
+    def test_record_and_replay(self) -> None:
+        recorded = self._record(self.path)
+
+        # Replay without any mocked responses, so any request that isn't
+        # recorded would fail
+        cassette = Cassette(self.path)
+        self.assertEqual(len(cassette), 4)
+        client = TransIP(
+            login="testuser", private_key=PRIVATE_KEY, cassette=cassette
+        )
+        replayed = self._session(client)
+
+        # Secrets are redacted
+        self.assertEqual(replayed[0]["authCode"], REDACTED)
+        recorded[0]["authCode"] = REDACTED
+        self.assertEqual(replayed, recorded)
+
+        with open(self.path) as cassette_file:
+            entries = [json.loads(line) for line in cassette_file]
+        self.assertEqual(entries[0]["path"], "/v6/auth")
+        self.assertEqual(json.loads(entries[0]["body"]), {"token": REDACTED})
+
+    def test_compressed(self) -> None:
+        path = os.path.join(self.tmp_dir.name, "session.jsonl.gz")
+        recorded = self._record(path)
+
+        client = TransIP(access_token="ACCESS_TOKEN", cassette=Cassette(path))
+        self.assertEqual(self._session(client)[1], recorded[1])
+
+    def test_missing(self) -> None:
+        self._record(self.path)
+        client = TransIP(
+            access_token="ACCESS_TOKEN", cassette=Cassette(self.path)
+        )
+
+        with self.assertRaises(TransIPCassetteError):
+            client.vpss.list()  # type: ignore
+        with self.assertRaises(TransIPCassetteError):
+            Cassette(os.path.join(self.tmp_dir.name, "missing.jsonl"))
+        with self.assertRaises(ValueError):
+            Cassette(self.path, mode="invalid")
+
+    def test_auto_mode(self) -> None:
+        self.assertEqual(Cassette(self.path, mode="auto").mode, "record")
+        self._record(self.path)
+        self.assertEqual(Cassette(self.path, mode="auto").mode, "replay")
+
+    @mock.patch("transip.cassette.time.sleep")
+    def test_simulate_latency(self, sleep: mock.MagicMock) -> None:
+        self._record(self.path)
+        client = TransIP(
+            access_token="ACCESS_TOKEN",
+            cassette=Cassette(self.path, simulate_latency=True)
+        )
+        client.domains.get("example.com")  # type: ignore
+
+        self.assertEqual(sleep.call_count, 1)
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+
+from typing import Type
+import importlib.util
+import json
+import responses  # type: ignore
+import unittest
+
+from transip import TransIP
+from transip.codec import (
+    JSONCodec, OrjsonCodec, UjsonCodec, get_codec
+)
+from transip.exceptions import TransIPHTTPError, TransIPParsingError
+from tests.utils import load_responses_fixtures
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+class CodecTestMixin:
+    """Test a JSON codec, the codec class is set by the subclasses."""
+
+    codec_class: Type[JSONCodec]
+
+    def setUp(self) -> None:
+        self.codec = self.codec_class()
+
+    def test_encode(self) -> None:
+        data = {"name": "ünïcode/€", "ttl": 300, "tags": [], "nested": None}
+        content = self.codec.encode(data)
+
+        self.assertIsInstance(content, bytes)  # type: ignore
+        self.assertNotIn(b" ", content)  # type: ignore
+        self.assertEqual(json.loads(content), data)  # type: ignore
+
+    def test_decode(self) -> None:
+        content = '{"name": "\\u00fcn\\u00efcode", "items": [1, 2.5]}'.encode()
+
+        self.assertEqual(  # type: ignore
+            self.codec.decode(content),
+            {"name": "ünïcode", "items": [1, 2.5]}
+        )
+        with self.assertRaises(ValueError):  # type: ignore
+            self.codec.decode(b'{"name": ')
+
+    @responses.activate
+    def test_client(self) -> None:
+        load_responses_fixtures("domains.json")
+        client = TransIP(access_token="ACCESS_TOKEN", codec=self.codec)
+
+        domain = client.domains.get("example.com")  # type: ignore
+        self.assertEqual(domain.name, "example.com")  # type: ignore
+        entries = domain.dns.list()
+        entries[0].content = "127.0.0.2"
+        domain.dns.replace(entries)
+
+        responses.add(
+            responses.GET, f"{client.url}/vps", body="{invalid", status=200
+        )
+        responses.add(
+            responses.GET, f"{client.url}/domains/missing.com",
+            json={"error": "Domain not found"}, status=404
+        )
+        with self.assertRaises(TransIPParsingError):  # type: ignore
+            client.vpss.list()  # type: ignore
+        with self.assertRaises(TransIPHTTPError) as context:  # type: ignore
+            client.domains.get("missing.com")  # type: ignore
+        self.assertEqual(  # type: ignore
+            context.exception.message, "Domain not found"
+        )
+
+
+class JSONCodecTest(CodecTestMixin, unittest.TestCase):
+    codec_class = JSONCodec
+
+
+@unittest.skipUnless(_installed("orjson"), "orjson isn't installed")
+class OrjsonCodecTest(CodecTestMixin, unittest.TestCase):
+    codec_class = OrjsonCodec
+
+
+@unittest.skipUnless(_installed("ujson"), "ujson isn't installed")
+class UjsonCodecTest(CodecTestMixin, unittest.TestCase):
+    codec_class = UjsonCodec
+
+
+class GetCodecTest(unittest.TestCase):
+    """Test looking up the JSON codecs by name."""
+
+    def test_get_codec(self) -> None:
+        self.assertIsInstance(get_codec("json"), JSONCodec)
+        self.assertEqual(
+            TransIP(access_token="ACCESS_TOKEN", codec="json").codec.name,
+            "json"
+        )
+        with self.assertRaises(ValueError):
+            get_codec("pickle")
+
+    def test_auto(self) -> None:
+        expected = "json"
+        for name in ("ujson", "orjson"):
+            if _installed(name):
+                expected = name
+        self.assertEqual(get_codec().name, expected)
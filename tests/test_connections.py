@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List
+from unittest import mock
+import socket
+import time
+import unittest
+
+import requests
+
+from transip import TransIP
+from transip.exceptions import TransIPHTTPError, TransIPTimeoutError
+from transip.ratelimit import RateLimiter
+from transip.retry import RetryPolicy
+from transip.testing import FakeTransIPServer
+from transip.transport import (
+    MemoryTransport, PoolAdapter, TransportRequest, TransportResponse,
+    Urllib3Transport
+)
+
+
+class _RecordingTransport(MemoryTransport):
+    """In-memory transport recording the timeout of every request."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.timeouts: List[Any] = []
+
+    def send(
+        self,
+        request: TransportRequest,
+        stream: bool = False,
+        timeout: Any = None
+    ) -> TransportResponse:
+        self.timeouts.append(timeout)
+        return super().send(request, stream=stream, timeout=timeout)
+
+
+class PoolSettingsTest(unittest.TestCase):
+    """Test the connection pool and keep-alive settings of the client."""
+
+    def test_defaults(self) -> None:
+        client = TransIP(access_token="ACCESS_TOKEN")
+        adapter: Any = client.session.get_adapter(client.url)
+
+        self.assertIsInstance(adapter, PoolAdapter)
+        self.assertEqual(adapter.poolmanager.connection_pool_kw["maxsize"], 10)
+        self.assertIn(
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+            adapter.poolmanager.connection_pool_kw["socket_options"]
+        )
+        self.assertEqual(client.timeout, (10.0, 60.0))
+
+    def test_settings(self) -> None:
+        client = TransIP(
+            access_token="ACCESS_TOKEN", pool_connections=2, pool_maxsize=32,
+            tcp_keepalive=None
+        )
+        adapter: Any = client.session.get_adapter(client.url)
+
+        self.assertEqual(adapter.poolmanager.connection_pool_kw["maxsize"], 32)
+        self.assertNotIn(
+            "socket_options", adapter.poolmanager.connection_pool_kw
+        )
+        self.assertEqual(adapter._pool_connections, 2)
+
+
+class TimeoutTest(unittest.TestCase):
+    """Test the timeouts and the deadline of the calls of the client."""
+
+    def setUp(self) -> None:
+        self.transport = _RecordingTransport()
+        self.url: str = "https://api.transip.nl/v6/api-test"
+
+    def test_timeout(self) -> None:
+        self.transport.add("GET", self.url, json={"ping": "pong"})
+        client = TransIP(
+            access_token="ACCESS_TOKEN", transport=self.transport,
+            connect_timeout=2.0, read_timeout=None
+        )
+
+        self.assertTrue(client.api_test.test())  # type: ignore
+        self.assertEqual(self.transport.timeouts, [(2.0, None)])
+
+    def test_deadline(self) -> None:
+        self.transport.add("GET", self.url, json={"ping": "pong"})
+        client = TransIP(
+            access_token="ACCESS_TOKEN", transport=self.transport,
+            deadline=5.0
+        )
+
+        self.assertTrue(client.api_test.test())  # type: ignore
+        # The timeouts are limited to the time left before the deadline
+        for timeout in self.transport.timeouts[0]:
+            self.assertLessEqual(timeout, 5.0)
+            self.assertGreater(timeout, 4.0)
+
+    def test_deadline_retry(self) -> None:
+        self.transport.add(
+            "GET", self.url, status=503, json={"error": "Unavailable"},
+            headers={"Retry-After": "2"}
+        )
+        client = TransIP(
+            access_token="ACCESS_TOKEN", transport=self.transport,
+            deadline=1.0, retry=RetryPolicy(total=5)
+        )
+
+        # The retry would start after the deadline, so the failed response
+        # is returned right away
+        start = time.monotonic()
+        with self.assertRaises(TransIPHTTPError):
+            client.api_test.test()  # type: ignore
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(len(self.transport.requests), 1)
+
+    def test_deadline_rate_limiter(self) -> None:
+        self.transport.add("GET", self.url, json={"ping": "pong"})
+        client = TransIP(
+            access_token="ACCESS_TOKEN", transport=self.transport,
+            deadline=0.1, rate_limiter=RateLimiter(limit=1, margin=0)
+        )
+
+        self.assertTrue(client.api_test.test())  # type: ignore
+        with self.assertRaises(TransIPTimeoutError):
+            client.api_test.test()  # type: ignore
+
+    def test_read_timeout(self) -> None:
+        with FakeTransIPServer(latency=0.5) as server:
+            client = TransIP(
+                access_token="ACCESS_TOKEN", base_url=server.base_url,
+                deadline=0.1, retry=RetryPolicy(total=0)
+            )
+            start = time.monotonic()
+            # The read timeout was limited by the deadline
+            with self.assertRaises(TransIPTimeoutError) as context:
+                client.api_test.test()  # type: ignore
+            self.assertLess(time.monotonic() - start, 0.4)
+            self.assertIsInstance(
+                context.exception.__cause__, requests.Timeout
+            )
+
+            # Without deadline the read timeout itself is raised
+            client = TransIP(
+                access_token="ACCESS_TOKEN", base_url=server.base_url,
+                read_timeout=0.1, retry=RetryPolicy(total=0)
+            )
+            with self.assertRaises(requests.ReadTimeout):
+                client.api_test.test()  # type: ignore
+
+
+class ConnectionsTest(unittest.TestCase):
+    """Test opening and sharing the connections of the client."""
+
+    def setUp(self) -> None:
+        self.server = FakeTransIPServer().start()
+        self.server.state.populate(domains=5)
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def _get_pool(self, client: TransIP) -> Any:
+        return client.transport._get_pool(client.url)  # type: ignore
+
+    def test_warm_up(self) -> None:
+        client = TransIP(
+            access_token="ACCESS_TOKEN", base_url=self.server.base_url,
+            pool_maxsize=4
+        )
+
+        self.assertEqual(client.warm_up(), 4)
+        # Open connections are reused
+        self.assertEqual(client.warm_up(8), 0)
+        self.assertEqual(self._get_pool(client).num_connections, 4)
+        self.assertEqual(len(client.domains.list()), 5)  # type: ignore
+        self.assertEqual(self._get_pool(client).num_connections, 4)
+
+        transport = Urllib3Transport(pool_maxsize=2)
+        client = TransIP(
+            access_token="ACCESS_TOKEN", base_url=self.server.base_url,
+            transport=transport
+        )
+        self.assertEqual(client.warm_up(), 2)
+        # Pools without the methods to take out connections aren't warmed up
+        with mock.patch.object(
+            transport.pool, "connection_from_url", return_value=object()
+        ):
+            self.assertEqual(client.warm_up(), 0)
+        transport.close()
+
+        client = TransIP(
+            access_token="ACCESS_TOKEN", transport=MemoryTransport()
+        )
+        self.assertEqual(client.warm_up(), 0)
+
+    def test_shared_client(self) -> None:
+        client = TransIP(
+            access_token="ACCESS_TOKEN", base_url=self.server.base_url,
+            pool_maxsize=8
+        )
+        def list_domains(index: int) -> int:
+            return len(client.domains.list())  # type: ignore
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(list_domains, range(200)))
+
+        self.assertEqual(results, [5] * 200)
+        # No connections were discarded because the pool was full
+        self.assertLessEqual(self._get_pool(client).num_connections, 8)
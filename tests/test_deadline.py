@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+
+from typing import Any, List
+import asyncio
+import threading
+import time
+import unittest
+
+import requests
+
+from transip import TransIP
+from transip.aio import AsyncTransIP
+from transip.deadline import Deadline, current_deadline
+from transip.exceptions import TransIPCancelledError, TransIPTimeoutError
+from transip.ratelimit import RateLimiter
+from transip.retry import RetryPolicy
+from transip.testing import FakeTransIPServer
+from transip.transport import (
+    MemoryTransport, TransportRequest, TransportResponse
+)
+from tests.test_aio import run
+
+
+class _RecordingTransport(MemoryTransport):
+    """
+    In-memory transport recording the timeout of every request, optionally
+    taking some time to respond.
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        super().__init__()
+        self.latency: float = latency
+        self.timeouts: List[Any] = []
+
+    def send(
+        self,
+        request: TransportRequest,
+        stream: bool = False,
+        timeout: Any = None
+    ) -> TransportResponse:
+        self.timeouts.append(timeout)
+        if self.latency:
+            time.sleep(self.latency)
+        return super().send(request, stream=stream, timeout=timeout)
+
+
+class DeadlineTest(unittest.TestCase):
+    """Test the Deadline class."""
+
+    def test_context(self) -> None:
+        self.assertIsNone(current_deadline())
+        with Deadline(5.0) as outer:
+            self.assertIs(current_deadline(), outer)
+            with Deadline(10.0) as inner:
+                self.assertIs(current_deadline(), inner)
+                # A nested deadline expires no later than its parent
+                self.assertEqual(inner.expires, outer.expires)
+            self.assertIs(current_deadline(), outer)
+        self.assertIsNone(current_deadline())
+
+    def test_expired(self) -> None:
+        deadline = Deadline(0.05)
+        self.assertFalse(deadline.expired)
+        self.assertLessEqual(deadline.remaining(), 0.05)  # type: ignore
+        deadline.check()
+
+        time.sleep(0.06)
+        self.assertTrue(deadline.expired)
+        self.assertEqual(deadline.remaining(), 0.0)
+        self.assertRaises(TransIPTimeoutError, deadline.check)
+
+        # A deadline without time limit never expires
+        self.assertIsNone(Deadline().remaining())
+        self.assertFalse(Deadline().expired)
+
+    def test_cancel(self) -> None:
+        parent = Deadline()
+        child = Deadline(parent=parent)
+        parent.cancel()
+
+        self.assertTrue(child.cancelled)
+        self.assertRaises(TransIPCancelledError, child.check)
+        # Deadlines created after cancelling their parent are cancelled too
+        self.assertTrue(Deadline(parent=parent).cancelled)
+        # Cancelling a child doesn't cancel its parent
+        other = Deadline()
+        Deadline(parent=other).cancel()
+        self.assertFalse(other.cancelled)
+
+    def test_sleep(self) -> None:
+        deadline = Deadline()
+        self.assertTrue(deadline.sleep(0.01))
+
+        threading.Timer(0.05, deadline.cancel).start()
+        start = time.monotonic()
+        self.assertFalse(deadline.sleep(5.0))
+        self.assertLess(time.monotonic() - start, 1.0)
+
+
+class ClientDeadlineTest(unittest.TestCase):
+    """Test the deadline of the current context in the TransIP client."""
+
+    def setUp(self) -> None:
+        self.transport = _RecordingTransport()
+        self.transport.add(
+            "GET", "https://api.transip.nl/v6/api-test", json={"ping": "pong"}
+        )
+        self.client = TransIP(
+            access_token="ACCESS_TOKEN", transport=self.transport
+        )
+
+    def test_within(self) -> None:
+        with self.client.within(5.0):
+            self.assertTrue(self.client.api_test.test())  # type: ignore
+        # The timeouts are limited to the time left before the deadline
+        for timeout in self.transport.timeouts[0]:
+            self.assertLessEqual(timeout, 5.0)
+            self.assertGreater(timeout, 4.0)
+
+        # The earliest of both deadlines applies
+        self.client.deadline = 2.0
+        with self.client.within(5.0):
+            self.client.api_test.test()  # type: ignore
+        self.assertLessEqual(self.transport.timeouts[1][0], 2.0)
+
+    def test_within_expired(self) -> None:
+        with self.client.within(0.05):
+            self.client.api_test.test()  # type: ignore
+            time.sleep(0.06)
+            with self.assertRaises(TransIPTimeoutError):
+                self.client.api_test.test()  # type: ignore
+        # No request is sent once the deadline has passed
+        self.assertEqual(len(self.transport.requests), 1)
+
+    def test_within_read_timeout(self) -> None:
+        with FakeTransIPServer(latency=0.5) as server:
+            client = TransIP(
+                access_token="ACCESS_TOKEN", base_url=server.base_url
+            )
+            start = time.monotonic()
+            with client.within(0.1):
+                with self.assertRaises(TransIPTimeoutError) as context:
+                    client.api_test.test()  # type: ignore
+            self.assertLess(time.monotonic() - start, 0.4)
+            self.assertIsInstance(
+                context.exception.__cause__, requests.Timeout
+            )
+
+    def test_cancel_retry(self) -> None:
+        self.transport = self.client.transport = _RecordingTransport()
+        self.transport.add(
+            "GET", "https://api.transip.nl/v6/api-test", status=503,
+            json={"error": "Unavailable"}, headers={"Retry-After": "10"}
+        )
+        self.client.retry = RetryPolicy(total=5)
+
+        with self.client.within() as deadline:
+            # The pending retry is abandoned once the deadline is cancelled
+            threading.Timer(0.05, deadline.cancel).start()
+            start = time.monotonic()
+            with self.assertRaises(TransIPCancelledError):
+                self.client.api_test.test()  # type: ignore
+            self.assertLess(time.monotonic() - start, 1.0)
+
+    def test_cancel_rate_limiter(self) -> None:
+        self.client.rate_limiter = RateLimiter(limit=2, period=3600, margin=1)
+        self.client.api_test.test()  # type: ignore
+
+        with self.client.within() as deadline:
+            # Waiting for the rate limiter ends once the deadline is cancelled
+            threading.Timer(0.05, deadline.cancel).start()
+            start = time.monotonic()
+            with self.assertRaises(TransIPCancelledError):
+                self.client.api_test.test()  # type: ignore
+            self.assertLess(time.monotonic() - start, 1.0)
+
+    def test_map(self) -> None:
+        self.transport.latency = 0.05
+        with self.client.within(0.12):
+            results = self.client.map(
+                lambda _: self.client.api_test.test(),  # type: ignore
+                range(8), max_workers=2
+            )
+        # The deadline is passed on to the worker threads, the pending calls
+        # are abandoned once it has passed
+        self.assertIn(True, results)
+        self.assertIsInstance(results[-1], TransIPTimeoutError)
+        self.assertLess(len(self.transport.requests), 8)
+        for timeout in self.transport.timeouts:
+            self.assertLessEqual(timeout[0], 0.12)
+
+    def test_map_cancelled(self) -> None:
+        calls: List[int] = []
+        with self.client.within() as deadline:
+            deadline.cancel()
+            results = self.client.map(calls.append, range(4))
+        self.assertEqual(calls, [])
+        for result in results:
+            self.assertIsInstance(result, TransIPCancelledError)
+
+    def test_iter_prefetch(self) -> None:
+        url = "https://api.transip.nl/v6/ssh-keys"
+        self.transport.add(
+            "GET", f"{url}?page=1&pageSize=1", json={"sshKeys": [{"id": 1}]}
+        )
+        self.transport.add("GET", url, json={"sshKeys": []})
+        with self.client.within(5.0):
+            keys = list(
+                self.client.ssh_keys.iter(  # type: ignore
+                    page_size=1, prefetch=True
+                )
+            )
+        self.assertEqual(len(keys), 1)
+        # The pages retrieved in the background are limited as well
+        for timeout in self.transport.timeouts:
+            self.assertLessEqual(timeout[0], 5.0)
+
+
+class AsyncDeadlineTest(unittest.TestCase):
+    """Test the deadlines in the asynchronous TransIP client."""
+
+    def setUp(self) -> None:
+        self.transport = _RecordingTransport()
+        self.transport.add(
+            "GET", "https://api.transip.nl/v6/api-test", json={"ping": "pong"}
+        )
+        self.client = AsyncTransIP(
+            access_token="ACCESS_TOKEN", transport=self.transport
+        )
+
+    def test_within(self) -> None:
+        async def test() -> Any:
+            with self.client.within(5.0):
+                return await self.client.api_test.test()  # type: ignore
+
+        self.assertTrue(run(test()))
+        self.assertLessEqual(self.transport.timeouts[0][0], 5.0)
+
+    def test_cancel(self) -> None:
+        self.transport = self.client.transport = _RecordingTransport()
+        self.transport.add(
+            "GET", "https://api.transip.nl/v6/api-test", status=503,
+            json={"error": "Unavailable"}, headers={"Retry-After": "10"}
+        )
+        self.client.retry = RetryPolicy(total=5)
+
+        async def test() -> None:
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    self.client.api_test.test(), 0.05  # type: ignore
+                )
+
+        run(test())
+        # The worker thread gives up the pending retry instead of waiting to
+        # send the request again
+        start = time.monotonic()
+        self.client._executor.shutdown(wait=True)
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual(len(self.transport.requests), 1)
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+
+from typing import Any, List, Optional, Tuple
+import requests
+import responses  # type: ignore
+import unittest
+
+from transip import TransIP
+from transip.instrumentation import Instrument, LatencyHistogram, path_template
+from transip.retry import RetryPolicy
+from tests.utils import load_responses_fixtures
+
+
+class RecordingInstrument(Instrument):
+    """Instrument recording all events."""
+
+    def __init__(self) -> None:
+        self.events: List[Tuple[Any, ...]] = []
+
+    def before_request(self, method: str, path: str) -> None:
+        self.events.append(("before", method, path))
+
+    def after_response(
+        self,
+        method: str,
+        path: str,
+        status: int,
+        size: Optional[int],
+        elapsed: float
+    ) -> None:
+        self.events.append(("after", method, path, status, size))
+
+    def on_error(
+        self,
+        method: str,
+        path: str,
+        error: Exception,
+        elapsed: float
+    ) -> None:
+        self.events.append(("error", method, path, type(error)))
+
+
+class InstrumentationTest(unittest.TestCase):
+    """Test the request lifecycle hooks and the latency histogram."""
+
+    def setUp(self) -> None:
+        load_responses_fixtures("domains.json")
+        self.instrument = RecordingInstrument()
+        self.histogram = LatencyHistogram()
+        self.client = TransIP(
+            access_token='ACCESS_TOKEN',
+            retry=RetryPolicy(total=0),
+            instruments=[self.instrument, self.histogram]
+        )
+
+    def test_path_template(self) -> None:
+        # Ensure the service paths are registered
+        self.assertIsNotNone(self.client.domains)
+
+        self.assertEqual(
+            path_template("/domains/example.com/dns"),
+            "/domains/{parent_id}/dns"
+        )
+        self.assertEqual(path_template("/domains/example.com"), "/domains/{id}")
+        self.assertEqual(path_template("/domains?page=2"), "/domains")
+        self.assertEqual(
+            path_template("/invoices/F0000.1911.0000.0004/pdf"),
+            "/invoices/{id}/pdf"
+        )
+
+    @responses.activate
+    def test_hooks(self) -> None:
+        domain = self.client.domains.get("example.com")  # type: ignore
+        domain.dns.list()
+
+        self.assertEqual(self.instrument.events[0], (
+            "before", "GET", "/domains/{id}"
+        ))
+        self.assertEqual(self.instrument.events[1][:4], (
+            "after", "GET", "/domains/{id}", 200
+        ))
+        self.assertGreater(self.instrument.events[1][4], 0)
+        self.assertEqual(self.instrument.events[3][:3], (
+            "after", "GET", "/domains/{parent_id}/dns"
+        ))
+
+    @responses.activate
+    def test_on_error(self) -> None:
+        responses.add(
+            responses.GET, "https://api.transip.nl/v6/api-test",
+            body=requests.ConnectionError("Connection refused")
+        )
+
+        with self.assertRaises(requests.ConnectionError):
+            self.client.api_test.test()  # type: ignore
+        self.assertEqual(self.instrument.events[-1], (
+            "error", "GET", "/api-test", requests.ConnectionError
+        ))
+        self.assertEqual(self.histogram.stats["GET /api-test"]["errors"], 1)
+
+    def test_percentiles(self) -> None:
+        histogram = LatencyHistogram(buckets=[0.1, 0.2, 0.5])
+        for elapsed in [0.05] * 50 + [0.15] * 45 + [0.4] * 4 + [2.0]:
+            histogram.after_response("GET", "/domains", 200, 10, elapsed)
+
+        stats = histogram.stats["GET /domains"]
+        self.assertEqual(stats["count"], 100)
+        self.assertEqual(stats["bytes"], 1000)
+        self.assertAlmostEqual(stats["p50"], 0.1)
+        self.assertAlmostEqual(stats["p95"], 0.2)
+        self.assertAlmostEqual(stats["p99"], 0.5)
+        self.assertAlmostEqual(histogram.percentile("GET", "/domains", 100), 2.0)
+        self.assertEqual(histogram.percentile("GET", "/vps", 50), 0.0)
+
+        histogram.reset_stats()
+        self.assertEqual(histogram.stats, {})
+
+    def test_export_prometheus(self) -> None:
+        histogram = LatencyHistogram(buckets=[0.1, 1.0])
+        histogram.after_response("GET", "/domains", 200, 10, 0.05)
+        histogram.after_response("GET", "/domains", 500, 20, 0.5)
+
+        lines = histogram.export_prometheus().splitlines()
+        labels = 'method="GET",path="/domains"'
+        self.assertIn(
+            f'transip_request_duration_seconds_bucket{{{labels},le="0.1"}} 1',
+            lines
+        )
+        self.assertIn(
+            f'transip_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2',
+            lines
+        )
+        self.assertIn(
+            f"transip_request_duration_seconds_count{{{labels}}} 2", lines
+        )
+        self.assertIn(f"transip_request_errors_total{{{labels}}} 1", lines)
+        self.assertIn(f"transip_response_bytes_total{{{labels}}} 30", lines)
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+
+import responses  # type: ignore
+import threading
+import time
+import unittest
+
+from transip import TransIP
+from transip.deadline import Deadline
+from transip.ratelimit import RateLimiter
+
+
+class RateLimiterTest(unittest.TestCase):
+    """Test the token bucket rate limiter."""
+
+    def test_acquire(self) -> None:
+        limiter = RateLimiter(limit=3, period=3600, margin=1)
+
+        self.assertEqual(limiter.remaining, 2)
+        self.assertTrue(limiter.acquire(blocking=False))
+        self.assertTrue(limiter.acquire(blocking=False))
+        self.assertFalse(limiter.acquire(blocking=False))
+        self.assertFalse(limiter.acquire(timeout=0.01))
+
+    def test_acquire_cancelled(self) -> None:
+        limiter = RateLimiter(limit=2, period=3600, margin=1)
+        limiter.acquire()
+        deadline = Deadline()
+
+        # Waiting for a token ends once the deadline is cancelled
+        threading.Timer(0.05, deadline.cancel).start()
+        start = time.monotonic()
+        self.assertFalse(limiter.acquire(deadline=deadline))
+        self.assertLess(time.monotonic() - start, 1.0)
+
+    def test_update_remaining(self) -> None:
+        limiter = RateLimiter(limit=100, margin=10)
+        limiter.update({
+            "X-Rate-Limit-Limit": "100",
+            "X-Rate-Limit-Remaining": "50",
+        })
+
+        self.assertEqual(limiter.remaining, 40)
+
+    def test_update_exhausted(self) -> None:
+        limiter = RateLimiter(limit=100, margin=10)
+        limiter.update({
+            "X-Rate-Limit-Remaining": "5",
+            "X-Rate-Limit-Reset": str(int(time.time()) + 30),
+        })
+
+        self.assertEqual(limiter.remaining, 0)
+        self.assertFalse(limiter.acquire(blocking=False))
+
+    def test_update_limit(self) -> None:
+        limiter = RateLimiter(limit=100, margin=10)
+        limiter.update({
+            "X-Rate-Limit-Limit": "500",
+            "X-Rate-Limit-Remaining": "400",
+        })
+
+        self.assertEqual(limiter.limit, 500)
+        self.assertEqual(limiter.capacity, 490)
+
+    def test_shared(self) -> None:
+        limiter = RateLimiter.shared("testuser")
+
+        self.assertIs(limiter, RateLimiter.shared("testuser"))
+        self.assertIsNot(limiter, RateLimiter.shared("otheruser"))
+
+    @responses.activate
+    def test_client(self) -> None:
+        responses.add(
+            responses.GET,
+            "https://api.transip.nl/v6/api-test",
+            json={"ping": "pong"},
+            headers={
+                "X-Rate-Limit-Limit": "1000",
+                "X-Rate-Limit-Remaining": "900",
+                "X-Rate-Limit-Reset": str(int(time.time()) + 60),
+            }
+        )
+        client = TransIP(
+            access_token='ACCESS_TOKEN',
+            rate_limiter=RateLimiter(margin=10)
+        )
+        client.api_test.test()  # type: ignore
+
+        self.assertEqual(client.rate_limit_remaining, 890)
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+
+from unittest import mock
+import requests
+import responses  # type: ignore
+import unittest
+
+from transip import TransIP
+from transip.exceptions import TransIPHTTPError
+from transip.retry import RetryPolicy
+
+
+URL: str = "https://api.transip.nl/v6/api-test"
+
+
+@mock.patch("transip.retry.time.sleep")
+class RetryTest(unittest.TestCase):
+    """Test retrying failed requests."""
+
+    def setUp(self) -> None:
+        self.retry = RetryPolicy(total=2)
+        self.client = TransIP(access_token='ACCESS_TOKEN', retry=self.retry)
+
+    @responses.activate
+    def test_retry_status(self, sleep: mock.MagicMock) -> None:
+        responses.add(responses.GET, URL, status=503)
+        responses.add(responses.GET, URL, json={"ping": "pong"}, status=200)
+
+        self.assertTrue(self.client.api_test.test())  # type: ignore
+        self.assertEqual(len(responses.calls), 2)
+        self.assertEqual(sleep.call_count, 1)
+        self.assertEqual(self.retry.stats["retries"], 1)
+        self.assertEqual(self.retry.stats["retried_requests"], 1)
+
+    @responses.activate
+    def test_retry_after(self, sleep: mock.MagicMock) -> None:
+        responses.add(
+            responses.GET, URL, status=429, headers={"Retry-After": "7"}
+        )
+        responses.add(responses.GET, URL, json={"ping": "pong"}, status=200)
+
+        self.client.api_test.test()  # type: ignore
+
+        sleep.assert_called_once_with(7.0)
+        self.assertEqual(self.retry.stats["backoff_time"], 7.0)
+
+    @responses.activate
+    def test_retry_exhausted(self, sleep: mock.MagicMock) -> None:
+        responses.add(responses.GET, URL, status=502)
+
+        with self.assertRaises(TransIPHTTPError) as context:
+            self.client.api_test.test()  # type: ignore
+
+        self.assertEqual(context.exception.response_code, 502)
+        self.assertEqual(len(responses.calls), 3)
+        self.assertEqual(self.retry.stats["exhausted"], 1)
+
+    @responses.activate
+    def test_no_retry_post(self, sleep: mock.MagicMock) -> None:
+        responses.add(responses.POST, URL, status=503)
+
+        with self.assertRaises(TransIPHTTPError):
+            self.client.post("/api-test")
+
+        self.assertEqual(len(responses.calls), 1)
+        sleep.assert_not_called()
+
+    @responses.activate
+    def test_retry_post_opt_in(self, sleep: mock.MagicMock) -> None:
+        self.client.retry = RetryPolicy(methods=("POST",))
+        responses.add(responses.POST, URL, status=503)
+        responses.add(responses.POST, URL, status=201)
+
+        self.client.post("/api-test")
+
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_retry_connection_error(self, sleep: mock.MagicMock) -> None:
+        responses.add(
+            responses.GET, URL, body=requests.ConnectionError("reset")
+        )
+        responses.add(responses.GET, URL, json={"ping": "pong"}, status=200)
+
+        self.assertTrue(self.client.api_test.test())  # type: ignore
+        self.assertEqual(len(responses.calls), 2)
+
+    def test_backoff(self, sleep: mock.MagicMock) -> None:
+        retry = RetryPolicy(backoff_factor=1.0, backoff_max=5.0)
+
+        for attempt in range(10):
+            delay = retry.get_backoff(attempt)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(5.0, 2 ** attempt))
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+
+from typing import Any, Callable, List
+import json
+import responses  # type: ignore
+import threading
+import time
+import unittest
+
+from transip import TransIP
+from transip.exceptions import TransIPTimeoutError
+from transip.singleflight import SingleFlight
+from transip.testing import FakeTransIPServer
+
+
+def wait_until(condition: Callable[[], bool], timeout: float = 5.0) -> None:
+    """Wait until the condition is met, or fail after the timeout."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Condition not met in time")
+        time.sleep(0.001)
+
+
+class SingleFlightTest(unittest.TestCase):
+    """Test collapsing identical concurrent calls."""
+
+    def run_concurrently(
+        self,
+        single_flight: SingleFlight,
+        func: Callable[[], Any],
+        count: int
+    ) -> List[Any]:
+        """
+        Call the function from multiple threads at once, returning the result
+        or exception of every thread.
+        """
+        results: List[Any] = [None] * count
+
+        def call(index: int) -> None:
+            try:
+                results[index] = single_flight.do("key", func)
+            except Exception as exc:
+                results[index] = exc
+
+        threads = [
+            threading.Thread(target=call, args=(index,))
+            for index in range(count)
+        ]
+        threads[0].start()
+        wait_until(lambda: single_flight.stats["in_flight"] == 1)
+        for thread in threads[1:]:
+            thread.start()
+        wait_until(lambda: single_flight.coalesced == count - 1)
+        self.release.set()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def setUp(self) -> None:
+        self.release = threading.Event()
+        self.calls = 0
+
+    def test_do(self) -> None:
+        single_flight = SingleFlight()
+
+        def func() -> Any:
+            self.calls += 1
+            self.release.wait()
+            return {"domains": []}
+
+        results = self.run_concurrently(single_flight, func, 5)
+
+        self.assertEqual(self.calls, 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(single_flight.stats, {
+            "calls": 1, "coalesced": 4, "in_flight": 0
+        })
+
+        # Calls made after the call in flight finished aren't collapsed
+        single_flight.do("key", func)
+        self.assertEqual(self.calls, 2)
+
+        single_flight.reset_stats()
+        self.assertEqual(single_flight.stats["coalesced"], 0)
+
+    def test_do_error(self) -> None:
+        single_flight = SingleFlight()
+
+        def func() -> Any:
+            self.release.wait()
+            raise ValueError("failed")
+
+        results = self.run_concurrently(single_flight, func, 3)
+
+        self.assertTrue(all(isinstance(exc, ValueError) for exc in results))
+        self.assertEqual(single_flight.stats["in_flight"], 0)
+
+    def test_do_timeout(self) -> None:
+        single_flight = SingleFlight()
+        thread = threading.Thread(
+            target=single_flight.do, args=("key", self.release.wait)
+        )
+        thread.start()
+        wait_until(lambda: single_flight.stats["in_flight"] == 1)
+
+        # Waiting for the call in flight is limited by the timeout
+        with self.assertRaises(TransIPTimeoutError):
+            single_flight.do("key", self.release.wait, timeout=0.01)
+        self.release.set()
+        thread.join()
+
+    def test_do_local_error(self) -> None:
+        single_flight = SingleFlight(local_errors=(TimeoutError,))
+
+        def func() -> Any:
+            self.calls += 1
+            if self.calls == 1:
+                self.release.wait()
+                raise TimeoutError("deadline of the first caller")
+            return "result"
+
+        results = self.run_concurrently(single_flight, func, 3)
+
+        # The error of the first caller isn't shared, the others make the
+        # call themselves
+        self.assertIsInstance(results[0], TimeoutError)
+        self.assertEqual(results[1:], ["result", "result"])
+        self.assertEqual(single_flight.stats["calls"], 3)
+
+    def test_make_key(self) -> None:
+        self.assertEqual(
+            SingleFlight.make_key("get", "/domains", {"b": 2, "a": 1}),
+            SingleFlight.make_key("GET", "/domains", {"a": 1, "b": 2})
+        )
+        self.assertNotEqual(
+            SingleFlight.make_key("GET", "/domains"),
+            SingleFlight.make_key("GET", "/domains", {"page": 1})
+        )
+        # Lists of values can be hashed as well
+        key = SingleFlight.make_key("GET", "/domains", {"tags": ["a", "b"]})
+        self.assertEqual(
+            hash(key),
+            hash(SingleFlight.make_key(
+                "GET", "/domains", {"tags": ["a", "b"]}
+            ))
+        )
+
+
+class TransIPSingleFlightTest(unittest.TestCase):
+    """Test collapsing identical concurrent GET requests of the client."""
+
+    @responses.activate
+    def test_concurrent_get(self) -> None:
+        release = threading.Event()
+
+        def callback(request: Any) -> Any:
+            release.wait()
+            return (200, {}, json.dumps({"dnsEntries": []}))
+
+        responses.add_callback(
+            responses.GET,
+            "https://api.transip.nl/v6/domains/example.com/dns",
+            callback=callback,
+            content_type="application/json"
+        )
+        client = TransIP(access_token="ACCESS_TOKEN")
+        single_flight: SingleFlight = client.single_flight  # type: ignore
+
+        threads = [
+            threading.Thread(
+                target=client.get, args=("/domains/example.com/dns",)
+            )
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        wait_until(lambda: single_flight.coalesced == 2)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(single_flight.stats["calls"], 1)
+
+    @responses.activate
+    def test_list_params(self) -> None:
+        responses.add(
+            responses.GET, "https://api.transip.nl/v6/domains",
+            json={"domains": []}
+        )
+        client = TransIP(access_token="ACCESS_TOKEN")
+
+        self.assertEqual(
+            client.get("/domains", params={"tags": ["a", "b"]}),
+            {"domains": []}
+        )
+        self.assertEqual(
+            responses.calls[0].request.url,
+            "https://api.transip.nl/v6/domains?tags=a&tags=b"
+        )
+
+    def test_different_deadlines(self) -> None:
+        with FakeTransIPServer(latency=0.5) as server:
+            client = TransIP(
+                access_token="ACCESS_TOKEN", base_url=server.base_url
+            )
+            single_flight: SingleFlight = client.single_flight  # type: ignore
+            results: List[Any] = [None, None]
+
+            def call(index: int, deadline: Any) -> None:
+                try:
+                    with client.within(deadline):
+                        results[index] = client.api_test.test()  # type: ignore
+                except Exception as exc:
+                    results[index] = exc
+
+            # The deadline of the first caller doesn't fail the second
+            first = threading.Thread(target=call, args=(0, 0.2))
+            first.start()
+            wait_until(lambda: single_flight.stats["in_flight"] == 1)
+            call(1, None)
+            first.join()
+            self.assertIsInstance(results[0], TransIPTimeoutError)
+            self.assertIs(results[1], True)
+            self.assertEqual(single_flight.coalesced, 1)
+
+            # The second caller doesn't wait past its own deadline
+            first = threading.Thread(target=call, args=(0, None))
+            first.start()
+            wait_until(lambda: single_flight.stats["in_flight"] == 1)
+            start = time.monotonic()
+            call(1, 0.1)
+            self.assertLess(time.monotonic() - start, 0.3)
+            first.join()
+            self.assertIs(results[0], True)
+            self.assertIsInstance(results[1], TransIPTimeoutError)
+
+    def test_disabled(self) -> None:
+        client = TransIP(access_token="ACCESS_TOKEN", coalesce=False)
+        self.assertIsNone(client.single_flight)
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+
+import unittest
+
+from transip import TransIP
+from transip.templates import HeaderTemplate, PathTemplate
+from transip.transport import MemoryTransport
+from transip.v6.objects import Domain
+
+
+class PathTemplateTest(unittest.TestCase):
+    """Test formatting precompiled paths."""
+
+    def test_format(self) -> None:
+        self.assertEqual(PathTemplate("/domains").format(), "/domains")
+        self.assertEqual(
+            PathTemplate("/domains/{parent_id}/dns").format(
+                parent_id="example.com"
+            ),
+            "/domains/example.com/dns"
+        )
+        template = PathTemplate("/vps/{vps}/firewall/{rule}")
+        self.assertEqual(template.fields, ("vps", "rule"))
+        self.assertEqual(
+            template.format(vps="vps-1", rule=3), "/vps/vps-1/firewall/3"
+        )
+        with self.assertRaises(KeyError):
+            template.format(vps="vps-1")
+
+    def test_invalid(self) -> None:
+        for template in ("/vps/{}", "/vps/{name!r}", "/vps/{name:>10}"):
+            with self.assertRaises(ValueError):
+                PathTemplate(template)
+
+
+class HeaderTemplateTest(unittest.TestCase):
+    """Test caching the headers per content type."""
+
+    def test_for_content_type(self) -> None:
+        headers = HeaderTemplate({"User-Agent": "test"})
+        plain = headers.for_content_type()
+        json = headers.for_content_type("application/json")
+
+        self.assertEqual(plain, {"User-Agent": "test"})
+        self.assertEqual(
+            json, {"User-Agent": "test", "Content-Type": "application/json"}
+        )
+        self.assertIs(headers.for_content_type(), plain)
+        self.assertIs(headers.for_content_type("application/json"), json)
+
+    def test_changed(self) -> None:
+        headers = HeaderTemplate({"User-Agent": "test"})
+        changes = [
+            lambda: headers.__setitem__("Authorization", "Bearer token"),
+            lambda: headers.update({"X-Test": "1"}),
+            lambda: headers.setdefault("X-Other", "2"),
+            lambda: headers.pop("X-Test"),
+            lambda: headers.__delitem__("X-Other"),
+            lambda: headers.clear(),
+        ]
+        for change in changes:
+            cached = headers.for_content_type()
+            change()
+            self.assertEqual(headers.for_content_type(), dict(headers))
+            self.assertIsNot(headers.for_content_type(), cached)
+
+
+class ClientTemplatesTest(unittest.TestCase):
+    """Test the templates used by the client."""
+
+    def setUp(self) -> None:
+        self.transport = MemoryTransport()
+        self.client = TransIP(
+            access_token="ACCESS_TOKEN", transport=self.transport
+        )
+
+    def test_headers(self) -> None:
+        first = self.client._prepare_request("GET", "/domains")
+        self.assertIs(
+            self.client._prepare_request("GET", "/vps").headers, first.headers
+        )
+
+        self.client.headers["X-Test"] = "1"
+        request = self.client._prepare_request("GET", "/domains")
+        self.assertEqual(request.headers["X-Test"], "1")
+        self.assertNotIn("X-Test", first.headers)
+
+        self.client.headers = {"User-Agent": "test"}
+        request = self.client._prepare_request("POST", "/domains", json={})
+        self.assertEqual(
+            request.headers,
+            {"User-Agent": "test", "Content-Type": "application/json"}
+        )
+
+    def test_service_path(self) -> None:
+        domain = Domain(self.client.domains, {"name": "example.com"})
+        dns = domain.dns  # type: ignore
+
+        self.assertEqual(dns.path, "/domains/example.com/dns")
+        self.assertIs(dns.path, dns.path)
+        domain.name = "example.org"  # type: ignore
+        self.assertEqual(dns.path, "/domains/example.org/dns")
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import tempfile
+import unittest
+
+from transip import TransIP
+from transip.exceptions import TransIPHTTPError
+from transip.retry import RetryPolicy
+from transip.testing import FakeTransIPServer
+from tests.utils import PRIVATE_KEY
+
+
+class FakeTransIPServerTest(unittest.TestCase):
+    """Test the client against the fake TransIP API server."""
+
+    server: FakeTransIPServer
+
+    def setUp(self) -> None:
+        self.server = FakeTransIPServer().start()
+        self.server.state.populate(
+            domains=3, dns_entries=5, vpss=2, invoices=2, ssh_keys=1
+        )
+        self.client = TransIP(
+            access_token="ACCESS_TOKEN", base_url=self.server.base_url,
+            retry=RetryPolicy(total=0)
+        )
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def test_authenticate(self) -> None:
+        client = TransIP(
+            login="demouser", private_key=PRIVATE_KEY,
+            base_url=self.server.base_url
+        )
+
+        self.assertTrue(client.api_test.test())  # type: ignore
+
+    def test_domains_and_dns(self) -> None:
+        domains = self.client.domains.list()  # type: ignore
+        self.assertEqual(len(domains), 3)
+
+        self.client.domains.create({"domainName": "new.com"})  # type: ignore
+        domain = self.client.domains.get("new.com")  # type: ignore
+        self.assertEqual(domain.name, "new.com")
+        self.assertEqual(len(domain.nameservers.list()), 3)
+
+        domain = self.client.domains.get("example0.com")  # type: ignore
+        entries = domain.dns.list()
+        entries[0].content = "10.1.1.1"
+        entries[0].update()
+        entries[1].delete()
+        domain.dns.create({
+            "name": "www", "expire": 300, "type": "CNAME", "content": "@"
+        })
+        contents = [entry.content for entry in domain.dns.list()]
+        self.assertEqual(len(contents), 5)
+        self.assertEqual(contents[0], "10.1.1.1")
+        self.assertEqual(contents[-1], "@")
+
+        report = domain.dns.sync([
+            {"name": "@", "expire": 300, "type": "A", "content": "10.0.0.1"}
+        ])
+        self.assertEqual(len(report.created), 1)
+        self.assertEqual(len(domain.dns.list()), 1)
+
+        self.client.domains.delete("new.com")  # type: ignore
+        with self.assertRaises(TransIPHTTPError) as context:
+            self.client.domains.get("new.com")  # type: ignore
+        self.assertEqual(context.exception.response_code, 404)
+
+    def test_pagination(self) -> None:
+        self.server.state.populate(domains=7)
+
+        domains = list(self.client.domains.iter(page_size=3))  # type: ignore
+        self.assertEqual(len(domains), 10)
+        self.assertEqual(self.server.stats["requests"], 4)
+
+    def test_pagination_unsupported(self) -> None:
+        domain = self.client.domains.get("example0.com")  # type: ignore
+
+        # The endpoints ignore the page, returning all objects on every page
+        nameservers = list(domain.nameservers.iter(page_size=2))
+        self.assertEqual(len(nameservers), 3)
+        nameservers = list(domain.nameservers.iter(page_size=3))
+        self.assertEqual(len(nameservers), 3)
+        nameservers = domain.nameservers.list(page_size=3)
+        self.assertEqual(len(nameservers), 3)
+        zones = list(
+            self.client.availability_zones.iter(  # type: ignore
+                page_size=2, prefetch=True
+            )
+        )
+        self.assertEqual(len(zones), 2)
+
+    def test_ssh_keys(self) -> None:
+        self.client.ssh_keys.create(  # type: ignore
+            {"sshKey": "ssh-rsa AAAA test", "description": "new"}
+        )
+        ssh_keys = self.client.ssh_keys.list()  # type: ignore
+        self.assertEqual(len(ssh_keys), 2)
+
+        ssh_keys[1].description = "renamed"
+        ssh_keys[1].update()
+        ssh_key = self.client.ssh_keys.get(ssh_keys[1].id)  # type: ignore
+        self.assertEqual(ssh_key.description, "renamed")
+
+        ssh_key.delete()
+        self.assertEqual(len(self.client.ssh_keys.list()), 1)  # type: ignore
+
+    def test_invoices(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            report = self.client.invoices.download_all(tmp_dir)  # type: ignore
+            self.assertEqual(len(report.downloaded), 2)
+            with open(report.downloaded[0], "rb") as pdf_file:
+                self.assertTrue(pdf_file.read().startswith(b"%PDF"))
+            self.assertEqual(len(os.listdir(tmp_dir)), 2)
+
+    def test_other_services(self) -> None:
+        self.assertEqual(len(self.client.products.list()), 2)  # type: ignore
+        self.assertEqual(len(self.client.vpss.list()), 2)  # type: ignore
+        self.assertEqual(
+            len(self.client.availability_zones.list()), 2  # type: ignore
+        )
+        self.assertEqual(self.client.colocations.list(), [])  # type: ignore
+
+    def test_errors(self) -> None:
+        self.server.error_rate = 1.0
+
+        with self.assertRaises(TransIPHTTPError) as context:
+            self.client.api_test.test()  # type: ignore
+        self.assertEqual(context.exception.response_code, 503)
+        self.assertEqual(self.server.stats["errors"], 1)
+
+    def test_throttling(self) -> None:
+        self.server.rate_limit = 2
+
+        self.client.api_test.test()  # type: ignore
+        self.client.api_test.test()  # type: ignore
+        with self.assertRaises(TransIPHTTPError) as context:
+            self.client.api_test.test()  # type: ignore
+        self.assertEqual(context.exception.response_code, 429)
+        self.assertEqual(self.server.stats["throttled"], 1)
+
+    def test_unauthorized(self) -> None:
+        self.client.headers.pop("Authorization")
+
+        with self.assertRaises(TransIPHTTPError) as context:
+            self.client.api_test.test()  # type: ignore
+        self.assertEqual(context.exception.response_code, 401)
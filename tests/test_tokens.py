@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import responses  # type: ignore
+import stat
+import tempfile
+import time
+import unittest
+
+from transip import TransIP
+from transip.tokens import FileTokenStore, MemoryTokenStore, TokenStore
+from transip.testing import make_access_token
+from tests.utils import PRIVATE_KEY
+
+
+class TokenStoreTest(unittest.TestCase):
+    """Test the stores used to reuse access tokens."""
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_make_key(self) -> None:
+        key: str = TokenStore.make_key("testuser", PRIVATE_KEY)
+
+        self.assertEqual(key, TokenStore.make_key("testuser", PRIVATE_KEY))
+        self.assertNotEqual(
+            key, TokenStore.make_key("testuser", PRIVATE_KEY, global_key=True)
+        )
+        self.assertNotEqual(
+            key, TokenStore.make_key("otheruser", PRIVATE_KEY)
+        )
+
+    def test_incomplete_store(self) -> None:
+        class IncompleteTokenStore(TokenStore):
+            def set(self, key: str, token: str, expires: float) -> None:
+                pass
+
+        # Stores missing any of the abstract methods can't be created
+        self.assertRaises(TypeError, IncompleteTokenStore)
+
+    def test_memory_store(self) -> None:
+        store = MemoryTokenStore(leeway=60)
+        store.set("valid", "TOKEN", time.time() + 3600)
+        store.set("expiring", "TOKEN", time.time() + 30)
+
+        self.assertEqual(store.get("valid"), "TOKEN")
+        self.assertIsNone(store.get("expiring"))
+        self.assertIsNone(store.get("missing"))
+
+        store.delete("valid")
+        self.assertIsNone(store.get("valid"))
+
+    def test_file_store(self) -> None:
+        store = FileTokenStore(directory=self.tmp_dir.name)
+        store.set("key", "TOKEN", time.time() + 3600)
+
+        path = os.path.join(self.tmp_dir.name, "key.json")
+        self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o600)
+        self.assertEqual(
+            FileTokenStore(directory=self.tmp_dir.name).get("key"), "TOKEN"
+        )
+
+        # Invalid files are ignored
+        with open(path, "w") as token_file:
+            token_file.write("invalid")
+        self.assertIsNone(store.get("key"))
+
+    @responses.activate
+    def test_client_reuses_token(self) -> None:
+        token: str = make_access_token(time.time() + 1800)
+        responses.add(
+            responses.POST,
+            "https://api.transip.nl/v6/auth",
+            json={"token": token},
+            status=201
+        )
+        store = FileTokenStore(directory=self.tmp_dir.name)
+
+        for _ in range(3):
+            client = TransIP(
+                login="testuser", private_key=PRIVATE_KEY, token_store=store
+            )
+            self.assertEqual(client.headers["Authorization"], f"Bearer {token}")
+
+        # Assert only the first client requested a new access token
+        self.assertEqual(len(responses.calls), 1)
@@ -21,6 +21,8 @@ import unittest
 import responses  # type: ignore
 
 from transip import TransIP
+from transip.exceptions import TransIPHTTPError
+from transip.v6.objects import DomainService
 from tests.utils import load_responses_fixtures
 
 
@@ -95,3 +97,68 @@ class TransIPTest(unittest.TestCase):
         # Assert the 'Authorization' header contains the access token returned
         # by the mocked response
         self.assertEqual(auth_header, "Bearer ACCESS_TOKEN")
+
+    @responses.activate
+    def test_lazy_authentication(self) -> None:
+        """
+        Test if lazily created TransIP instances only request an access token
+        when the first request is made.
+        """
+        load_responses_fixtures("general.json")
+        client: TransIP = TransIP(
+            login="testuser", private_key=self.privkey, lazy=True
+        )
+        self.assertEqual(len(responses.calls), 0)
+        self.assertNotIn("Authorization", client.headers)
+
+        client.api_test.test()  # type: ignore
+        client.api_test.test()  # type: ignore
+
+        # Assert the access token is only requested once
+        self.assertEqual(len(responses.calls), 3)
+        self.assertEqual(client.headers["Authorization"], "Bearer ACCESS_TOKEN")
+
+    def test_lazy_private_key_file(self) -> None:
+        """
+        Test if errors reading the private key file of lazily created TransIP
+        instances are raised when the first request is made.
+        """
+        client: TransIP = TransIP(
+            login="testuser", private_key_file="/nonexistent.pem", lazy=True
+        )
+
+        self.assertRaises(RuntimeError, client.api_test.test)  # type: ignore
+
+    def test_lazy_services(self) -> None:
+        """Test if the services are created on first access only."""
+        client: TransIP = TransIP(access_token='ACCESS_TOKEN')
+        self.assertNotIn("domains", client.__dict__)
+
+        domains: DomainService = client.domains  # type: ignore
+
+        self.assertIsInstance(domains, DomainService)
+        self.assertIs(client.domains, domains)
+
+    @responses.activate
+    def test_map(self) -> None:
+        """Test if a function is called for every item concurrently."""
+        load_responses_fixtures("domains.json")
+        responses.add(
+            responses.GET,
+            "https://api.transip.nl/v6/domains/example.org",
+            json={"error": "Domain not found"},
+            status=404
+        )
+        client: TransIP = TransIP(access_token='ACCESS_TOKEN')
+
+        results = client.map(
+            lambda name: client.domains.get(name).dns.list(),  # type: ignore
+            ["example.com", "example.org", "example.com"],
+            max_workers=2
+        )
+
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0][0].content, "127.0.0.1")  # type: ignore
+        self.assertIsInstance(results[1], TransIPHTTPError)
+        self.assertEqual(results[2][0].content, "127.0.0.1")  # type: ignore
+        self.assertEqual(client.map(len, []), [])
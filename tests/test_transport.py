@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+
+from typing import Any, Dict, List
+from unittest import mock
+import os
+import unittest
+
+import requests
+from requests.adapters import BaseAdapter
+
+from transip import TransIP
+from transip.exceptions import TransIPHTTPError
+from transip.retry import RetryPolicy
+from transip.testing import FakeTransIPServer
+from transip.transport import (
+    MemoryTransport, RequestsTransport, TransportRequest, TransportResponse,
+    Urllib3Transport, build_url, encode_body
+)
+from tests.utils import PRIVATE_KEY
+
+
+class TransportTest(unittest.TestCase):
+    """Test the requests and responses shared by all transports."""
+
+    def test_build_url(self) -> None:
+        url = "https://api.transip.nl/v6/domains"
+
+        self.assertEqual(build_url(url), url)
+        self.assertEqual(build_url(url, {"tags": None}), url)
+        self.assertEqual(
+            build_url(url, {"include": ["nameservers", "contacts"]}),
+            f"{url}?include=nameservers&include=contacts"
+        )
+        self.assertEqual(
+            build_url(f"{url}?page=1", {"pageSize": 10}),
+            f"{url}?page=1&pageSize=10"
+        )
+
+    def test_encode_body(self) -> None:
+        self.assertEqual(encode_body(), (None, None))
+        self.assertEqual(
+            encode_body(json_data={"action": "cancel"}),
+            (b'{"action":"cancel"}', "application/json")
+        )
+        self.assertEqual(
+            encode_body({"name": "a b"}),
+            (b"name=a+b", "application/x-www-form-urlencoded")
+        )
+        self.assertEqual(encode_body("raw", {"json": 1}), (b"raw", None))
+
+    def test_request(self) -> None:
+        request = TransportRequest(
+            "get", "https://api.transip.nl/v6/domains?page=2"
+        )
+
+        self.assertEqual(request.method, "GET")
+        self.assertEqual(request.path_url, "/v6/domains?page=2")
+        self.assertEqual(request.headers, {})
+
+    def test_streamed_response(self) -> None:
+        closed = []
+        response = TransportResponse(
+            200, {"content-type": "application/json"},
+            chunks=iter([b'{"a"', b': 1}']), close=lambda: closed.append(1)
+        )
+
+        self.assertEqual(response.headers["Content-Type"], "application/json")
+        self.assertEqual(list(response.iter_content()), [b'{"a"', b': 1}'])
+        response.close()
+        response.close()
+        self.assertEqual(closed, [1])
+
+        response = TransportResponse(200, chunks=iter([b'{"a"', b': 1}']))
+        self.assertEqual(response.json(), {"a": 1})
+        self.assertEqual(list(response.iter_content(4)), [b'{"a"', b": 1}"])
+
+
+class RequestsTransportTest(unittest.TestCase):
+    """Test preparing the requests of the requests transport."""
+
+    def _assert_prepared(
+        self,
+        transport: RequestsTransport,
+        request: TransportRequest
+    ) -> None:
+        prepped, _ = transport._prepare(request)
+        expected = transport.session.prepare_request(
+            requests.Request(
+                request.method, request.url, headers=request.headers,
+                data=request.body
+            )
+        )
+        self.assertEqual(prepped.method, expected.method)
+        self.assertEqual(prepped.url, expected.url)
+        self.assertEqual(prepped.headers, expected.headers)
+        self.assertEqual(prepped.body, expected.body)
+
+    def test_prepare(self) -> None:
+        transport = RequestsTransport()
+        headers = {"User-Agent": "test", "Authorization": "Bearer token"}
+        url = "https://api.transip.nl/v6/domains/example.com/dns"
+
+        self._assert_prepared(transport, TransportRequest("GET", url, headers))
+        self._assert_prepared(
+            transport, TransportRequest("DELETE", f"{url}?a=b c", headers)
+        )
+        self._assert_prepared(
+            transport,
+            TransportRequest(
+                "PUT", url, {**headers, "Content-Type": "application/json"},
+                b'{"dnsEntries":[]}'
+            )
+        )
+
+        # Sessions with their own settings are prepared by the session
+        transport.session.params = {"debug": "1"}
+        self._assert_prepared(transport, TransportRequest("GET", url, headers))
+
+    def test_proxies(self) -> None:
+        transport = RequestsTransport()
+        transport.session.proxies = {"https": "http://proxy:3128"}
+        prepped, settings = transport._prepare(
+            TransportRequest("GET", "https://api.transip.nl/v6/domains")
+        )
+        self.assertEqual(settings["proxies"], {"https": "http://proxy:3128"})
+        self.assertEqual(len(transport._environment), 1)
+
+        transport.session.trust_env = False
+        transport._prepare(
+            TransportRequest("GET", "https://api.transip.nl/v6/vps")
+        )
+        self.assertEqual(len(transport._environment), 2)
+
+    def test_environment(self) -> None:
+        sent: List[Dict[str, Any]] = []
+
+        class RecordingAdapter(BaseAdapter):
+            def send(
+                self,
+                request: Any,
+                stream: bool = False,
+                timeout: Any = None,
+                verify: Any = True,
+                cert: Any = None,
+                proxies: Any = None
+            ) -> Any:
+                sent.append({"verify": verify, "proxies": proxies})
+                response = requests.Response()
+                response.status_code = 200
+                response._content = b"{}"
+                response.request = request
+                return response
+
+            def close(self) -> None:
+                pass
+
+        environ = {
+            "HTTPS_PROXY": "http://proxy:3128",
+            "REQUESTS_CA_BUNDLE": "/etc/ssl/certs/transip.pem",
+        }
+        request = TransportRequest("GET", "https://api.transip.nl/v6/domains")
+        with mock.patch.dict(os.environ, environ):
+            transport = RequestsTransport()
+            transport.session.mount("https://", RecordingAdapter())
+            transport.send(request)
+            transport.send(request)
+            # Sessions with their own settings are prepared by the session
+            transport.session.params = {"debug": "1"}
+            transport.send(request)
+
+        self.assertEqual(len(sent), 3)
+        for kwargs in sent:
+            self.assertEqual(
+                kwargs["proxies"].get("https"), "http://proxy:3128"
+            )
+            self.assertEqual(kwargs["verify"], "/etc/ssl/certs/transip.pem")
+
+
+class MemoryTransportTest(unittest.TestCase):
+    """Test the client using the in-memory transport."""
+
+    def setUp(self) -> None:
+        self.transport = MemoryTransport()
+        self.client = TransIP(
+            access_token="ACCESS_TOKEN", transport=self.transport,
+            retry=RetryPolicy(total=1, backoff_factor=0)
+        )
+
+    def test_responses(self) -> None:
+        url = f"{self.client.url}/domains"
+        self.transport.add("GET", url, json={"domains": []})
+        self.transport.add(
+            "GET", f"{url}?tags=test", json={"domains": [{"name": "a.com"}]}
+        )
+
+        self.assertEqual(self.client.domains.list(), [])  # type: ignore
+        domains = self.client.get("/domains", params={"tags": "test"})
+        self.assertEqual(domains["domains"][0]["name"], "a.com")
+        self.assertEqual(
+            list(self.client.stream("/domains", "domains")), []
+        )
+
+        request = self.transport.requests[0]
+        self.assertEqual(request.url, url)
+        self.assertEqual(request.headers["Authorization"], "Bearer ACCESS_TOKEN")
+
+        with self.assertRaises(TransIPHTTPError) as context:
+            self.client.vpss.list()  # type: ignore
+        self.assertEqual(context.exception.response_code, 404)
+
+    def test_responses_in_order(self) -> None:
+        url = f"{self.client.url}/api-test"
+        self.transport.add("GET", url, status=503, json={"error": "Busy"})
+        self.transport.add("GET", url, json={"ping": "pong"})
+
+        self.assertTrue(self.client.api_test.test())  # type: ignore
+        self.assertTrue(self.client.api_test.test())  # type: ignore
+        self.assertEqual(len(self.transport.requests), 3)
+
+        self.transport.reset()
+        self.assertEqual(self.transport.requests, [])
+
+    def test_json_body(self) -> None:
+        url = f"{self.client.url}/domains/example.com"
+        self.transport.add("PATCH", url, status=204)
+
+        self.client.patch("/domains/example.com", json={"domain": {}})
+
+        request = self.transport.requests[0]
+        self.assertEqual(request.body, b'{"domain":{}}')
+        self.assertEqual(request.headers["Content-Type"], "application/json")
+
+    def test_handler(self) -> None:
+        server = FakeTransIPServer()
+        server.state.populate(domains=2)
+        try:
+            client = TransIP(
+                login="demouser", private_key=PRIVATE_KEY,
+                base_url=server.base_url,
+                transport=MemoryTransport(server.handle)
+            )
+            domains = client.domains.list()  # type: ignore
+        finally:
+            server.stop()
+
+        self.assertEqual(len(domains), 2)
+        self.assertEqual(server.stats["requests"], 2)
+
+
+class Urllib3TransportTest(unittest.TestCase):
+    """Test the client using the urllib3 transport."""
+
+    def setUp(self) -> None:
+        self.server = FakeTransIPServer().start()
+        self.server.state.populate(domains=3, invoices=1)
+        self.transport = Urllib3Transport(pool_maxsize=4, timeout=5)
+
+    def tearDown(self) -> None:
+        self.transport.close()
+        self.server.stop()
+
+    def test_requests(self) -> None:
+        client = TransIP(
+            login="demouser", private_key=PRIVATE_KEY,
+            base_url=self.server.base_url, transport=self.transport
+        )
+
+        self.assertEqual(len(client.domains.list()), 3)  # type: ignore
+        self.assertEqual(
+            len(list(client.domains.stream())), 3  # type: ignore
+        )
+        client.domains.create({"domainName": "new.com"})  # type: ignore
+        self.assertEqual(
+            client.domains.get("new.com").name, "new.com"  # type: ignore
+        )
+        with self.assertRaises(TransIPHTTPError):
+            client.domains.get("missing.com")  # type: ignore
+
+    def test_connection_error(self) -> None:
+        client = TransIP(
+            access_token="ACCESS_TOKEN", base_url="http://127.0.0.1:1",
+            transport=self.transport, retry=RetryPolicy(total=0)
+        )
+
+        with self.assertRaises(requests.ConnectionError):
+            client.domains.list()  # type: ignore
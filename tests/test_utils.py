@@ -17,14 +17,20 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
 
+from typing import List, Union
+import base64
+import json
 import unittest
 import string
 
 from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
 
 from transip.utils import (
-    load_rsa_private_key, generate_message_signature, generate_nonce
+    load_rsa_private_key, generate_message_signature, generate_nonce,
+    get_token_expiration, MessageSigner, iter_json_array, iter_json_string,
+    iter_base64_decode
 )
+from transip.v6 import DEMO_TOKEN
 
 
 class UtilsTest(unittest.TestCase):
@@ -91,6 +97,36 @@ class UtilsTest(unittest.TestCase):
             generate_message_signature(message, self.privkey) == encoded
         )
 
+    def test_message_signer(self) -> None:
+        """
+        Test if the message signer generates the same signatures as
+        generate_message_signature(), for single and multiple messages.
+        """
+        messages: List[Union[str, bytes]] = [
+            "A message for signing", b"Another message for signing"
+        ]
+        expected = [
+            generate_message_signature(message, self.privkey)
+            for message in messages
+        ]
+
+        signer = MessageSigner(self.privkey)
+        self.assertEqual(signer.sign(messages[0]), expected[0])
+        self.assertEqual(signer.sign_many(messages), expected)
+
+        signer = MessageSigner(load_rsa_private_key(self.privkey))
+        self.assertEqual(signer.sign_many(messages), expected)
+
+        # The parsed private key is only kept by the signer itself
+        self.assertIsNot(
+            MessageSigner(self.privkey)._private_key,
+            MessageSigner(self.privkey)._private_key
+        )
+
+    def test_message_signer_invalid_key(self) -> None:
+        """Test if an invalid private key is rejected by the signer."""
+        self.assertRaises(ValueError, MessageSigner, "invalid")
+
     def test_generate_nonce_length(self) -> None:
         """
         Test the length of the generated nonce and whether or not an
@@ -110,3 +146,93 @@ class UtilsTest(unittest.TestCase):
         """
         alphabet: str = 'a'
         self.assertTrue(generate_nonce(3, alphabet) == 'aaa')
+
+    def test_get_token_expiration(self) -> None:
+        """
+        Test if the expiration time can be extracted from an access token.
+        """
+        self.assertEqual(get_token_expiration(DEMO_TOKEN), 2118745550.0)
+        self.assertIsNone(get_token_expiration("invalid"))
+
+    def test_iter_json_array(self) -> None:
+        """
+        Test if the elements of an array in a JSON object are decoded
+        correctly, regardless of how the JSON object is split into chunks.
+        """
+        entries = [
+            {"name": "www", "expire": 86400, "content": "caf\u00e9 ]}"},
+            12345,
+            -3.5e10,
+            [True, False, None],
+        ]
+        data: bytes = json.dumps(
+            {"other": {"a": [1, "}"]}, "dnsEntries": entries, "after": 1},
+            ensure_ascii=False
+        ).encode()
+
+        for size in [1, 2, 3, 64, len(data)]:
+            chunks = [data[i:i + size] for i in range(0, len(data), size)]
+            self.assertEqual(
+                list(iter_json_array(chunks, "dnsEntries")), entries
+            )
+
+    def test_iter_json_array_invalid(self) -> None:
+        """Test if missing keys and invalid JSON objects are detected."""
+        with self.assertRaises(KeyError):
+            list(iter_json_array([b'{"domains": []}'], "dnsEntries"))
+        with self.assertRaises(ValueError):
+            list(iter_json_array([b'{"dnsEntries": [1, 2'], "dnsEntries"))
+        with self.assertRaises(ValueError):
+            list(iter_json_array([b'[]'], "dnsEntries"))
+
+    def test_iter_json_string(self) -> None:
+        """
+        Test if a string in a JSON object, including escape sequences and
+        surrogate pairs, is decoded correctly regardless of how the JSON object
+        is split into chunks.
+        """
+        value: str = 'caf\u00e9 "quoted" \\ / \n \U0001f600 end'
+        data: bytes = json.dumps({"other": [1], "pdf": value}).encode()
+
+        for size in [1, 2, 5, 64, len(data)]:
+            chunks = [data[i:i + size] for i in range(0, len(data), size)]
+            self.assertEqual("".join(iter_json_string(chunks, "pdf")), value)
+
+        # Runs of escape sequences, including lone surrogates
+        data = b'{"pdf": "a\\/\\/b\\\\\\"\\ud83d\\ude00\\ud83d\\u00e9\\udc00"}'
+        value = 'a//b\\"\U0001f600\ud83d\u00e9\udc00'
+        for size in range(1, 13):
+            chunks = [data[i:i + size] for i in range(0, len(data), size)]
+            self.assertEqual("".join(iter_json_string(chunks, "pdf")), value)
+
+        with self.assertRaises(KeyError):
+            list(iter_json_string([b'{"other": "a"}'], "pdf"))
+        with self.assertRaises(ValueError):
+            list(iter_json_string([b'{"pdf": 1}'], "pdf"))
+        with self.assertRaises(ValueError):
+            list(iter_json_string([b'{"pdf": "abc'], "pdf"))
+
+    def test_iter_base64_decode(self) -> None:
+        """
+        Test if base64 encoded data is decoded correctly regardless of how it
+        is split into chunks.
+        """
+        data: bytes = bytes(range(256)) * 3 + b"tail"
+        encoded: str = base64.b64encode(data).decode() + "="
+
+        for size in [1, 3, 4, 7, len(encoded)]:
+            chunks = [
+                encoded[i:i + size] for i in range(0, len(encoded), size)
+            ]
+            self.assertEqual(b"".join(iter_base64_decode(chunks)), data)
+
+        # Base64 encoded data wrapped in lines of 76 characters
+        wrapped: str = base64.encodebytes(data).decode().replace("\n", "\r\n")
+        for size in [1, 3, 4, 7, len(wrapped)]:
+            chunks = [
+                wrapped[i:i + size] for i in range(0, len(wrapped), size)
+            ]
+            self.assertEqual(b"".join(iter_base64_decode(chunks)), data)
+
+        with self.assertRaises(ValueError):
+            list(iter_base64_decode(["abcde"]))
@@ -18,15 +18,43 @@
 # along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
 """Wrapper for the TransIP API."""
 
-from typing import Dict, Optional, Any, Type, Union, TYPE_CHECKING
+from typing import (
+    Dict, Optional, Any, Type, Union, Iterator, Iterable, Callable, List,
+    TypeVar, TYPE_CHECKING
+)
 from types import ModuleType
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
 
+import contextvars
 import importlib
 import requests
 import os
-
-from transip.exceptions import TransIPHTTPError, TransIPParsingError
-from transip.utils import generate_message_signature, generate_nonce
+import threading
+import time
+
+from transip.cache import CacheKey, ResponseCache
+from transip.cassette import Cassette
+from transip.codec import JSONCodec, get_codec
+from transip.deadline import Deadline, current_deadline
+from transip.exceptions import (
+    TransIPCancelledError, TransIPHTTPError, TransIPParsingError,
+    TransIPTimeoutError
+)
+from transip.instrumentation import Instrument, path_template
+from transip.ratelimit import RateLimiter
+from transip.retry import RetryPolicy
+from transip.singleflight import SingleFlight
+from transip.templates import HeaderTemplate
+from transip.tokens import TokenStore
+from transip.transport import (
+    RequestsTransport, Timeout, Transport, TransportRequest,
+    TransportResponse, build_url, encode_body
+)
+from transip.utils import (
+    MessageSigner, generate_nonce, get_token_expiration, iter_json_array,
+    iter_json_string
+)
 
 
 __title__ = "python-transip"
@@ -37,15 +65,55 @@ __copyright__ = "Copyright 2020-2021, Roald Nefs"
 __license__ = "LGPL3"
 
 
+T = TypeVar("T")
+R = TypeVar("R")
+
+
 if TYPE_CHECKING:
     # Imports only needed for type checking. These will not be imported at
     # runtime.
     from transip.base import ApiService
 
 
+class _LazyService:
+    """
+    Descriptor creating a service of the client on first access.
+
+    The service is looked up by name in the module containing the services for
+    the API version of the client, and is cached on the client afterwards.
+    """
+
+    def __init__(self, name: str) -> None:
+        self._name: str = name
+        self._attr: str = name
+
+    def __set_name__(self, owner: Type['TransIP'], attr: str) -> None:
+        self._attr = attr
+
+    def __get__(
+        self,
+        client: Optional['TransIP'],
+        owner: Type['TransIP']
+    ) -> Any:
+        if client is None:
+            return self
+        objects: ModuleType = importlib.import_module(
+            client._objects_module.format(api_version=client._api_version)
+        )
+        service: 'ApiService' = getattr(objects, self._name)(client)
+        # Store the service on the client to skip the descriptor from now on
+        client.__dict__[self._attr] = service
+        return service
+
+
 class TransIP:
     """Represents a TransIP server connection.
 
+    A single client can be shared by multiple threads, e.g. the workers of a
+    thread pool, keep ``pool_maxsize`` at least as high as the number of
+    threads to reuse all connections. The pool and keep-alive settings only
+    apply to the default transport.
+
     Args:
         login (str): The TransIP username
         api_version (str): TransIP API version to use
@@ -56,8 +124,70 @@ class TransIP:
             TransIP API
         global_key (bool): Allow the access token to be used from all
             IP-addresses instead of only the whitelisted ones.
+        retry (RetryPolicy): The policy for retrying failed requests, defaults
+            to retrying idempotent requests up to 3 times
+        rate_limiter (RateLimiter): The rate limiter pacing the requests to
+            stay below the rate limit of the API, e.g.
+            ``RateLimiter.shared(login)`` to share it between clients
+        token_store (TokenStore): The store used to reuse access tokens
+            requested using the private key, e.g. ``FileTokenStore()`` to
+            reuse them across processes
+        lazy (bool): Postpone reading the private key and requesting an access
+            token until the first request is made
+        cache (ResponseCache): The cache used for the responses when retrieving
+            or listing objects, which can be shared with clients using another
+            base URL or login
+        coalesce (bool): Share the response of a GET request with identical
+            GET requests made at the same time, see ``single_flight.stats``
+            for the number of requests saved
+        instruments (iterable): The instruments notified of every request,
+            e.g. a ``LatencyHistogram`` collecting the latency per endpoint
+        base_url (str): The URL of the TransIP API without the API version,
+            e.g. the URL of a ``transip.testing.FakeTransIPServer``
+        cassette (Cassette): Record all requests to a cassette file, or replay
+            them from it without network access
+        transport (Transport): The transport sending the requests, defaults
+            to a ``RequestsTransport`` using the session of the client
+        codec (str): The JSON codec encoding the request bodies and decoding
+            the responses, either 'orjson', 'ujson', 'json' or a
+            ``JSONCodec``, defaults to the fastest installed library
+        pool_connections (int): The number of hosts to keep connections to
+        pool_maxsize (int): The maximum number of connections kept alive per
+            host
+        connect_timeout (float): The number of seconds to wait for a
+            connection, or None to wait indefinitely
+        read_timeout (float): The number of seconds to wait for every read
+            from a connection, or None to wait indefinitely
+        deadline (float): The maximum number of seconds a call may take,
+            including retries and waiting for the rate limiter
+        tcp_keepalive (float): The number of seconds a connection is idle
+            before TCP keep-alive probes are sent, or None to disable TCP
+            keep-alive
     """
 
+    # The module containing the services for the specified API version
+    _objects_module: str = "transip.v{api_version}.objects"
+
+    # The number of seconds before the access token expires it's refreshed in
+    # the background, and the number of seconds before it expires requests
+    # will wait for a new access token
+    _token_refresh_margin: float = 300.0
+    _token_expiry_margin: float = 30.0
+
+    # The number of bytes to read at once when streaming a response
+    _stream_chunk_size: int = 64 * 1024
+
+    # The services for the specified API version, which are created on first
+    # access
+    api_test = _LazyService("ApiTestService")
+    availability_zones = _LazyService("AvailabilityZoneService")
+    products = _LazyService("ProductService")
+    domains = _LazyService("DomainService")
+    invoices = _LazyService("InvoiceService")
+    ssh_keys = _LazyService("SshKeyService")
+    vpss = _LazyService("VpsService")
+    colocations = _LazyService("ColocationService")
+
     def __init__(
         self,
         login: str = None,
@@ -66,61 +196,123 @@ class TransIP:
         private_key: Optional[str] = None,
         private_key_file: Optional[str] = None,
         global_key: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        token_store: Optional[TokenStore] = None,
+        lazy: bool = False,
+        cache: Optional[ResponseCache] = None,
+        coalesce: bool = True,
+        instruments: Optional[Iterable[Instrument]] = None,
+        base_url: str = "https://api.transip.nl",
+        cassette: Optional[Cassette] = None,
+        transport: Optional[Transport] = None,
+        codec: Union[str, JSONCodec] = "auto",
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        connect_timeout: Optional[float] = 10.0,
+        read_timeout: Optional[float] = 60.0,
+        deadline: Optional[float] = None,
+        tcp_keepalive: Optional[float] = 60.0,
     ) -> None:
         self._api_version: str = api_version
-        self._url: str = f"https://api.transip.nl/v{api_version}"
+        self._url: str = f"{base_url.rstrip('/')}/v{api_version}"
+        self._base_path: str = urlsplit(self._url).path
 
         # Headers to use when making a request to TransIP
-        self.headers: Dict[str, str] = {
-            "User-Agent": f"{__title__}/{__version__}"
-        }
+        self.headers = {"User-Agent": f"{__title__}/{__version__}"}
 
         # Initialize a session object for making requests
         self.session: requests.Session = requests.Session()
 
+        # The codec encoding and decoding JSON
+        self.codec: JSONCodec = (
+            get_codec(codec) if isinstance(codec, str) else codec
+        )
+
+        # The transport sending the requests, using the session with a pool
+        # of connections by default
+        self.transport: Transport = (
+            transport if transport is not None
+            else RequestsTransport(
+                self.session, pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize, tcp_keepalive=tcp_keepalive
+            )
+        )
+        self._pool_maxsize: int = pool_maxsize
+
+        # The timeouts of every attempt to send a request, and the maximum
+        # duration of every call
+        self.timeout: Timeout = (connect_timeout, read_timeout)
+        self.deadline: Optional[float] = deadline
+
+        # The optional cassette recording or replaying all requests
+        self.cassette: Optional[Cassette] = cassette
+        if cassette is not None:
+            self.transport = cassette.wrap(self.transport)
+
+        # The policy for retrying failed requests
+        self.retry: RetryPolicy = retry if retry is not None else RetryPolicy()
+
+        # The optional rate limiter pacing the requests
+        self.rate_limiter: Optional[RateLimiter] = rate_limiter
+
+        # The optional cache for the responses when retrieving or listing
+        # objects
+        self.cache: Optional[ResponseCache] = cache
+
+        # Identical GET requests made at the same time, e.g. from multiple
+        # threads, share a single HTTP request unless disabled. Calls failing
+        # because of their own deadline don't fail the identical calls
+        self.single_flight: Optional[SingleFlight] = (
+            SingleFlight(
+                local_errors=(TransIPTimeoutError, TransIPCancelledError)
+            ) if coalesce else None
+        )
+
+        # The instruments notified of the lifecycle of every request
+        self.instruments: List[Instrument] = list(instruments or ())
+
         # Set authentication information
         self._login: Optional[str] = login
         self._access_token: Optional[str] = access_token
         self._private_key: Optional[str] = private_key
         self._private_key_file: Optional[str] = private_key_file
         self._global_key: Optional[bool] = global_key
+        self._token_store: Optional[TokenStore] = token_store
+        self._token_key: Optional[str] = None
+        self._signer: Optional[MessageSigner] = None
+        self._token_expires: Optional[float] = None
+        self._auth_lock: threading.Lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._refresh_thread_lock: threading.Lock = threading.Lock()
+        self._lazy: bool = lazy
         self._set_auth_info()
 
-        # Dynamically import the services for the specified API version
-        objects: ModuleType = (
-            importlib.import_module(f"transip.v{api_version}.objects")
-        )
-
-        self.api_test: Type['ApiService'] = (
-            objects.ApiTestService(self)  # type: ignore
-        )
-        self.availability_zones: Type['ApiService'] = (
-            objects.AvailabilityZoneService(self)  # type: ignore
-        )
-        self.products: Type['ApiService'] = (
-            objects.ProductService(self)  # type: ignore
-        )
-        self.domains: Type['ApiService'] = (
-            objects.DomainService(self)  # type: ignore
-        )
-        self.invoices: Type['ApiService'] = (
-            objects.InvoiceService(self)  # type: ignore
-        )
-        self.ssh_keys: Type['ApiService'] = (
-            objects.SshKeyService(self)  # type: ignore
-        )
-        self.vpss: Type['ApiService'] = (
-            objects.VpsService(self)  # type: ignore
-        )
-        self.colocations: Type['ApiService'] = (
-            objects.ColocationService(self)  # type: ignore
-        )
-
     @property
     def url(self) -> str:
         """Return the API URL."""
         return self._url
 
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Return the headers sent with every request."""
+        return self._headers
+
+    @headers.setter
+    def headers(self, headers: Dict[str, str]) -> None:
+        # The headers of the requests are only built once per content type
+        self._headers: HeaderTemplate = HeaderTemplate(headers)
+
+    @property
+    def rate_limit_remaining(self) -> Optional[int]:
+        """
+        Return the number of requests that can be made without waiting for
+        the rate limiter, if any.
+        """
+        if self.rate_limiter is None:
+            return None
+        return self.rate_limiter.remaining
+
     def _get_headers(
         self,
         content_type: Optional[str] = None
@@ -161,28 +353,15 @@ class TransIP:
             "global_key": self._global_key
         }
 
-        headers: Dict[str, str] = self.headers.copy()
-        request: requests.Request = requests.Request(
-            "POST", url, headers=headers, json=payload
-        )
-        prepped: requests.PreparedRequest = self.session.prepare_request(
-            request
-        )
+        body, content_type = encode_body(json_data=payload, codec=self.codec)
+        headers: Dict[str, str] = self._get_headers(content_type)
 
-        # Get the prepped body for signature generation
-        body: Union[bytes, str] = prepped.body or ''
-        if isinstance(body, bytes):
-            body = body.decode('ascii')
+        # Generate a signature of the exact request body that is sent
+        headers["Signature"] = self._signer.sign(body or b"")  # type: ignore
 
-        # Generate a signature if the request body
-        signature: str = generate_message_signature(
-            body, self._private_key  # type: ignore
+        response: TransportResponse = self._send_once(
+            TransportRequest("POST", url, headers, body), timeout=self.timeout
         )
-
-        # Add 'Signature' header to the prepared request
-        prepped.headers["Signature"] = signature
-
-        response: requests.Response = self.session.send(prepped)
         data = self._validate_response(response)
 
         # Attempt to extract the access token from the result
@@ -193,6 +372,34 @@ class TransIP:
                 "Failed to extract access token from the API response"
             ) from exc
 
+    def _get_access_token(self, refresh: bool = False) -> str:
+        """
+        Return a stored access token, if any, or request a new access token
+        using the supplied private key.
+
+        Args:
+            refresh (bool): Always request a new access token
+
+        Returns:
+            str: The access token to use for authorization.
+        """
+        if self._token_store is None:
+            return self._request_access_token()
+
+        key: str = self._token_key  # type: ignore
+        token: Optional[str] = None
+        if not refresh:
+            token = self._token_store.get(key)
+        if token:
+            return token
+
+        token = self._request_access_token()
+        expires: Optional[float] = get_token_expiration(token)
+        # Only store tokens of which the expiration time is known
+        if expires is not None:
+            self._token_store.set(key, token, expires)
+        return token
+
     def _read_private_key(self) -> str:
         """Read the private key from file.
 
@@ -247,16 +454,93 @@ class TransIP:
                 "Both private_key_file and login should be defined"
             )
 
-        # Read the private key from file
-        if self._private_key_file:
-            self._private_key = self._read_private_key()
+        if self._access_token:
+            self._set_access_token(self._access_token)
+        elif not self._lazy:
+            self._authenticate()
+
+    def _authenticate(self) -> None:
+        """
+        Use the private key to retrieve an access token, unless an access
+        token has already been retrieved.
+
+        Raises:
+            RuntimeError: If the private key file couldn't be read.
+        """
+        with self._auth_lock:
+            if self._access_token:
+                return
+
+            # Read the private key from file
+            if self._private_key_file:
+                self._private_key = self._read_private_key()
+
+            # Only keep the signer, parsing the private key once
+            self._signer = MessageSigner(self._private_key)  # type: ignore
+            if self._token_store is not None:
+                self._token_key = self._token_store.make_key(
+                    self._login, self._private_key,  # type: ignore
+                    global_key=self._global_key, read_only=False
+                )
+            self._private_key = None
+            self._set_access_token(self._get_access_token())
+
+    def _set_access_token(self, token: str) -> None:
+        """Set the access token to use and the 'Authorization' header."""
+        self._access_token = token
+        self._token_expires = get_token_expiration(token)
+        self.headers["Authorization"] = f"Bearer {token}"
+
+    def _refresh_access_token(self, stale: Optional[str] = None) -> None:
+        """
+        Request a new access token using the private key.
+
+        Args:
+            stale (str): The access token to replace, no new access token is
+                requested when it has already been replaced by another thread
+        """
+        with self._auth_lock:
+            if stale is not None and stale != self._access_token:
+                return
+            self._set_access_token(self._get_access_token(refresh=True))
 
-        # Use the private key to request a new access token
-        if self._private_key:
-            self._access_token = self._request_access_token()
+    def _background_refresh(self, stale: str) -> None:
+        """Refresh the access token, ignoring any errors."""
+        try:
+            self._refresh_access_token(stale)
+        except Exception:
+            # The access token will be refreshed again when it's about to
+            # expire
+            pass
 
-        # Set the 'Authorization' header
-        self.headers["Authorization"] = f"Bearer {self._access_token}"
+    def _check_access_token(self) -> None:
+        """
+        Refresh the access token in the background when it's about to expire,
+        or wait for a new access token when it has (almost) expired.
+        """
+        if self._access_token is None:
+            # The client has been created lazily
+            self._authenticate()
+        if self._signer is None or self._token_expires is None:
+            return
+
+        token: str = self._access_token  # type: ignore
+        remaining: float = self._token_expires - time.time()
+        if remaining > self._token_refresh_margin:
+            return
+        if remaining <= self._token_expiry_margin:
+            self._refresh_access_token(token)
+            return
+
+        # Don't use the lock of the refresh itself, as requests would wait
+        # for the refresh instead of using the current access token
+        with self._refresh_thread_lock:
+            if self._refresh_thread and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(
+                target=self._background_refresh, args=(token,), daemon=True
+            )
+            self._refresh_thread.start()
 
     def request(
         self,
@@ -264,7 +548,8 @@ class TransIP:
         path: str,
         data: Optional[Any] = None,
         json: Optional[Any] = None,
-        params: Optional[Dict[str, Any]] = None
+        params: Optional[Dict[str, Any]] = None,
+        cache: bool = False
     ) -> Any:
         """Make an HTTP request to the TransIP API.
 
@@ -274,6 +559,8 @@ class TransIP:
             data (dict): The body to attach to the request
             json (dict): The json body to attach to the request
             params (dict): URL parameters to append to the URL
+            cache (bool): Use the response cache of the client, if any, for
+                this GET request
 
         Returns:
             Returns the json-encoded content of a response, if any.
@@ -282,26 +569,365 @@ class TransIP:
             TransIPHTTPError: When the return code of the request is not 2xx
             TransIPParsingError: When the content couldn't be parsed as JSON
         """
-        url: str = self._build_url(path)
+        if self.cache is None:
+            return self._coalesce(method, path, data, json, params)
+
+        if method.upper() == "GET":
+            if not cache:
+                return self._coalesce(method, path, data, json, params)
+            key: CacheKey = self.cache.make_key(
+                path, params, scope=(self.url, self._login)
+            )
+            # Don't store the response if the cache is invalidated while the
+            # request is in flight, as the response may be stale
+            generation: int = self.cache.generation
+            hit, result = self.cache.lookup(key)
+            if not hit:
+                result = self._coalesce(method, path, data, json, params)
+                self.cache.store(key, result, generation)
+            return result
 
-        # Set the content type for the request if json is provided and data is
-        # not specified
-        content_type: Optional[str] = None
-        if not data and json:
-            content_type = "application/json"
+        try:
+            return self._request(method, path, data, json, params)
+        finally:
+            # Invalidate the cached responses affected by the modification
+            self.cache.invalidate(path)
 
-        headers: Dict[str, str] = self._get_headers(content_type)
-        request: requests.Request = requests.Request(
-            method, url, headers=headers, data=data, json=json, params=params,
+    def _coalesce(
+        self,
+        method: str,
+        path: str,
+        data: Optional[Any] = None,
+        json: Optional[Any] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """
+        Make an HTTP request to the TransIP API, sharing the response of a GET
+        request with identical GET requests made at the same time.
+
+        Waiting for an identical request is limited by the deadline of the
+        caller, if any.
+        """
+        if (self.single_flight is None or method.upper() != "GET" or
+                data is not None or json is not None):
+            return self._request(method, path, data, json, params)
+        return self.single_flight.do(
+            self.single_flight.make_key(method, path, params),
+            self._request, method, path, data, json, params,
+            timeout=self._get_remaining(self._get_deadline(current_deadline()))
         )
 
-        prepped: requests.PreparedRequest = self.session.prepare_request(
-            request
+    def _request(
+        self,
+        method: str,
+        path: str,
+        data: Optional[Any] = None,
+        json: Optional[Any] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """Make an HTTP request to the TransIP API, see request()."""
+        prepped: TransportRequest = self._prepare_request(
+            method, path, data, json, params
         )
-        response: requests.Response = self.session.send(prepped)
+        response: TransportResponse = self._send(prepped)
         return self._validate_response(response)
 
-    def _validate_response(self, response: requests.Response) -> Any:
+    def _prepare_request(
+        self,
+        method: str,
+        path: str,
+        data: Optional[Any] = None,
+        json: Optional[Any] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> TransportRequest:
+        """Return the prepared HTTP request to the TransIP API."""
+        # Ensure the access token doesn't expire
+        self._check_access_token()
+
+        url: str = build_url(self._build_url(path), params)
+
+        # The content type is set when the body is encoded, e.g. to JSON if
+        # json is provided and data is not specified
+        body, content_type = encode_body(data, json, self.codec)
+
+        # The headers are shared by all requests with the same content type
+        return TransportRequest(
+            method, url, self._headers.for_content_type(content_type), body
+        )
+
+    def stream(
+        self,
+        path: str,
+        key: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Any]:
+        """Make a GET request to the TransIP API and incrementally parse the
+        response.
+
+        The request is made when the first element is requested.
+
+        Args:
+            path (str): The path to append to the API URL
+            key (str): The key of the array in the response to iterate over
+            params (dict): URL parameters to append to the URL
+
+        Returns:
+            Yields the elements of the array as soon as they are decoded.
+
+        Raises:
+            TransIPHTTPError: When the return code of the request is not 2xx
+            TransIPParsingError: When the content couldn't be parsed as JSON
+        """
+        return self._stream(
+            path, lambda chunks: iter_json_array(chunks, key), params
+        )
+
+    def stream_string(
+        self,
+        path: str,
+        key: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Iterator[str]:
+        """Make a GET request to the TransIP API and incrementally read a
+        string from the response, e.g. the base64 encoded PDF of an invoice.
+
+        The request is made when the first part is requested.
+
+        Args:
+            path (str): The path to append to the API URL
+            key (str): The key of the string in the response
+            params (dict): URL parameters to append to the URL
+
+        Returns:
+            Yields the content of the string in parts as soon as they are
+            decoded.
+
+        Raises:
+            TransIPHTTPError: When the return code of the request is not 2xx
+            TransIPParsingError: When the content couldn't be parsed as JSON
+        """
+        return self._stream(
+            path, lambda chunks: iter_json_string(chunks, key), params
+        )
+
+    def _stream(
+        self,
+        path: str,
+        parse: Callable[[Iterator[bytes]], Iterator[T]],
+        params: Optional[Dict[str, Any]] = None
+    ) -> Iterator[T]:
+        """
+        Make a GET request to the TransIP API and incrementally parse the
+        response using the parse function, see stream().
+        """
+        prepped: TransportRequest = self._prepare_request(
+            "GET", path, params=params
+        )
+        response: TransportResponse = self._send(prepped, stream=True)
+        try:
+            if not 200 <= response.status_code < 300:
+                self._validate_response(response)
+            chunks = response.iter_content(chunk_size=self._stream_chunk_size)
+            try:
+                yield from parse(chunks)
+            except (KeyError, ValueError) as exc:
+                raise TransIPParsingError(
+                    message="Failed to parse the API response as JSON"
+                ) from exc
+        finally:
+            response.close()
+
+    def _send(
+        self,
+        prepped: TransportRequest,
+        stream: bool = False
+    ) -> TransportResponse:
+        """
+        Send a prepared request, retrying it according to the retry policy.
+
+        Raises:
+            requests.ConnectionError: When the connection failed and the
+                request won't be retried
+            requests.Timeout: When the request timed out
+            TransIPTimeoutError: When the deadline passed, including requests
+                timing out as their timeouts were limited by the deadline
+        """
+        scope: Optional[Deadline] = current_deadline()
+        expires: Optional[float] = self._get_deadline(scope)
+        attempt: int = 0
+        reauthenticated: bool = False
+        while True:
+            if scope is not None:
+                scope.check()
+            if self.rate_limiter is not None:
+                if not self.rate_limiter.acquire(
+                    timeout=self._get_remaining(expires), deadline=scope
+                ):
+                    if scope is not None:
+                        scope.check()
+                    raise TransIPTimeoutError(
+                        "The deadline passed while waiting for the rate "
+                        "limiter"
+                    )
+            timeout: Timeout = self._get_timeout(expires)
+            try:
+                response: TransportResponse = self._send_once(
+                    prepped, stream=stream, timeout=timeout
+                )
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                if (isinstance(exc, requests.Timeout) and
+                        self._is_deadline_timeout(exc, timeout)):
+                    self.retry.give_up(attempt)
+                    raise TransIPTimeoutError(
+                        "The deadline passed before the call completed"
+                    ) from exc
+                if not isinstance(exc, requests.ConnectionError):
+                    # Requests timing out while reading the response aren't
+                    # retried, as they may have been processed already
+                    raise
+                delay: float = self.retry.get_delay(attempt)
+                if (not self.retry.can_retry(prepped.method, attempt) or
+                        not self._in_time(expires, delay)):
+                    self.retry.give_up(attempt)
+                    raise
+            else:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.update(response.headers)
+                if (response.status_code == 401 and self._signer and
+                        not reauthenticated):
+                    # Retry the request once using a new access token
+                    reauthenticated = True
+                    response.close()
+                    self._reauthenticate(prepped)
+                    continue
+                if not self.retry.is_retry(
+                    prepped.method, response.status_code, attempt
+                ):
+                    if response.status_code in self.retry.status_codes:
+                        self.retry.give_up(attempt)
+                    return response
+                delay = self.retry.get_delay(attempt, response)
+                if not self._in_time(expires, delay):
+                    # Return the failed response as the retry would end
+                    # after the deadline
+                    self.retry.give_up(attempt)
+                    return response
+                # Release the connection back to the pool before waiting
+                response.close()
+
+            self.retry.sleep(attempt, delay, scope)
+            attempt += 1
+
+    def _get_deadline(self, scope: Optional[Deadline]) -> Optional[float]:
+        """
+        Return the monotonic time by which a call has to be completed, if
+        any, which is the earliest of the deadline of the client and the
+        deadline of the current context.
+        """
+        expires: Optional[float] = None
+        if self.deadline is not None:
+            expires = time.monotonic() + self.deadline
+        if scope is not None and scope.expires is not None:
+            if expires is None or scope.expires < expires:
+                expires = scope.expires
+        return expires
+
+    @staticmethod
+    def _get_remaining(expires: Optional[float]) -> Optional[float]:
+        """Return the number of seconds left before the deadline, if any."""
+        if expires is None:
+            return None
+        return max(expires - time.monotonic(), 0.0)
+
+    @staticmethod
+    def _in_time(expires: Optional[float], delay: float) -> bool:
+        """Return whether a retry after the delay starts in time."""
+        return expires is None or time.monotonic() + delay < expires
+
+    def _get_timeout(self, expires: Optional[float]) -> Timeout:
+        """
+        Return the timeouts of an attempt to send a request, limited to the
+        time left before the deadline.
+
+        Raises:
+            TransIPTimeoutError: If the deadline has passed.
+        """
+        remaining: Optional[float] = self._get_remaining(expires)
+        if remaining is None:
+            return self.timeout
+        if remaining <= 0:
+            raise TransIPTimeoutError(
+                "The deadline passed before the call completed"
+            )
+        connect, read = self.timeout
+        return (
+            remaining if connect is None else min(connect, remaining),
+            remaining if read is None else min(read, remaining)
+        )
+
+    def _is_deadline_timeout(
+        self,
+        exc: requests.Timeout,
+        timeout: Timeout
+    ) -> bool:
+        """
+        Return whether a request timed out as its timeout was limited by the
+        deadline.
+        """
+        index: int = 0 if isinstance(exc, requests.ConnectTimeout) else 1
+        return timeout[index] != self.timeout[index]
+
+    def _send_once(
+        self,
+        prepped: TransportRequest,
+        stream: bool = False,
+        timeout: Optional[Timeout] = None
+    ) -> TransportResponse:
+        """Send a prepared request, notifying the instruments, if any."""
+        instruments: List[Instrument] = self.instruments
+        if not instruments:
+            return self.transport.send(prepped, stream=stream, timeout=timeout)
+
+        method: str = prepped.method
+        path: str = path_template(prepped.path_url[len(self._base_path):])
+        for instrument in instruments:
+            instrument.before_request(method, path)
+        start: float = time.perf_counter()
+        try:
+            response: TransportResponse = self.transport.send(
+                prepped, stream=stream, timeout=timeout
+            )
+        except Exception as exc:
+            elapsed: float = time.perf_counter() - start
+            for instrument in instruments:
+                instrument.on_error(method, path, exc, elapsed)
+            raise
+        elapsed = time.perf_counter() - start
+
+        # Don't read the body of a streamed response
+        size: Optional[int] = None
+        if not stream:
+            size = len(response.content)
+        elif response.headers.get("Content-Length", "").isdigit():
+            size = int(response.headers["Content-Length"])
+        for instrument in instruments:
+            instrument.after_response(
+                method, path, response.status_code, size, elapsed
+            )
+        return response
+
+    def _reauthenticate(self, prepped: TransportRequest) -> None:
+        """
+        Replace the access token used by the prepared request with a new one.
+        """
+        stale: str = prepped.headers.get("Authorization", "")
+        self._refresh_access_token(stale[len("Bearer "):])
+        # Replace the headers as they're shared with other requests
+        prepped.headers = {
+            **prepped.headers, "Authorization": self.headers["Authorization"]
+        }
+
+    def _validate_response(self, response: TransportResponse) -> Any:
         """
         Validate the API response.
 
@@ -309,19 +935,21 @@ class TransIP:
             TransIPHTTPError: When the return code of the request is not 2xx
             TransIPParsingError: When the content couldn't be parsed as JSON
         """
+        # Decode the JSON straight from the bytes of the response
+        content: bytes = response.content
         if 200 <= response.status_code < 300:
-            if response.text:
+            if content:
                 try:
-                    return response.json()
+                    return self.codec.decode(content)
                 except Exception:
                     raise TransIPParsingError(
                         message="Failed to parse the API response as JSON"
                     )
             return None
 
-        error_message = str(response.content)
+        error_message = str(content)
         try:
-            error_json = response.json()
+            error_json = self.codec.decode(content)
             if "error" in error_json:
                 error_message = error_json["error"]
         except (KeyError, ValueError, TypeError):
@@ -335,13 +963,15 @@ class TransIP:
     def get(
         self,
         path: str,
-        params: Optional[Dict[str, Any]] = None
+        params: Optional[Dict[str, Any]] = None,
+        cache: bool = False
     ) -> Any:
         """Make a GET request to the TransIP API.
 
         Args:
             path (str): The path to append to the API URL
             params (dict): URL parameters to append to the URL
+            cache (bool): Use the response cache of the client, if any
 
         Returns:
             Returns the json-encoded content of a response, if any.
@@ -350,7 +980,7 @@ class TransIP:
             TransIPHTTPError: When the return code of the request is not 2xx
         """
         return self.request(
-            "GET", path, params=params
+            "GET", path, params=params, cache=cache
         )
 
     def post(
@@ -452,3 +1082,95 @@ class TransIP:
         return self.request(
             "DELETE", path, data=data, json=json, params=params
         )
+
+    def warm_up(self, connections: Optional[int] = None) -> int:
+        """Open connections to the TransIP API in advance, e.g. at startup,
+        so the first requests don't have to wait for them.
+
+        Args:
+            connections (int): The number of connections to open, defaults
+                to the maximum number of connections kept alive
+
+        Returns:
+            int: The number of connections opened, which is 0 if the
+            transport doesn't keep connections alive.
+        """
+        return self.transport.warm_up(
+            self._url,
+            connections if connections is not None else self._pool_maxsize,
+            timeout=self.timeout[0]
+        )
+
+    def within(self, seconds: Optional[float] = None) -> Deadline:
+        """Return a deadline for all calls made within a with block, e.g.
+        to keep a request handler within its time budget:
+
+            with client.within(5.0) as deadline:
+                for domain in client.domains.list():
+                    domain.dns.list()
+
+        Every request made in the block is limited to the time left, and
+        raises a TransIPTimeoutError once the deadline has passed, or a
+        TransIPCancelledError once deadline.cancel() has been called. The
+        deadline applies to the calls of all clients made from the block,
+        including the calls made by the worker threads of map().
+
+        Args:
+            seconds (float): The number of seconds the calls in the block may
+                take, or None to only allow cancelling them
+
+        Returns:
+            Deadline: The deadline, to be used as a context manager.
+        """
+        return Deadline(seconds)
+
+    def map(
+        self,
+        func: Callable[[T], R],
+        items: Iterable[T],
+        max_workers: int = 8
+    ) -> List[Union[R, Exception]]:
+        """Call a function for every item concurrently, e.g. to retrieve the
+        DNS entries of all domains at once.
+
+        The function is called from a pool of worker threads sharing the
+        session of the client. Keep the number of workers below the size of
+        the connection pool of the session, which is 10 by default, to reuse
+        all connections.
+
+        The deadline of the current context applies to the calls made by the
+        worker threads, once it has passed or has been cancelled the function
+        isn't called for the remaining items.
+
+        Args:
+            func (callable): The function to call with every item
+            items (iterable): The items to call the function with
+            max_workers (int): The maximum number of concurrent calls
+
+        Returns:
+            A list with the result for every item, in the order of the items.
+            If the function raised an exception for an item, the exception is
+            returned instead of the result.
+        """
+        def call(item: T) -> Union[R, Exception]:
+            try:
+                if scope is not None:
+                    scope.check()
+                return func(item)
+            except Exception as exc:
+                return exc
+
+        items = list(items)
+        if not items:
+            return []
+        scope: Optional[Deadline] = current_deadline()
+        # Every worker thread runs the function in a copy of the current
+        # context, passing on the deadline
+        context: contextvars.Context = contextvars.copy_context()
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(items)),
+            thread_name_prefix="transip-map"
+        ) as executor:
+            return list(executor.map(
+                lambda item: context.copy().run(call, item), items
+            ))
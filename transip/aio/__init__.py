@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+"""Asynchronous wrapper for the TransIP API."""
+
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List,
+    Optional, TypeVar, Union
+)
+from concurrent.futures import ThreadPoolExecutor
+
+import asyncio
+import contextvars
+import functools
+import itertools
+
+from transip import TransIP
+from transip.deadline import Deadline
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class AsyncTransIP(TransIP):
+    """Represents an asynchronous TransIP server connection.
+
+    The services of the asynchronous client offer the same methods as the
+    services of the TransIP client, but as coroutines. Requests are made from
+    a pool of worker threads sharing a single pooled session, allowing many
+    requests to be in flight at the same time.
+
+    Unlike the TransIP client, the private key is read and the access token
+    is requested on the first request by default, from a worker thread
+    instead of blocking the event loop while the client is created.
+
+    Accepts the same arguments as the TransIP client and the following:
+
+    Args:
+        max_workers (int): The maximum number of requests in flight, and the
+            default maximum number of connections kept alive
+    """
+
+    # The module containing the asynchronous services for the specified API
+    # version
+    _objects_module: str = "transip.aio.v{api_version}.objects"
+
+    # The maximum number of elements to decode at once in a worker thread when
+    # streaming a response
+    _stream_batch_size: int = 100
+
+    def __init__(
+        self,
+        *args: Any,
+        max_workers: int = 64,
+        **kwargs: Any
+    ) -> None:
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="transip"
+        )
+        # Allow a connection per worker thread to be kept alive
+        kwargs.setdefault("pool_maxsize", max_workers)
+        # Don't request an access token from the event loop
+        kwargs.setdefault("lazy", True)
+        super().__init__(*args, **kwargs)
+
+    async def __aenter__(self) -> "AsyncTransIP":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the transport and shut down the worker threads."""
+        await self._run(self.transport.close)
+        self._executor.shutdown(wait=False)
+
+    async def _run(
+        self,
+        func: Callable[..., T],
+        *args: Any,
+        **kwargs: Any
+    ) -> T:
+        """
+        Run a blocking function in one of the worker threads, in a copy of
+        the current context.
+
+        The function runs within a deadline of its own, which is part of the
+        deadline of the current context if any. The deadline is cancelled when
+        the coroutine is cancelled, e.g. by asyncio.wait_for(), so no further
+        requests are sent or retried by the worker thread.
+        """
+        deadline: Deadline = Deadline()
+        context: contextvars.Context = contextvars.copy_context()
+
+        def call() -> T:
+            with deadline:
+                return func(*args, **kwargs)
+
+        # Returns the running event loop, get_running_loop() requires
+        # Python 3.7
+        loop = asyncio.get_event_loop()
+        try:
+            return await loop.run_in_executor(
+                self._executor, functools.partial(context.run, call)
+            )
+        except asyncio.CancelledError:
+            deadline.cancel()
+            raise
+
+    async def warm_up(  # type: ignore
+        self,
+        connections: Optional[int] = None
+    ) -> int:
+        """Open connections to the TransIP API in advance, e.g. at startup,
+        so the first requests don't have to wait for them.
+
+        Args:
+            connections (int): The number of connections to open, defaults
+                to the maximum number of connections kept alive
+
+        Returns:
+            int: The number of connections opened.
+        """
+        return await self._run(super().warm_up, connections)
+
+    async def request(  # type: ignore
+        self,
+        method: str,
+        path: str,
+        data: Optional[Any] = None,
+        json: Optional[Any] = None,
+        params: Optional[Dict[str, Any]] = None,
+        cache: bool = False
+    ) -> Any:
+        """Make an HTTP request to the TransIP API.
+
+        Args:
+            method (str): HTTP method to use
+            path (str): The path to append to the API URL
+            data (dict): The body to attach to the request
+            json (dict): The json body to attach to the request
+            params (dict): URL parameters to append to the URL
+            cache (bool): Use the response cache of the client, if any, for
+                this GET request
+
+        Returns:
+            Returns the json-encoded content of a response, if any.
+
+        Raises:
+            TransIPHTTPError: When the return code of the request is not 2xx
+            TransIPParsingError: When the content couldn't be parsed as JSON
+        """
+        return await self._run(
+            super().request, method, path, data=data, json=json,
+            params=params, cache=cache
+        )
+
+    async def stream(  # type: ignore
+        self,
+        path: str,
+        key: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Any]:
+        """Make a GET request to the TransIP API and incrementally parse the
+        response.
+
+        Args:
+            path (str): The path to append to the API URL
+            key (str): The key of the array in the response to iterate over
+            params (dict): URL parameters to append to the URL
+
+        Returns:
+            Yields the elements of the array as soon as they are decoded.
+
+        Raises:
+            TransIPHTTPError: When the return code of the request is not 2xx
+            TransIPParsingError: When the content couldn't be parsed as JSON
+        """
+        elements: Iterator[Any] = super().stream(path, key, params=params)
+        try:
+            while True:
+                # Read and decode the response in batches in a worker thread
+                batch: List[Any] = await self._run(
+                    _take, elements, self._stream_batch_size
+                )
+                for element in batch:
+                    yield element
+                if len(batch) < self._stream_batch_size:
+                    return
+        finally:
+            await self._run(elements.close)  # type: ignore
+
+    async def get(  # type: ignore
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        cache: bool = False
+    ) -> Any:
+        """Make a GET request to the TransIP API."""
+        return await self.request("GET", path, params=params, cache=cache)
+
+    async def post(  # type: ignore
+        self,
+        path: str,
+        data: Optional[Any] = None,
+        json: Optional[Any] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """Make a POST request to the TransIP API."""
+        return await self.request(
+            "POST", path, data=data, json=json, params=params
+        )
+
+    async def put(  # type: ignore
+        self,
+        path: str,
+        data: Optional[Any] = None,
+        json: Optional[Any] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """Make a PUT request to the TransIP API."""
+        return await self.request(
+            "PUT", path, data=data, json=json, params=params
+        )
+
+    async def patch(  # type: ignore
+        self,
+        path: str,
+        data: Optional[Any] = None,
+        json: Optional[Any] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """Make a PATCH request to the TransIP API."""
+        return await self.request(
+            "PATCH", path, data=data, json=json, params=params
+        )
+
+    async def delete(  # type: ignore
+        self,
+        path: str,
+        data: Optional[Any] = None,
+        json: Optional[Any] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """Make a DELETE request to the TransIP API."""
+        return await self.request(
+            "DELETE", path, data=data, json=json, params=params
+        )
+
+    async def map(  # type: ignore
+        self,
+        func: Callable[[T], Awaitable[R]],
+        items: Iterable[T],
+        max_workers: int = 8
+    ) -> List[Union[R, Exception]]:
+        """Await a coroutine function for every item concurrently.
+
+        Args:
+            func (callable): The coroutine function to call with every item
+            items (iterable): The items to call the function with
+            max_workers (int): The maximum number of concurrent calls
+
+        Returns:
+            A list with the result for every item, in the order of the items.
+            If the function raised an exception for an item, the exception is
+            returned instead of the result.
+        """
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def call(item: T) -> Union[R, Exception]:
+            async with semaphore:
+                try:
+                    return await func(item)
+                except Exception as exc:
+                    return exc
+
+        return list(await asyncio.gather(*[call(item) for item in items]))
+
+
+def _take(iterator: Iterator[T], count: int) -> List[T]:
+    """Return the next elements of the iterator, at most count elements."""
+    return list(itertools.islice(iterator, count))
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+
+from typing import Optional, List, Dict, Any, AsyncIterator
+
+import asyncio
+
+from transip import mixins
+from transip.base import ApiObject
+
+
+class GetMixin(mixins.GetMixin):
+    """
+    Retrieve an single ApiObject.
+
+    Derived class must define ``_resp_get_attr``.
+
+    ``_resp_get_attr``: The response attribute which contains the object
+    """
+
+    async def get(self, id: str) -> Optional[ApiObject]:  # type: ignore
+        if self._obj_cls or self.path or self._resp_get_attr:
+            data = await self.client.get(f"{self.path}/{id}", cache=True)
+            obj: ApiObject = self._obj_cls(  # type: ignore
+                self,
+                data[self._resp_get_attr]
+            )
+            return obj
+        return None
+
+
+class DeleteMixin(mixins.DeleteMixin):
+    """Delete a single ApiObject."""
+
+    async def delete(self, id: str) -> None:  # type: ignore
+        if self.path:
+            await self.client.delete(f"{self.path}/{id}")
+
+
+class ObjectDeleteMixin(mixins.ObjectDeleteMixin):
+    """Delete a single ApiObject."""
+
+    __slots__ = ()
+
+    async def delete(self) -> None:  # type: ignore
+        if self.get_id():  # type: ignore
+            await self.service.delete(self.get_id())  # type: ignore
+
+
+class ObjectUpdateMixin(mixins.ObjectUpdateMixin):
+    """Update a single ApiObject."""
+
+    __slots__ = ()
+
+    async def update(self) -> None:  # type: ignore
+        """
+        Update the changes made to the object.
+        """
+        updated_data = self._get_updated_data()
+        if not updated_data:
+            return
+
+        obj_id = self.get_id()  # type: ignore
+        await self.service.update(obj_id, updated_data)  # type: ignore
+
+
+class ListMixin(mixins.ListMixin):
+    """
+    Retrieve a list of ApiObjects.
+
+    Derived class must define ``_resp_list_attr``.
+
+    ``_resp_list_attr``: The response attribute which lists all objects
+    """
+
+    async def list(  # type: ignore
+        self,
+        page_size: Optional[int] = None
+    ) -> List[ApiObject]:
+        """
+        Retrieve a list of ApiObjects.
+
+        Args:
+            page_size (int): Retrieve the objects in pages of the given size
+                instead of all at once, see iter()
+        """
+        objs: List[ApiObject] = []
+        if page_size is not None:
+            async for obj in self.iter(page_size=page_size):
+                objs.append(obj)
+            return objs
+
+        if self._obj_cls and self.path and self._resp_list_attr:
+            data = await self.client.get(self.path, cache=True)
+            for obj in data[self._resp_list_attr]:
+                objs.append(self._obj_cls(self, obj))  # type: ignore
+        return objs
+
+    async def stream(self) -> AsyncIterator[ApiObject]:  # type: ignore
+        """
+        Iterate over the ApiObjects, creating each object as soon as it's
+        decoded from the response.
+        """
+        if not (self._obj_cls and self.path and self._resp_list_attr):
+            return
+        async for obj in self.client.stream(  # type: ignore
+            self.path, self._resp_list_attr
+        ):
+            yield self._obj_cls(self, obj)  # type: ignore
+
+    async def _get_page(  # type: ignore
+        self,
+        page: int,
+        page_size: int
+    ) -> List[Dict[str, Any]]:
+        """Return the attributes of the objects on a single page."""
+        params: Dict[str, Any] = {"page": page, "pageSize": page_size}
+        data = await self.client.get(self.path, params=params, cache=True)
+        return data[self._resp_list_attr]
+
+    async def iter(  # type: ignore
+        self,
+        page_size: int = 100,
+        prefetch: bool = False
+    ) -> AsyncIterator[ApiObject]:
+        """
+        Iterate over the ApiObjects, retrieving them page by page.
+
+        Args:
+            page_size (int): The number of objects to retrieve per request
+            prefetch (bool): Retrieve the next page in the background while
+                the objects of the current page are being processed
+        """
+        if not (self._obj_cls and self.path and self._resp_list_attr):
+            return
+
+        page: int = 1
+        pending: Optional[asyncio.Future] = None
+        previous: Optional[List[Dict[str, Any]]] = None
+        try:
+            while True:
+                if pending is not None:
+                    objs = await pending
+                else:
+                    objs = await self._get_page(page, page_size)
+                pending = None
+
+                # Endpoints which don't paginate return all objects for every
+                # page, i.e. more objects than requested or the same page again
+                if objs == previous:
+                    return
+                previous = objs
+                # A page which isn't full is the last page
+                last: bool = len(objs) != page_size
+                if prefetch and not last:
+                    pending = asyncio.ensure_future(
+                        self._get_page(page + 1, page_size)
+                    )
+                for obj in objs:
+                    yield self._obj_cls(self, obj)  # type: ignore
+                if last:
+                    return
+                page += 1
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+
+class UpdateMixin(mixins.UpdateMixin):
+    """
+    Update an ApiObject.
+    """
+
+    async def update(  # type: ignore
+        self,
+        id: Any,
+        data: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> None:
+        data = self._get_update_data(data)
+        if self.path:
+            await self.client.put(f"{self.path}/{id}", json=data)
+
+
+class ReplaceMixin(mixins.ReplaceMixin):
+    """
+    Replace a list of ApiObject at once by wiping to old objects and replacing
+    them with the provided list of ApiObjects.
+    """
+
+    async def replace(  # type: ignore
+        self,
+        objs: List[ApiObject]
+    ) -> None:
+        """
+        Replace all existing objects with the provided once.
+
+        Args:
+            objs: List of ApiObjects to replace the existing once with.
+        """
+        data = self._get_replace_data(objs)
+        if self.path:
+            await self.client.put(self.path, json=data)
+
+
+class CreateMixin(mixins.CreateMixin):
+    """
+    Create a new ApiObject.
+    """
+
+    async def create(  # type: ignore
+        self,
+        data: Optional[Dict[str, Any]] = None
+    ):
+        data = self._get_create_data(data)
+        if self.path:
+            await self.client.post(self.path, json=data)
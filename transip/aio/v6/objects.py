@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+
+from typing import (
+    Optional, Type, List, Dict, Any, AsyncIterator, Iterable, Mapping, Tuple,
+    Union
+)
+
+import datetime
+import os
+import time
+
+from transip.base import ApiObject
+from transip.exceptions import TransIPIOError
+from transip.aio.mixins import (
+    GetMixin, DeleteMixin, ListMixin, CreateMixin, UpdateMixin, ReplaceMixin,
+    ObjectDeleteMixin, ObjectUpdateMixin
+)
+from transip.v6 import objects
+
+
+class ApiTestService(objects.ApiTestService):
+
+    async def test(self):  # type: ignore
+        """
+        A simple test to make sure everything is working.
+
+        Returns:
+            bool: True if everything is working, False otherwise.
+        """
+        response = await self.client.get(f"{self.path}")
+        if response.get('ping') == 'pong':
+            return True
+        return False
+
+
+class ProductElementService(ListMixin, objects.ProductElementService):
+    """Service to manage elements of a product."""
+
+
+class Product(objects.Product):
+
+    __slots__ = ()
+
+    @property
+    def elements(self) -> ProductElementService:  # type: ignore
+        """Return the service to manage the elements of the product."""
+        return ProductElementService(
+            self.service.client,
+            parent=self  # type: ignore
+        )
+
+
+class ProductService(ListMixin, objects.ProductService):
+    """Service to manage products."""
+
+    _obj_cls: Optional[Type[ApiObject]] = Product
+
+    async def list(  # type: ignore
+        self,
+        page_size: Optional[int] = None
+    ) -> List[ApiObject]:
+        """
+        Retrieve a list of products.
+
+        Overwrites the default list() method of the ListMixin as the products
+        are stored in further down in the result dictionary. The products are
+        always retrieved at once.
+        """
+        objs: List[ApiObject] = []
+        response = await self.client.get(self.path, cache=True)
+        data = response[self._resp_list_attr]
+        # Loop over the individual product lists of all product categories,
+        # e.g. vps, haip
+        for obj_list in data.values():
+            for obj in obj_list:
+                objs.append(self._obj_cls(self, obj))  # type: ignore
+        return objs
+
+    async def iter(  # type: ignore
+        self,
+        page_size: int = 100,
+        prefetch: bool = False
+    ) -> AsyncIterator[ApiObject]:
+        """
+        Iterate over the products.
+
+        Overwrites the default iter() method of the ListMixin as the products
+        can't be retrieved page by page.
+        """
+        for obj in await self.list():
+            yield obj
+
+    async def stream(self) -> AsyncIterator[ApiObject]:  # type: ignore
+        """
+        Iterate over the products.
+
+        Overwrites the default stream() method of the ListMixin as the
+        products are stored in further down in the result dictionary.
+        """
+        for obj in await self.list():
+            yield obj
+
+
+class AvailabilityZoneService(ListMixin, objects.AvailabilityZoneService):
+    pass
+
+
+class SshKey(ObjectDeleteMixin, ObjectUpdateMixin, objects.SshKey):
+
+    __slots__ = ()
+
+
+class SshKeyService(GetMixin, CreateMixin, UpdateMixin, DeleteMixin, ListMixin,
+                    objects.SshKeyService):
+
+    _obj_cls: Optional[Type[ApiObject]] = SshKey
+
+
+class WhoisContactService(ListMixin, objects.WhoisContactService):
+    """Service to manage domain contacts of a domain."""
+
+
+class DnsEntry(objects.DnsEntry):
+
+    __slots__ = ()
+
+    async def delete(self) -> None:  # type: ignore
+        """
+        Delete a single DNS entry by calling the delete() method on its service
+        and providing all the DNS entry attributes.
+        """
+        await self.service.delete(dict(self.attrs))  # type: ignore
+
+    async def update(self) -> None:  # type: ignore
+        """
+        Update the changes made to the DnsEntry.
+        """
+        updated_data = self._get_updated_data()
+        if not updated_data:
+            return
+
+        await self.service.update(updated_data)  # type: ignore
+
+
+class DnsEntryService(CreateMixin, ListMixin, ReplaceMixin,
+                      objects.DnsEntryService):
+    """Service to manage DNS entries of a domain."""
+
+    _obj_cls: Optional[Type[ApiObject]] = DnsEntry
+
+    async def delete(  # type: ignore
+        self,
+        data: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Delete a DNS entry.
+        """
+        data = self._get_delete_data(data)
+        if self.path:
+            await self.client.delete(f"{self.path}", json=data)
+
+    async def update(  # type: ignore
+        self,
+        data: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Update a single DnsEntry.
+        """
+        data = self._get_update_data(data)
+        if self.path:
+            # Use the PATCH method to update a single DnsEntry.
+            await self.client.patch(f"{self.path}", json=data)
+
+    async def sync(  # type: ignore
+        self,
+        entries: Iterable[Union[objects.DnsEntry, Mapping[str, Any]]],
+        replace: Optional[bool] = None
+    ) -> objects.DnsSyncReport:
+        """
+        Make the DNS entries of the domain match the given DNS entries, using
+        as few requests as possible.
+        """
+        entries = list(entries)
+        current = (await self.client.get(self.path))[self._resp_list_attr]
+        report = self._get_sync_report(current, entries, replace)
+        for method, data in self._get_sync_requests(report, entries):
+            await self.client.request(method, self.path, json=data)
+        return report
+
+
+class NameserverService(ListMixin, ReplaceMixin, objects.NameserverService):
+    """Service to nameservers of a domain."""
+
+
+class Domain(objects.Domain):
+
+    __slots__ = ()
+
+    @property
+    def contacts(self) -> WhoisContactService:  # type: ignore
+        """Return the service to manage the WHOIS contacts of the domain."""
+        return WhoisContactService(
+            self.service.client,
+            parent=self  # type: ignore
+        )
+
+    @property
+    def dns(self) -> DnsEntryService:  # type: ignore
+        """Return the service to manage the DNS entries of the domain."""
+        return DnsEntryService(
+            self.service.client,
+            parent=self  # type: ignore
+        )
+
+    @property
+    def nameservers(self) -> NameserverService:  # type: ignore
+        """Return the service to manage the nameservers of the domain."""
+        return NameserverService(
+            self.service.client,
+            parent=self  # type: ignore
+        )
+
+
+class DomainService(CreateMixin, GetMixin, DeleteMixin, ListMixin,
+                    objects.DomainService):
+    """Service to manage domains."""
+
+    _obj_cls: Optional[Type[ApiObject]] = Domain
+
+
+class InvoiceItemService(ListMixin, objects.InvoiceItemService):
+    """Service to items of an invoice."""
+
+
+class Invoice(objects.Invoice):
+
+    __slots__ = ()
+
+    @property
+    def items(self) -> InvoiceItemService:  # type: ignore
+        """Return the service to manage the items of an invoice"""
+        return InvoiceItemService(
+            self.service.client,
+            parent=self  # type: ignore
+        )
+
+    async def pdf(self, file_path: str) -> Optional[str]:  # type: ignore
+        """
+        Write a invoice to a PDF file.
+
+        Args:
+            file_path (str): Path to PDF file, if the path is a directory to
+                PDF is saved using its invoice number.
+
+        Returns:
+            str: The absolute path to the saved PDF file.
+
+        Raises:
+            TransIPIOError: If the PDF data couldn't be written to file.
+        """
+        invoice_id = self.get_id()
+        if not invoice_id:
+            return None
+
+        file_path = os.path.abspath(file_path)
+        if os.path.isdir(file_path):
+            file_path = os.path.join(file_path, f"{invoice_id}.pdf")
+        if os.path.exists(file_path):
+            raise TransIPIOError(f"File {file_path} already exists")
+
+        # Stream and write the PDF data without blocking the event loop
+        await self.service.client._run(  # type: ignore
+            self._download_pdf, file_path
+        )
+        return file_path
+
+
+class InvoiceService(GetMixin, ListMixin, objects.InvoiceService):
+
+    _obj_cls: Optional[Type[ApiObject]] = Invoice
+
+    async def download_all(  # type: ignore
+        self,
+        directory: str,
+        since: Optional[Union[datetime.date, str]] = None,
+        max_workers: int = 4
+    ) -> objects.InvoiceDownloadReport:
+        """
+        Download the PDF files of all invoices to a directory, named by their
+        invoice number.
+        """
+        pending, skipped = self._get_download_targets(
+            await self.list(), directory, since
+        )
+        client = self.client
+
+        async def download(target: Tuple[objects.Invoice, str]) -> int:
+            return await client._run(  # type: ignore
+                target[0]._download_pdf, target[1]
+            )
+
+        start: float = time.monotonic()
+        results = await client.map(  # type: ignore
+            download, pending, max_workers=max_workers
+        )
+        return self._get_download_report(
+            pending, skipped, results, time.monotonic() - start
+        )
+
+
+class VpsService(GetMixin, DeleteMixin, ListMixin, objects.VpsService):
+    pass
+
+
+class ColocationService(GetMixin, ListMixin, objects.ColocationService):
+    pass
@@ -17,36 +17,187 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
 
-from typing import Optional, Type, Any, Union
+from types import MappingProxyType
+from typing import (
+    Optional, Type, Any, Union, Mapping, Tuple, Dict, FrozenSet, Callable
+)
+from collections import ChainMap
+import keyword
+import operator
 
 from transip import TransIP
+from transip.instrumentation import register_path_template
+from transip.templates import PathTemplate
 
 
-class ApiObject:
-    """Represents a TransIP API object."""
+# Marks a field which isn't set on the object
+_MISSING = object()
+
+# Read-only stand-in for the updated attributes of an object which hasn't been
+# changed yet
+_NO_UPDATED_ATTRS: Mapping[str, Any] = MappingProxyType({})
+
+# Used to set the slots of an ApiObject, bypassing ApiObject.__setattr__()
+_object_setattr = object.__setattr__
+
+
+def _make_init(fields: Tuple[str, ...]):
+    """
+    Return an __init__() method storing the fields present in the attributes
+    returned by the API in the slots of the object.
+
+    The method is generated to store all fields in a single pass using plain
+    attribute assignments, as done by dataclasses. To bypass the __setattr__()
+    method of the ApiObject for every field, the object is turned into an
+    instance of the ``_init_cls`` of its class while the slots are set, which
+    adds nothing but the default __setattr__() method. The class of the
+    object is restored even if setting the slots fails.
+
+    This creates objects about twice as fast as setting the slots in a loop
+    using object.__setattr__() or the descriptors of the slots.
+    """
+    lines = [
+        "def __init__(self, service, attrs):",
+        "    cls = type(self)",
+        "    _setattr(self, '__class__', cls._init_cls)",
+        "    try:",
+        "        self.service = service",
+        "        self._attrs = attrs",
+        "        self._updated = None",
+    ]
+    for field in fields:
+        if not field.isidentifier() or keyword.iskeyword(field):
+            raise ValueError(f"Invalid field name '{field}'")
+        lines.append(f"        if {field!r} in attrs:")
+        lines.append(f"            self.{field} = attrs[{field!r}]")
+    lines.append("    finally:")
+    lines.append("        self.__class__ = cls")
+
+    namespace: Dict[str, Any] = {}
+    exec("\n".join(lines), {"_setattr": _object_setattr}, namespace)
+    return namespace["__init__"]
+
+
+class ApiObjectMeta(type):
+    """
+    Metaclass of the ApiObject, turning the fields declared in ``_fields``
+    into slots and generating the __init__() method storing them.
+
+    The fields of the base classes are inherited, so ``_fields`` only has to
+    list the additional fields of a class.
+    """
+
+    def __new__(mcs, name, bases, namespace, **kwargs):
+        inherited: Tuple[str, ...] = ()
+        for base in bases:
+            inherited += tuple(
+                field for field in getattr(base, "_fields", ())
+                if field not in inherited
+            )
+        fields: Tuple[str, ...] = tuple(
+            field for field in namespace.get("_fields", ())
+            if field not in inherited
+        )
+        if fields:
+            namespace["__slots__"] = tuple(
+                namespace.get("__slots__", ())
+            ) + fields
+            if "__init__" not in namespace:
+                namespace["__init__"] = _make_init(inherited + fields)
+
+        cls = super().__new__(mcs, name, bases, namespace, **kwargs)
+        if "_init_cls" in namespace:
+            return cls
+        cls._fields = inherited + fields
+        if cls._fields:
+            # Used to compare all fields with the attributes returned by the
+            # API at once
+            cls._get_fields = operator.attrgetter(*cls._fields)
+            cls._get_field_attrs = operator.itemgetter(*cls._fields)
+        # The attributes stored in slots, any other attribute set on an object
+        # is stored as an updated attribute
+        cls._slot_set = frozenset(
+            slot for klass in cls.__mro__
+            for slot in klass.__dict__.get("__slots__", ())
+        )
+        if cls._fields:
+            # The class of the objects while their slots are set, see
+            # _make_init()
+            cls._init_cls = mcs(f"_{name}Init", (cls,), {
+                "__slots__": (),
+                "__setattr__": _object_setattr,
+                "_init_cls": None,
+            })
+        return cls
+
+
+class ApiObject(metaclass=ApiObjectMeta):
+    """
+    Represents a TransIP API object.
+
+    The attributes returned by the API are kept as is. The fields listed in
+    ``_fields`` are stored as slots when creating the object, making them as
+    fast to access as any regular attribute, all other attributes returned by
+    the API are looked up dynamically. Subclasses should define an empty
+    ``__slots__`` to keep the objects compact.
+
+    Changing a field updates its slot, any other attribute set on the object
+    is stored in a dictionary of updated attributes which is only created once
+    the first of these attributes is set. Fields which weren't returned by the
+    API are stored in both.
+    """
+
+    __slots__ = ("service", "_attrs", "_updated")
 
     _id_attr: Optional[str] = "id"
+    _fields: Tuple[str, ...] = ()
+    _slot_set: FrozenSet[str] = frozenset()
+    _get_fields: Callable[[Any], Any]
+    _get_field_attrs: Callable[[Any], Any]
+    _init_cls: type
 
     def __init__(self, service, attrs) -> None:
-        self.__dict__.update(
-            {
-                "service": service,
-                "_attrs": attrs,
-                "_updated_attrs": {}
-            }
-        )
+        _object_setattr(self, "service", service)
+        _object_setattr(self, "_attrs", attrs)
+        _object_setattr(self, "_updated", None)
 
     def __getattr__(self, name: str) -> Any:
+        # Only called for names which aren't found on the object itself, bail
+        # out for the slots to avoid recursion on partially created objects
+        if name in ApiObject.__slots__:
+            raise AttributeError(name)
+        updated = self._updated
+        if updated is not None and name in updated:
+            return updated[name]
         try:
-            return self.__dict__["_updated_attrs"][name]
+            return self._attrs[name]
         except KeyError:
-            try:
-                return self.__dict__["_attrs"][name]
-            except KeyError:
-                raise AttributeError(name)
+            raise AttributeError(name) from None
 
     def __setattr__(self, name: str, value: Any) -> None:
-        self.__dict__["_updated_attrs"][name] = value
+        if name in self._slot_set:
+            _object_setattr(self, name, value)
+            # Fields missing from the API response show up in the attributes
+            # once they're set
+            if name in self._attrs or name in ApiObject.__slots__:
+                return
+        updated = self._updated
+        if updated is None:
+            updated = {}
+            _object_setattr(self, "_updated", updated)
+        updated[name] = value
+
+    # The slots are restored explicitly when copying or unpickling an object,
+    # as __setattr__() depends on the attributes being restored first
+    def __getstate__(self):
+        return {
+            name: getattr(self, name) for name in self._slot_set
+            if hasattr(self, name)
+        }
+
+    def __setstate__(self, state) -> None:
+        for name, value in state.items():
+            _object_setattr(self, name, value)
 
     def __str__(self) -> str:
         return f"{type(self)} => {self._attrs}"
@@ -59,30 +210,72 @@ class ApiObject:
             return f"<{name}>"
 
     def __dir__(self):
-        return super().__dir__() + list(self.attrs)
+        return list(super().__dir__()) + list(self.attrs)
 
     def get_id(self) -> Union[Optional[int], Optional[str]]:
         """Returns the ID of the object."""
-        if self._id_attr and hasattr(self, self._id_attr):
-            return getattr(self, self._id_attr)
+        if self._id_attr:
+            return getattr(self, self._id_attr, None)
         return None
 
     @property
-    def attrs(self):
+    def _updated_attrs(self) -> Mapping[str, Any]:
+        """
+        Returns the attributes which have been changed, i.e. the fields which
+        differ from the attributes returned by the API and all other
+        attributes set on the object. The mapping must not be modified.
+        """
+        updated: Mapping[str, Any] = self._updated or _NO_UPDATED_ATTRS
+        if not self._fields:
+            return updated
+
+        attrs = self._attrs
+        try:
+            # Fast path for objects of which none of the fields are changed
+            if self._get_fields(self) == self._get_field_attrs(attrs):
+                return updated
+        except (AttributeError, KeyError):
+            pass
+
+        updated = dict(updated)
+        for name in self._fields:
+            value = getattr(self, name, _MISSING)
+            if value is _MISSING:
+                continue
+            if name not in attrs or attrs[name] != value:
+                updated[name] = value
+        return updated
+
+    @property
+    def attrs(self) -> Mapping[str, Any]:
         """
-        Returns a dictionary containing all the attributes.
+        Returns a read-only mapping containing all the attributes.
+
+        The mapping is a view on the attributes of the object rather than a
+        copy, use dict() to get a modifiable copy. For attributes which have
+        been changed the value returned by the API is given.
         """
-        attrs = self.__dict__["_updated_attrs"].copy()
-        attrs.update(self.__dict__["_attrs"])
-        return attrs
+        updated = self._updated
+        if updated is None:
+            return MappingProxyType(self._attrs)
+        return MappingProxyType(ChainMap(self._attrs, updated))
 
 
 class ApiService:
     """Represents a TransIP API service."""
 
     _path: Optional[str] = None
+    _path_template: Optional[PathTemplate] = None
     _obj_cls: Optional[Type[ApiObject]] = None
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if cls._path:
+            # Allow the instruments to group the requests by service path
+            register_path_template(cls._path)
+            if "_path_template" not in cls.__dict__:
+                cls._path_template = PathTemplate(cls._path)
+
     def __init__(
         self,
         client: TransIP,
@@ -90,11 +283,18 @@ class ApiService:
     ) -> None:
         self.client: TransIP = client
         self._parent: Optional[Type[ApiObject]] = parent
+        # The ID of the parent and the path formatted with it
+        self._parent_path: Tuple[Any, Optional[str]] = (_MISSING, None)
 
     @property
     def path(self) -> Optional[str]:
-        if self._path and self._parent:
-            return self._path.format(
-                parent_id=self._parent.get_id()  # type: ignore
+        if not (self._path and self._parent):
+            return self._path
+        parent_id = self._parent.get_id()  # type: ignore
+        cached_id, path = self._parent_path
+        if parent_id != cached_id:
+            path = self._path_template.format(  # type: ignore
+                parent_id=parent_id
             )
-        return self._path
+            self._parent_path = (parent_id, path)
+        return path
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+
+from typing import Any, Dict, Hashable, Optional, Tuple
+from collections import OrderedDict
+
+import threading
+import time
+
+from transip.utils import freeze_params
+
+
+# Typing alias for the keys of the cached responses
+CacheKey = Tuple[str, Hashable]
+
+
+class ResponseCache:
+    """
+    In-memory cache of API responses with a time-to-live and LRU eviction.
+
+    Responses are cached per path and URL parameters. Any request modifying a
+    path invalidates the cached responses for the path itself, the paths below
+    it and the paths above it, e.g. updating ``/ssh-keys/123`` invalidates
+    both ``/ssh-keys/123`` and ``/ssh-keys``.
+
+    The responses of clients with a different base URL or login are cached
+    separately, so a cache can be shared between clients. Clients using only
+    an access token can't be told apart, and shouldn't share a cache unless
+    their access tokens belong to the same account.
+
+    Cached responses are shared between callers and should not be modified.
+    A response received while the cache is invalidated, e.g. by a request
+    modifying the path which completed in the meantime, isn't stored if the
+    ``generation`` from before sending the request is passed to ``store()``.
+
+    Args:
+        maxsize (int): The maximum number of cached responses
+        ttl (float): The default number of seconds a response is cached
+        ttls (dict): The number of seconds a response is cached by path
+            prefix, e.g. ``{"/products": 3600}``
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        ttl: float = 60.0,
+        ttls: Optional[Dict[str, float]] = None
+    ) -> None:
+        self.maxsize: int = maxsize
+        self.ttl: float = ttl
+        self.ttls: Dict[str, float] = dict(ttls or {})
+
+        self._lock: threading.Lock = threading.Lock()
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Any]]" = (
+            OrderedDict()
+        )
+
+        # Incremented on every invalidation, to detect responses which may
+        # have been received before an invalidation
+        self.generation: int = 0
+
+        # Counters to allow the time-to-live of the responses to be tuned
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.invalidations: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        scope: Hashable = None
+    ) -> CacheKey:
+        """
+        Return the key of the response for the path and URL parameters.
+
+        Args:
+            path (str): The path of the request
+            params (dict): The URL parameters of the request
+            scope (hashable): Identifies the client making the request, e.g.
+                by its base URL and login
+        """
+        return (path, (scope, freeze_params(params)))
+
+    def get_ttl(self, path: str) -> float:
+        """Return the number of seconds the response for a path is cached."""
+        ttl: float = self.ttl
+        length: int = -1
+        # Use the time-to-live of the longest matching path prefix
+        for prefix, prefix_ttl in self.ttls.items():
+            if _is_below(path, prefix) and len(prefix) > length:
+                ttl, length = prefix_ttl, len(prefix)
+        return ttl
+
+    def lookup(self, key: CacheKey) -> Tuple[bool, Any]:
+        """
+        Return whether a valid response is cached for the key, and the
+        response itself.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def store(
+        self,
+        key: CacheKey,
+        value: Any,
+        generation: Optional[int] = None
+    ) -> None:
+        """
+        Cache the response for the key, unless the cache has been invalidated
+        since the given generation.
+        """
+        ttl: float = self.get_ttl(key[0])
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            # Evict the least recently used responses
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """
+        Remove the cached responses affected by a modification of the path, or
+        all cached responses if no path is given.
+        """
+        with self._lock:
+            self.generation += 1
+            if path is None:
+                self.invalidations += len(self._entries)
+                self._entries.clear()
+                return
+
+            path = path.rstrip("/")
+            for key in list(self._entries):
+                if _is_below(key[0], path) or _is_below(path, key[0]):
+                    del self._entries[key]
+                    self.invalidations += 1
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the cache counters.
+
+        Returns:
+            dict: The number of cache hits, misses, evicted and invalidated
+                responses and the current number of cached responses.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+            }
+
+    def reset_stats(self) -> None:
+        """Reset the cache counters."""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.invalidations = 0
+
+
+def _is_below(path: str, prefix: str) -> bool:
+    """Return whether the path equals the prefix or is located below it."""
+    return path == prefix or path.startswith(f"{prefix}/")
@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+"""
+Record the requests made to the TransIP API and replay them later without
+network access.
+"""
+
+from typing import IO, Any, Dict, Iterable, List, Optional, Tuple
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+
+from transip.exceptions import TransIPCassetteError
+from transip.transport import (
+    Timeout, Transport, TransportRequest, TransportResponse
+)
+
+
+# The value replacing redacted secrets
+REDACTED: str = "REDACTED"
+
+# The attributes of the responses which are redacted by default, i.e. the
+# access tokens and the authorization codes of domains
+DEFAULT_REDACT: Tuple[str, ...] = ("token", "authCode")
+
+# The attributes of the request bodies differing for every request, which are
+# ignored when matching requests
+_VOLATILE_ATTRS: Tuple[str, ...] = ("nonce",)
+
+# The response headers which aren't recorded, either because they contain
+# secrets or because they no longer apply to the recorded body
+_SKIPPED_HEADERS: Tuple[str, ...] = (
+    "set-cookie", "content-length", "content-encoding", "transfer-encoding",
+    "connection", "keep-alive"
+)
+
+# The key used to look up a recorded response, i.e. the method, the path
+# including the query string and the hash of the request body
+CassetteKey = Tuple[str, str, str]
+
+
+def _body_hash(body: Any) -> str:
+    """Return the hash of a request body, ignoring the volatile attributes."""
+    if not body:
+        return ""
+    if isinstance(body, str):
+        body = body.encode()
+    try:
+        data = json.loads(body)
+    except ValueError:
+        pass
+    else:
+        if isinstance(data, dict):
+            for attr in _VOLATILE_ATTRS:
+                data.pop(attr, None)
+        body = json.dumps(data, sort_keys=True).encode()
+    return hashlib.sha1(body).hexdigest()[:16]
+
+
+def _redact(data: Any, attrs: Iterable[str]) -> Any:
+    """Replace the values of the attributes in the JSON data."""
+    if isinstance(data, dict):
+        return {
+            key: REDACTED if key in attrs else _redact(value, attrs)
+            for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [_redact(value, attrs) for value in data]
+    return data
+
+
+class Cassette:
+    """
+    A file of recorded request and response pairs, in the JSON Lines format.
+
+    In record mode the requests are sent to the API and every response is
+    appended to the file. In replay mode no request leaves the process, the
+    recorded responses are returned instead. Requests are matched by their
+    method, path, query string and the hash of their body, identical requests
+    get their responses in the recorded order.
+
+    Request headers aren't recorded, and the values of the attributes listed
+    in ``redact`` are replaced in the recorded responses. Files ending with
+    ``.gz`` are compressed.
+
+    Args:
+        path (str): The path of the cassette file
+        mode (str): Either 'record', 'replay' or 'auto', which replays the
+            cassette if the file exists and records it otherwise
+        simulate_latency (bool): Wait for the recorded duration of a request
+            before returning its response when replaying
+        redact (iterable): The attributes of the responses to redact
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = "replay",
+        simulate_latency: bool = False,
+        redact: Iterable[str] = DEFAULT_REDACT,
+    ) -> None:
+        if mode == "auto":
+            mode = "replay" if os.path.exists(path) else "record"
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Invalid cassette mode '{mode}'")
+        self.path: str = path
+        self.mode: str = mode
+        self.simulate_latency: bool = simulate_latency
+        self.redact: frozenset = frozenset(redact)
+
+        self._lock: threading.Lock = threading.Lock()
+        self._file: Optional[IO[str]] = None
+        self._entries: Dict[CassetteKey, List[Dict[str, Any]]] = {}
+        self._played: Dict[CassetteKey, int] = {}
+        if mode == "replay":
+            self._load()
+
+    def _open(self, mode: str) -> IO[str]:
+        if self.path.endswith(".gz"):
+            return gzip.open(  # type: ignore
+                self.path, mode + "t", encoding="utf-8"
+            )
+        return open(self.path, mode, encoding="utf-8")
+
+    def _load(self) -> None:
+        try:
+            with self._open("r") as cassette:
+                for line in cassette:
+                    if line.strip():
+                        entry: Dict[str, Any] = json.loads(line)
+                        self._entries.setdefault(
+                            self.make_key(
+                                entry["method"], entry["path"],
+                                entry["body_hash"]
+                            ), []
+                        ).append(entry)
+        except (OSError, ValueError, KeyError) as exc:
+            raise TransIPCassetteError(
+                f"Unable to read cassette {self.path}"
+            ) from exc
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    @staticmethod
+    def make_key(method: str, path: str, body_hash: str) -> CassetteKey:
+        """Return the key to look up a recorded response."""
+        return (method.upper(), path, body_hash)
+
+    @staticmethod
+    def get_request_key(request: TransportRequest) -> CassetteKey:
+        """Return the key to look up the recorded response of a request."""
+        return Cassette.make_key(
+            request.method, request.path_url, _body_hash(request.body)
+        )
+
+    def record(
+        self,
+        request: TransportRequest,
+        response: TransportResponse,
+        elapsed: float
+    ) -> None:
+        """Append a request and its response to the cassette."""
+        method, path, body_hash = self.get_request_key(request)
+        body: str = response.text
+        if self.redact and body:
+            try:
+                body = json.dumps(_redact(json.loads(body), self.redact))
+            except ValueError:
+                pass
+        entry: Dict[str, Any] = {
+            "method": method,
+            "path": path,
+            "body_hash": body_hash,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {
+                name: value for name, value in response.headers.items()
+                if name.lower() not in _SKIPPED_HEADERS
+            },
+            "body": body,
+            "elapsed": round(elapsed, 6),
+        }
+        line: str = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file is None:
+                self._file = self._open("w")
+            self._file.write(line)
+            self._file.flush()
+
+    def play(self, request: TransportRequest) -> Dict[str, Any]:
+        """
+        Return the recorded response of a request, once all recorded responses
+        of identical requests have been returned the last one is repeated.
+
+        Raises:
+            TransIPCassetteError: If the request hasn't been recorded.
+        """
+        key = self.get_request_key(request)
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                raise TransIPCassetteError(
+                    f"No recorded response for {key[0]} {key[1]} in "
+                    f"cassette {self.path}"
+                )
+            index = self._played.get(key, 0)
+            self._played[key] = index + 1
+        return entries[min(index, len(entries) - 1)]
+
+    def rewind(self) -> None:
+        """Replay all recorded responses from the start."""
+        with self._lock:
+            self._played.clear()
+
+    def close(self) -> None:
+        """Close the cassette file when recording."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> "Cassette":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def wrap(self, transport: Transport) -> Transport:
+        """
+        Return a transport recording the requests sent using the transport,
+        or replaying them without using the transport at all.
+        """
+        return CassetteTransport(self, transport)
+
+
+class CassetteTransport(Transport):
+    """
+    Transport recording or replaying the requests using a cassette.
+
+    Args:
+        cassette (Cassette): The cassette to record to or replay from
+        transport (Transport): The transport sending the requests when
+            recording
+    """
+
+    def __init__(self, cassette: Cassette, transport: Transport) -> None:
+        self.cassette: Cassette = cassette
+        self.transport: Transport = transport
+
+    def send(
+        self,
+        request: TransportRequest,
+        stream: bool = False,
+        timeout: Optional[Timeout] = None
+    ) -> TransportResponse:
+        if self.cassette.mode == "replay":
+            return self._play(request)
+
+        start: float = time.perf_counter()
+        response: TransportResponse = self.transport.send(
+            request, stream=stream, timeout=timeout
+        )
+        # Read the body of streamed responses as well, it can be iterated over
+        # afterwards all the same
+        response.content
+        self.cassette.record(request, response, time.perf_counter() - start)
+        return response
+
+    def _play(self, request: TransportRequest) -> TransportResponse:
+        entry = self.cassette.play(request)
+        if self.cassette.simulate_latency and entry["elapsed"] > 0:
+            time.sleep(entry["elapsed"])
+        return TransportResponse(
+            entry["status"], entry["headers"], entry["body"].encode("utf-8"),
+            reason=entry.get("reason", "")
+        )
+
+    def warm_up(
+        self,
+        url: str,
+        connections: int,
+        timeout: Optional[float] = None
+    ) -> int:
+        if self.cassette.mode == "replay":
+            return 0
+        return self.transport.warm_up(url, connections, timeout)
+
+    def close(self) -> None:
+        self.transport.close()
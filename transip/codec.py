@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+"""
+The JSON codecs used by the client to encode request bodies and to decode
+responses, using orjson or ujson when installed.
+"""
+
+from typing import Any, Callable, Dict, Tuple
+
+import json
+
+
+class JSONCodec:
+    """
+    Encode JSON straight to bytes and decode it from bytes, using the json
+    module of the standard library.
+
+    Subclasses use a faster JSON library, all codecs produce compact JSON and
+    raise a ``ValueError`` when decoding invalid JSON.
+    """
+
+    name: str = "json"
+
+    def __init__(self) -> None:
+        self._encoder: json.JSONEncoder = json.JSONEncoder(
+            ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        )
+
+    def encode(self, data: Any) -> bytes:
+        """Return the data encoded as UTF-8 JSON."""
+        return self._encoder.encode(data).encode("utf-8")
+
+    def decode(self, content: bytes) -> Any:
+        """
+        Return the data decoded from UTF-8 JSON.
+
+        Raises:
+            ValueError: If the content isn't valid JSON.
+        """
+        return json.loads(content)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} [{self.name}]>"
+
+
+class OrjsonCodec(JSONCodec):
+    """Encode and decode JSON using orjson."""
+
+    name: str = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+        self._dumps: Callable[..., bytes] = orjson.dumps
+        self._loads: Callable[[bytes], Any] = orjson.loads
+        self._option: int = orjson.OPT_NON_STR_KEYS
+
+    def encode(self, data: Any) -> bytes:
+        return self._dumps(data, option=self._option)
+
+    def decode(self, content: bytes) -> Any:
+        return self._loads(content)
+
+
+class UjsonCodec(JSONCodec):
+    """Encode and decode JSON using ujson."""
+
+    name: str = "ujson"
+
+    def __init__(self) -> None:
+        import ujson  # type: ignore
+        self._dumps: Callable[..., str] = ujson.dumps
+        self._loads: Callable[[bytes], Any] = ujson.loads
+
+    def encode(self, data: Any) -> bytes:
+        return self._dumps(
+            data, ensure_ascii=False, escape_forward_slashes=False
+        ).encode("utf-8")
+
+    def decode(self, content: bytes) -> Any:
+        return self._loads(content)
+
+
+# The codecs by name, in order of preference
+CODECS: Dict[str, Callable[[], JSONCodec]] = {
+    "orjson": OrjsonCodec,
+    "ujson": UjsonCodec,
+    "json": JSONCodec,
+}
+
+
+def get_codec(name: str = "auto") -> JSONCodec:
+    """
+    Return the JSON codec by name.
+
+    Args:
+        name (str): Either 'orjson', 'ujson', 'json' for the json module of
+            the standard library, or 'auto' to use the fastest installed
+            library
+
+    Raises:
+        ValueError: If the name isn't a known codec.
+        ImportError: If the library of the codec isn't installed.
+    """
+    if name == "auto":
+        fallbacks: Tuple[str, ...] = tuple(CODECS)
+        for fallback in fallbacks[:-1]:
+            try:
+                return CODECS[fallback]()
+            except ImportError:
+                continue
+        return CODECS[fallbacks[-1]]()
+    try:
+        codec = CODECS[name]
+    except KeyError:
+        raise ValueError(f"Unknown JSON codec '{name}'") from None
+    return codec()
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+"""
+Deadlines and cancellation shared by all calls made within a block of code,
+e.g. by a single request handler.
+"""
+
+from typing import Any, List, Optional
+
+import contextvars
+import threading
+import time
+import weakref
+
+from transip.exceptions import TransIPCancelledError, TransIPTimeoutError
+
+
+# The deadline of the current context, if any
+_current: "contextvars.ContextVar[Optional[Deadline]]" = (
+    contextvars.ContextVar("transip_deadline", default=None)
+)
+
+
+def current_deadline() -> Optional["Deadline"]:
+    """Return the deadline of the current context, if any."""
+    return _current.get()
+
+
+class Deadline:
+    """
+    A time budget shared by all calls made within a ``with`` block.
+
+    Every request made by a client within the block is limited to the time
+    left before the deadline, as socket timeouts, and isn't sent or retried
+    once the deadline has passed or the deadline has been cancelled. The
+    deadline is passed on to the worker threads of ``TransIP.map()``, of the
+    operations built on it and of the asynchronous client.
+
+    A deadline created within the block of another deadline expires no later
+    than that deadline, and is cancelled along with it.
+
+    Args:
+        seconds (float): The number of seconds from now the deadline expires,
+            or None to only allow cancelling the calls
+        parent (Deadline): The deadline this deadline is part of, defaults to
+            the deadline of the current context
+    """
+
+    def __init__(
+        self,
+        seconds: Optional[float] = None,
+        parent: Optional["Deadline"] = None
+    ) -> None:
+        if parent is None:
+            parent = current_deadline()
+        self.seconds: Optional[float] = seconds
+        self.parent: Optional[Deadline] = parent
+
+        # The monotonic time by which the calls have to be completed, if any
+        self.expires: Optional[float] = None
+        if seconds is not None:
+            self.expires = time.monotonic() + seconds
+        if parent is not None and parent.expires is not None:
+            if self.expires is None or parent.expires < self.expires:
+                self.expires = parent.expires
+
+        self._cancelled: threading.Event = threading.Event()
+        self._children: weakref.WeakSet = weakref.WeakSet()
+        self._tokens: List[contextvars.Token] = []
+        if parent is not None:
+            parent._add_child(self)
+
+    def _add_child(self, child: "Deadline") -> None:
+        self._children.add(child)
+        # A deadline created after cancelling its parent is cancelled as well
+        if self._cancelled.is_set():
+            child.cancel()
+
+    def __enter__(self) -> "Deadline":
+        self._tokens.append(_current.set(self))
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        _current.reset(self._tokens.pop())
+
+    def __repr__(self) -> str:
+        return (
+            f"<Deadline remaining={self.remaining()!r} "
+            f"cancelled={self.cancelled!r}>"
+        )
+
+    def remaining(self) -> Optional[float]:
+        """Return the number of seconds left before the deadline, if any."""
+        if self.expires is None:
+            return None
+        return max(self.expires - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        """Return whether the deadline has passed."""
+        return self.expires is not None and time.monotonic() >= self.expires
+
+    @property
+    def cancelled(self) -> bool:
+        """Return whether the deadline has been cancelled."""
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        """
+        Cancel the calls made within the block, including the calls of all
+        deadlines created within the block.
+
+        Requests already sent complete, but no further requests are sent and
+        pending retries are abandoned.
+        """
+        self._cancelled.set()
+        for child in list(self._children):
+            child.cancel()
+
+    def check(self) -> None:
+        """
+        Raises:
+            TransIPCancelledError: If the deadline has been cancelled.
+            TransIPTimeoutError: If the deadline has passed.
+        """
+        if self._cancelled.is_set():
+            raise TransIPCancelledError("The call has been cancelled")
+        if self.expired:
+            raise TransIPTimeoutError(
+                "The deadline passed before the call completed"
+            )
+
+    def sleep(self, seconds: float) -> bool:
+        """
+        Wait for the number of seconds, unless the deadline is cancelled in
+        the meantime.
+
+        Returns:
+            bool: False if the deadline has been cancelled.
+        """
+        return not self._cancelled.wait(seconds)
@@ -54,3 +54,15 @@ class TransIPParsingError(TransIPError):
 
 class TransIPIOError(TransIPError):
     pass
+
+
+class TransIPCassetteError(TransIPError):
+    pass
+
+
+class TransIPTimeoutError(TransIPError):
+    pass
+
+
+class TransIPCancelledError(TransIPError):
+    pass
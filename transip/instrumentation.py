@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import bisect
+import functools
+import re
+import threading
+
+
+# Latency buckets in seconds, matching the default buckets of the Prometheus
+# client libraries
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# The paths of the services, e.g. '/domains/{parent_id}/dns', used to map the
+# path of a request to the endpoint it belongs to
+_path_templates: List[Tuple[str, "re.Pattern[str]"]] = []
+
+
+def register_path_template(template: str) -> None:
+    """
+    Register the path of a service, containing placeholders for the
+    identifiers of its parent objects.
+    """
+    if any(known == template for known, _ in _path_templates):
+        return
+    pattern = re.sub(r"\\{[^/]+\\}", "[^/]+", re.escape(template))
+    _path_templates.append((template, re.compile(f"{pattern}(?=/|$)")))
+    # Prefer the longest paths, e.g. '/domains/{parent_id}/dns' over
+    # '/domains'
+    _path_templates.sort(key=lambda item: len(item[0]), reverse=True)
+    path_template.cache_clear()
+
+
+@functools.lru_cache(maxsize=1024)
+def path_template(path: str) -> str:
+    """
+    Return the endpoint a request path belongs to, replacing the identifiers
+    by placeholders.
+
+    The path of the service is matched first, the segment following it is
+    taken as the identifier of an object of the service.
+
+    Examples:
+        >>> path_template("/domains/example.com/dns")
+        '/domains/{parent_id}/dns'
+        >>> path_template("/invoices/F0000.1911.0000.0004/pdf")
+        '/invoices/{id}/pdf'
+    """
+    path = path.split("?", 1)[0]
+    for template, pattern in _path_templates:
+        match = pattern.match(path)
+        if not match:
+            continue
+        rest: List[str] = path[match.end():].split("/")[1:]
+        if rest:
+            rest[0] = "{id}"
+        return "/".join([template] + rest)
+    return path
+
+
+class Instrument:
+    """
+    Receives the lifecycle events of the requests made by the client.
+
+    Subclasses override the callbacks they're interested in. The callbacks
+    are called for every attempt, so a retried request is reported more than
+    once, and may be called from multiple threads at once.
+
+    The path passed to the callbacks is the endpoint of the request, such as
+    ``/domains/{parent_id}/dns``, see ``path_template()``.
+    """
+
+    def before_request(self, method: str, path: str) -> None:
+        """Called before a request is sent."""
+
+    def after_response(
+        self,
+        method: str,
+        path: str,
+        status: int,
+        size: Optional[int],
+        elapsed: float
+    ) -> None:
+        """
+        Called when a response has been received.
+
+        Args:
+            method (str): The HTTP method of the request
+            path (str): The endpoint of the request
+            status (int): The status code of the response
+            size (int): The size of the response body in bytes, None if
+                unknown for a streamed response
+            elapsed (float): The time in seconds until the response was
+                received
+        """
+
+    def on_error(
+        self,
+        method: str,
+        path: str,
+        error: Exception,
+        elapsed: float
+    ) -> None:
+        """
+        Called when no response has been received, e.g. because the
+        connection failed.
+        """
+
+
+class _Series:
+    """The observations of a single endpoint."""
+
+    __slots__ = ("counts", "count", "sum", "max", "bytes", "errors")
+
+    def __init__(self, buckets: int) -> None:
+        # The last count is for the observations above the largest bucket
+        self.counts: List[int] = [0] * (buckets + 1)
+        self.count: int = 0
+        self.sum: float = 0.0
+        self.max: float = 0.0
+        self.bytes: int = 0
+        self.errors: int = 0
+
+
+class LatencyHistogram(Instrument):
+    """
+    Collect the latency of the requests per endpoint in histogram buckets.
+
+    The percentiles are estimated from the buckets, interpolating linearly
+    within the bucket containing the percentile, as done by Prometheus.
+
+    Args:
+        buckets (iterable): The upper bounds of the buckets in seconds
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        self._lock: threading.Lock = threading.Lock()
+        self._series: Dict[Tuple[str, str], _Series] = {}
+
+    def _get_series(self, method: str, path: str) -> _Series:
+        series = self._series.get((method, path))
+        if series is None:
+            series = self._series.setdefault(
+                (method, path), _Series(len(self.buckets))
+            )
+        return series
+
+    def after_response(
+        self,
+        method: str,
+        path: str,
+        status: int,
+        size: Optional[int],
+        elapsed: float
+    ) -> None:
+        index: int = bisect.bisect_left(self.buckets, elapsed)
+        with self._lock:
+            series = self._get_series(method, path)
+            series.counts[index] += 1
+            series.count += 1
+            series.sum += elapsed
+            series.max = max(series.max, elapsed)
+            if size:
+                series.bytes += size
+            if status >= 400:
+                series.errors += 1
+
+    def on_error(
+        self,
+        method: str,
+        path: str,
+        error: Exception,
+        elapsed: float
+    ) -> None:
+        with self._lock:
+            self._get_series(method, path).errors += 1
+
+    def _percentile(self, series: _Series, percentile: float) -> float:
+        """Estimate the percentile, between 0 and 100, of the series."""
+        if not series.count:
+            return 0.0
+        rank: float = series.count * percentile / 100
+        seen: int = 0
+        lower: float = 0.0
+        for upper, count in zip(self.buckets, series.counts):
+            if count and seen + count >= rank:
+                return min(
+                    lower + (upper - lower) * (rank - seen) / count,
+                    series.max
+                )
+            seen += count
+            lower = upper
+        # The percentile is above the largest bucket
+        return series.max
+
+    def percentile(self, method: str, path: str, percentile: float) -> float:
+        """
+        Return the estimated latency percentile of an endpoint in seconds.
+
+        Args:
+            method (str): The HTTP method, e.g. 'GET'
+            path (str): The endpoint, e.g. '/domains/{parent_id}/dns'
+            percentile (float): The percentile between 0 and 100
+        """
+        with self._lock:
+            series = self._series.get((method.upper(), path))
+            if series is None:
+                return 0.0
+            return self._percentile(series, percentile)
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Return the statistics per endpoint.
+
+        Returns:
+            dict: The number of responses, the number of failed requests, the
+                number of bytes received and the p50, p95 and p99 latency in
+                seconds, by method and endpoint, e.g. 'GET /domains'.
+        """
+        with self._lock:
+            return {
+                f"{method} {path}": {
+                    "count": series.count,
+                    "errors": series.errors,
+                    "bytes": series.bytes,
+                    "p50": self._percentile(series, 50),
+                    "p95": self._percentile(series, 95),
+                    "p99": self._percentile(series, 99),
+                }
+                for (method, path), series in sorted(self._series.items())
+            }
+
+    def reset_stats(self) -> None:
+        """Remove all observations."""
+        with self._lock:
+            self._series.clear()
+
+    def export_prometheus(self, prefix: str = "transip") -> str:
+        """
+        Return the histograms in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): The prefix of the metric names
+        """
+        lines: List[str] = [
+            f"# HELP {prefix}_request_duration_seconds "
+            "Latency of the TransIP API requests.",
+            f"# TYPE {prefix}_request_duration_seconds histogram",
+        ]
+        errors: List[str] = []
+        sizes: List[str] = []
+        with self._lock:
+            for (method, path), series in sorted(self._series.items()):
+                labels = (
+                    f'method="{_escape_label(method)}",'
+                    f'path="{_escape_label(path)}"'
+                )
+                cumulative: int = 0
+                for upper, count in zip(self.buckets, series.counts):
+                    cumulative += count
+                    lines.append(
+                        f"{prefix}_request_duration_seconds_bucket"
+                        f'{{{labels},le="{upper!r}"}} {cumulative}'
+                    )
+                lines.append(
+                    f"{prefix}_request_duration_seconds_bucket"
+                    f'{{{labels},le="+Inf"}} {series.count}'
+                )
+                lines.append(
+                    f"{prefix}_request_duration_seconds_sum{{{labels}}} "
+                    f"{series.sum!r}"
+                )
+                lines.append(
+                    f"{prefix}_request_duration_seconds_count{{{labels}}} "
+                    f"{series.count}"
+                )
+                errors.append(
+                    f"{prefix}_request_errors_total{{{labels}}} "
+                    f"{series.errors}"
+                )
+                sizes.append(
+                    f"{prefix}_response_bytes_total{{{labels}}} "
+                    f"{series.bytes}"
+                )
+
+        lines += [
+            f"# HELP {prefix}_request_errors_total "
+            "Failed TransIP API requests.",
+            f"# TYPE {prefix}_request_errors_total counter",
+        ]
+        lines += errors
+        lines += [
+            f"# HELP {prefix}_response_bytes_total "
+            "Bytes received from the TransIP API.",
+            f"# TYPE {prefix}_response_bytes_total counter",
+        ]
+        lines += sizes
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    """Escape a label value for the Prometheus text exposition format."""
+    return (
+        value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    )
@@ -17,7 +17,10 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
 
-from typing import Optional, List, Type, Dict, Any, Tuple, Union
+from typing import Optional, List, Type, Dict, Any, Tuple, Union, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import contextvars
 
 from transip import TransIP
 from transip.base import ApiObject, ApiService
@@ -45,11 +48,13 @@ class GetMixin:
 
     _resp_get_attr: Optional[str] = None
 
-    def get(self, id: str) -> Optional[Type[ApiObject]]:
+    def get(self, id: str) -> Optional[ApiObject]:
         if self._obj_cls or self.path or self._resp_get_attr:
-            obj: Type[ApiObject] = self._obj_cls(  # type: ignore
+            obj: ApiObject = self._obj_cls(  # type: ignore
                 self,
-                self.client.get(f"{self.path}/{id}")[self._resp_get_attr]
+                self.client.get(
+                    f"{self.path}/{id}", cache=True
+                )[self._resp_get_attr]
             )
             return obj
         return None
@@ -69,6 +74,8 @@ class DeleteMixin:
 class ObjectDeleteMixin:
     """Delete a single ApiObject."""
 
+    __slots__ = ()
+
     service: ApiService
 
     def delete(self) -> None:
@@ -79,6 +86,8 @@ class ObjectDeleteMixin:
 class ObjectUpdateMixin:
     """Update a single ApiObject."""
 
+    __slots__ = ()
+
     service: ApiService
     _updated_attrs: Any
 
@@ -117,13 +126,98 @@ class ListMixin:
 
     _resp_list_attr: Optional[str] = None
 
-    def list(self) -> List[Type[ApiObject]]:
-        objs: List[Type[ApiObject]] = []
+    def list(
+        self,
+        page_size: Optional[int] = None
+    ) -> List[ApiObject]:
+        """
+        Retrieve a list of ApiObjects.
+
+        Args:
+            page_size (int): Retrieve the objects in pages of the given size
+                instead of all at once, see iter()
+        """
+        if page_size is not None:
+            return list(self.iter(page_size=page_size))
+
+        objs: List[ApiObject] = []
         if self._obj_cls and self.path and self._resp_list_attr:
-            for obj in self.client.get(self.path)[self._resp_list_attr]:
+            data = self.client.get(self.path, cache=True)
+            for obj in data[self._resp_list_attr]:
                 objs.append(self._obj_cls(self, obj))  # type: ignore
         return objs
 
+    def stream(self) -> Iterator[ApiObject]:
+        """
+        Iterate over the ApiObjects, creating each object as soon as it's
+        decoded from the response.
+
+        Unlike list() the objects are retrieved using a single request, which
+        is never cached, while only holding a single object in memory.
+        """
+        if not (self._obj_cls and self.path and self._resp_list_attr):
+            return
+        for obj in self.client.stream(self.path, self._resp_list_attr):
+            yield self._obj_cls(self, obj)  # type: ignore
+
+    def _get_page(self, page: int, page_size: int) -> List[Dict[str, Any]]:
+        """Return the attributes of the objects on a single page."""
+        params: Dict[str, Any] = {"page": page, "pageSize": page_size}
+        data = self.client.get(self.path, params=params, cache=True)
+        return data[self._resp_list_attr]
+
+    def iter(
+        self,
+        page_size: int = 100,
+        prefetch: bool = False
+    ) -> Iterator[ApiObject]:
+        """
+        Iterate over the ApiObjects, retrieving them page by page.
+
+        Args:
+            page_size (int): The number of objects to retrieve per request
+            prefetch (bool): Retrieve the next page in the background while
+                the objects of the current page are being processed
+        """
+        if not (self._obj_cls and self.path and self._resp_list_attr):
+            return
+
+        executor: Optional[ThreadPoolExecutor] = None
+        if prefetch:
+            executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            page: int = 1
+            pending: Optional[Future] = None
+            previous: Optional[List[Dict[str, Any]]] = None
+            while True:
+                if pending is not None:
+                    objs = pending.result()
+                else:
+                    objs = self._get_page(page, page_size)
+                pending = None
+
+                # Endpoints which don't paginate return all objects for every
+                # page, i.e. more objects than requested or the same page again
+                if objs == previous:
+                    return
+                previous = objs
+                # A page which isn't full is the last page
+                last: bool = len(objs) != page_size
+                if executor is not None and not last:
+                    # Pass on the deadline of the current context, if any
+                    pending = executor.submit(
+                        contextvars.copy_context().run,
+                        self._get_page, page + 1, page_size
+                    )
+                for obj in objs:
+                    yield self._obj_cls(self, obj)  # type: ignore
+                if last:
+                    return
+                page += 1
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False)
+
 
 class UpdateMixin:
     """
@@ -169,12 +263,16 @@ class UpdateMixin:
                 f"attribute{'s'[:len(missing)!=1]} '{attrs_str}'"
             ))
 
-    def update(
+    def _get_update_data(
         self,
-        id: Any,
-        data: Optional[Dict[str, Any]] = None,
-        **kwargs
-    ) -> None:
+        data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Return the request body for updating an object.
+
+        Raises:
+            AttributeError: If any of the required attributes is missing.
+        """
         if data is None:
             data = {}
 
@@ -185,7 +283,15 @@ class UpdateMixin:
         # a specific key while others endpoint may not
         if self._req_update_attr:
             data = {self._req_update_attr: data}
+        return data
 
+    def update(
+        self,
+        id: Any,
+        data: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> None:
+        data = self._get_update_data(data)
         if self.path:
             self.client.put(f"{self.path}/{id}", json=data)
 
@@ -218,9 +324,9 @@ class ReplaceMixin:
         else:
             return self._replace_attrs
 
-    def replace(self, objs: List[Type[ApiObject]]) -> None:
+    def _get_replace_data(self, objs: List[ApiObject]) -> Any:
         """
-        Replace all existing objects with the provided once.
+        Return the request body for replacing all existing objects.
 
         Args:
             objs: List of ApiObjects to replace the existing once with.
@@ -247,7 +353,16 @@ class ReplaceMixin:
         # a specific key while others endpoint may not
         if self._req_replace_attr:
             data = {self._req_replace_attr: data}  # type: ignore
+        return data
 
+    def replace(self, objs: List[ApiObject]) -> None:
+        """
+        Replace all existing objects with the provided once.
+
+        Args:
+            objs: List of ApiObjects to replace the existing once with.
+        """
+        data = self._get_replace_data(objs)
         if self.path:
             self.client.put(self.path, json=data)
 
@@ -295,7 +410,16 @@ class CreateMixin:
         else:
             return self._create_attrs
 
-    def create(self, data: Optional[Dict[str, Any]] = None):
+    def _get_create_data(
+        self,
+        data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Return the request body for creating a new object.
+
+        Raises:
+            AttributeError: If any of the required attributes is missing.
+        """
         if data is None:
             data = {}
 
@@ -306,6 +430,9 @@ class CreateMixin:
         # a specific key while others endpoint do not
         if self._req_create_attr:
             data = {self._req_create_attr: data}
+        return data
 
+    def create(self, data: Optional[Dict[str, Any]] = None):
+        data = self._get_create_data(data)
         if self.path:
             self.client.post(self.path, json=data)
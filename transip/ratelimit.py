@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+
+from typing import Dict, Mapping, Optional
+
+import threading
+import time
+
+from transip.deadline import Deadline
+
+
+class RateLimiter:
+    """
+    Token bucket pacing the requests made to the TransIP API.
+
+    The bucket is refilled at the rate allowed by the API and is kept in sync
+    with the rate-limit headers of the API responses. A single rate limiter
+    can be shared by multiple threads and multiple clients, see ``shared()``.
+
+    Args:
+        limit (int): The number of requests allowed per period
+        period (float): The length of the rate-limit period in seconds
+        margin (int): The number of requests to keep in reserve below the
+            quota of the API
+    """
+
+    # Shared rate limiters by key, see shared()
+    _shared: Dict[str, "RateLimiter"] = {}
+    _shared_lock: threading.Lock = threading.Lock()
+
+    def __init__(
+        self,
+        limit: int = 1000,
+        period: float = 60.0,
+        margin: int = 10
+    ) -> None:
+        if not limit > margin >= 0:
+            raise ValueError(
+                "The limit must be greater than the non-negative margin"
+            )
+
+        self.limit: int = limit
+        self.period: float = period
+        self.margin: int = margin
+
+        self._lock: threading.Lock = threading.Lock()
+        self._tokens: float = float(self.capacity)
+        self._updated: float = time.monotonic()
+        # Monotonic time until which the quota of the API is exhausted
+        self._blocked_until: Optional[float] = None
+
+        # Counters to show how often, and how long, requests have been paced
+        self.throttled: int = 0
+        self.wait_time: float = 0.0
+
+    @classmethod
+    def shared(cls, key: str, **kwargs) -> "RateLimiter":
+        """
+        Return the rate limiter shared by all clients using the same key,
+        e.g. the TransIP username. The keyword arguments are only used when
+        the rate limiter doesn't exist yet.
+        """
+        with cls._shared_lock:
+            if key not in cls._shared:
+                cls._shared[key] = cls(**kwargs)
+            return cls._shared[key]
+
+    @property
+    def capacity(self) -> int:
+        """Return the maximum number of tokens in the bucket."""
+        return self.limit - self.margin
+
+    @property
+    def rate(self) -> float:
+        """Return the number of tokens added to the bucket per second."""
+        return self.limit / self.period
+
+    @property
+    def remaining(self) -> int:
+        """Return the number of requests that can be made without waiting."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._blocked_until is not None:
+                return 0
+            return int(self._tokens)
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens accumulated since the last refill to the bucket."""
+        if self._blocked_until is not None:
+            if now < self._blocked_until:
+                self._updated = now
+                return
+            # The rate-limit period of the API has been reset
+            self._blocked_until = None
+            self._tokens = float(self.capacity)
+        elapsed = now - self._updated
+        self._tokens = min(
+            float(self.capacity), self._tokens + elapsed * self.rate
+        )
+        self._updated = now
+
+    def acquire(
+        self,
+        blocking: bool = True,
+        timeout: Optional[float] = None,
+        deadline: Optional[Deadline] = None
+    ) -> bool:
+        """
+        Take a token from the bucket, waiting for one to become available.
+
+        Args:
+            blocking (bool): Wait for a token if none is available
+            timeout (float): The maximum number of seconds to wait
+            deadline (Deadline): Stop waiting once the deadline is cancelled
+
+        Returns:
+            bool: True if a token has been taken, False otherwise.
+        """
+        end: Optional[float] = None
+        if timeout is not None:
+            end = time.monotonic() + timeout
+
+        throttled: bool = False
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._blocked_until is not None:
+                    delay = self._blocked_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                else:
+                    delay = (1 - self._tokens) / self.rate
+
+                if not blocking or (end is not None and now + delay > end):
+                    return False
+                if not throttled:
+                    throttled = True
+                    self.throttled += 1
+                self.wait_time += delay
+            if deadline is None:
+                time.sleep(delay)
+            elif not deadline.sleep(delay):
+                return False
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """
+        Synchronize the bucket with the rate-limit headers of a response.
+
+        Args:
+            headers: The (case-insensitive) headers of an API response.
+        """
+        try:
+            remaining = int(headers["X-Rate-Limit-Remaining"])
+        except (KeyError, TypeError, ValueError):
+            return
+
+        with self._lock:
+            try:
+                limit = int(headers["X-Rate-Limit-Limit"])
+                if limit > self.margin:
+                    self.limit = limit
+            except (KeyError, TypeError, ValueError):
+                pass
+
+            now = time.monotonic()
+            self._refill(now)
+            tokens = remaining - self.margin
+            if tokens >= 1:
+                self._tokens = min(self._tokens, float(tokens))
+                return
+
+            # Wait for the rate-limit period of the API to be reset, if known
+            self._tokens = 0.0
+            try:
+                reset = float(headers["X-Rate-Limit-Reset"])
+            except (KeyError, TypeError, ValueError):
+                return
+            delay = min(max(reset - time.time(), 0.0), self.period)
+            self._blocked_until = now + delay
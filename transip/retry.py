@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+
+from typing import Optional, Iterable, FrozenSet, Dict
+from email.utils import parsedate_to_datetime
+
+import random
+import threading
+import time
+
+from transip.deadline import Deadline
+from transip.transport import TransportResponse
+
+
+# HTTP methods which can safely be retried as repeating them has the same
+# effect as making the request once
+IDEMPOTENT_METHODS: FrozenSet[str] = frozenset(
+    ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+)
+
+# Status codes indicating the request may succeed when retried later
+RETRY_STATUS_CODES: FrozenSet[int] = frozenset((429, 502, 503, 504))
+
+
+class RetryPolicy:
+    """
+    Policy describing which requests are retried and when.
+
+    The delay between two attempts grows exponentially with the number of
+    attempts and is jittered to prevent clients from retrying at the same
+    moment. A ``Retry-After`` header in the response takes precedence over the
+    computed delay.
+
+    Args:
+        total (int): The maximum number of retries of a single request, use 0
+            to disable retrying
+        backoff_factor (float): The base delay in seconds, the delay before the
+            n-th retry is at most ``backoff_factor * 2 ** n``
+        backoff_max (float): The maximum delay in seconds between two attempts
+        status_codes (iterable): The response status codes to retry
+        methods (iterable): The HTTP methods to retry, defaults to the
+            idempotent methods. Add POST to also retry creating objects.
+        respect_retry_after (bool): Wait for the time specified by the
+            ``Retry-After`` header of the response, if any
+        retry_after_max (float): The maximum time in seconds to wait for
+            because of a ``Retry-After`` header
+    """
+
+    def __init__(
+        self,
+        total: int = 3,
+        backoff_factor: float = 0.5,
+        backoff_max: float = 30.0,
+        status_codes: Iterable[int] = RETRY_STATUS_CODES,
+        methods: Iterable[str] = IDEMPOTENT_METHODS,
+        respect_retry_after: bool = True,
+        retry_after_max: float = 120.0,
+    ) -> None:
+        self.total: int = total
+        self.backoff_factor: float = backoff_factor
+        self.backoff_max: float = backoff_max
+        self.status_codes: FrozenSet[int] = frozenset(status_codes)
+        self.methods: FrozenSet[str] = frozenset(
+            method.upper() for method in methods
+        )
+        self.respect_retry_after: bool = respect_retry_after
+        self.retry_after_max: float = retry_after_max
+
+        # Counters to show how often, and how long, requests have been retried
+        self._lock: threading.Lock = threading.Lock()
+        self.retries: int = 0
+        self.retried_requests: int = 0
+        self.exhausted: int = 0
+        self.backoff_time: float = 0.0
+
+    def can_retry(self, method: Optional[str], attempt: int) -> bool:
+        """
+        Return whether a request using the method may be retried after the
+        given number of retries.
+        """
+        return (attempt < self.total and
+                (method or "").upper() in self.methods)
+
+    def is_retry(
+        self,
+        method: Optional[str],
+        status_code: int,
+        attempt: int
+    ) -> bool:
+        """
+        Return whether a request resulting in a response with the status code
+        is retried.
+        """
+        return (status_code in self.status_codes and
+                self.can_retry(method, attempt))
+
+    def get_backoff(self, attempt: int) -> float:
+        """Return the jittered delay in seconds before the next retry."""
+        delay = min(self.backoff_max, self.backoff_factor * (2 ** attempt))
+        return random.uniform(0, delay)
+
+    def get_retry_after(self, response: TransportResponse) -> Optional[float]:
+        """
+        Return the number of seconds to wait as specified by the
+        ``Retry-After`` header of the response, if any.
+        """
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            seconds = float(value)
+        except ValueError:
+            # The header may also contain a HTTP-date
+            try:
+                date = parsedate_to_datetime(value)
+            except (TypeError, ValueError):
+                return None
+            seconds = date.timestamp() - time.time()
+        return min(max(seconds, 0.0), self.retry_after_max)
+
+    def get_delay(
+        self,
+        attempt: int,
+        response: Optional[TransportResponse] = None
+    ) -> float:
+        """Return the delay in seconds before the next retry."""
+        if response is not None and self.respect_retry_after:
+            retry_after = self.get_retry_after(response)
+            if retry_after is not None:
+                return retry_after
+        return self.get_backoff(attempt)
+
+    def sleep(
+        self,
+        attempt: int,
+        delay: float,
+        deadline: Optional[Deadline] = None
+    ) -> None:
+        """
+        Wait before the next retry and update the counters. The wait ends
+        early if the deadline, if any, is cancelled.
+        """
+        with self._lock:
+            self.retries += 1
+            if attempt == 0:
+                self.retried_requests += 1
+            self.backoff_time += delay
+        if delay > 0:
+            if deadline is not None:
+                deadline.sleep(delay)
+            else:
+                time.sleep(delay)
+
+    def give_up(self, attempt: int) -> None:
+        """Update the counters for a request that won't be retried again."""
+        if attempt:
+            with self._lock:
+                self.exhausted += 1
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """
+        Return the retry counters.
+
+        Returns:
+            dict: The total number of retries, the number of requests that
+                have been retried, the number of requests which failed after
+                all retries and the total time in seconds spent waiting.
+        """
+        with self._lock:
+            return {
+                "retries": self.retries,
+                "retried_requests": self.retried_requests,
+                "exhausted": self.exhausted,
+                "backoff_time": self.backoff_time,
+            }
+
+    def reset_stats(self) -> None:
+        """Reset the retry counters."""
+        with self._lock:
+            self.retries = 0
+            self.retried_requests = 0
+            self.exhausted = 0
+            self.backoff_time = 0.0
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+
+from typing import (
+    Any, Callable, Dict, Hashable, Optional, Tuple, Type, TypeVar
+)
+
+import threading
+
+from transip.exceptions import TransIPTimeoutError
+from transip.utils import freeze_params
+
+
+T = TypeVar("T")
+
+
+class _Call:
+    """A call in flight, of which the outcome is shared with all callers."""
+
+    def __init__(self) -> None:
+        self.done: threading.Event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Collapse identical concurrent calls into a single call.
+
+    While a call for a key is in flight, any other call for the same key waits
+    for the call in flight to finish and shares its result, or its exception,
+    instead of making the call again.
+
+    Results are shared between callers and should not be modified.
+
+    Args:
+        local_errors (tuple): The exceptions which only apply to the caller
+            making the call, e.g. because of its deadline, which aren't shared
+            with the other callers; they make the call themselves instead
+    """
+
+    def __init__(
+        self,
+        local_errors: Tuple[Type[BaseException], ...] = ()
+    ) -> None:
+        self.local_errors: Tuple[Type[BaseException], ...] = local_errors
+        self._lock: threading.Lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+        # Counters to show how many calls have been saved
+        self.calls: int = 0
+        self.coalesced: int = 0
+
+    @staticmethod
+    def make_key(
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Hashable:
+        """Return the key of a request for the method, path and parameters."""
+        return (method.upper(), path, freeze_params(params))
+
+    def do(
+        self,
+        key: Hashable,
+        func: Callable[..., T],
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any
+    ) -> T:
+        """
+        Call the function, unless a call for the same key is already in flight
+        in which case the outcome of that call is returned.
+
+        Args:
+            key: The key of the call
+            func (callable): The function to call with the other arguments
+            timeout (float): The maximum number of seconds to wait for the
+                call in flight, which isn't passed to the function
+
+        Raises:
+            TransIPTimeoutError: If the call in flight didn't complete in
+                time.
+        """
+        with self._lock:
+            call: Optional[_Call] = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+                leader: bool = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            if not call.done.wait(timeout):
+                raise TransIPTimeoutError(
+                    "The deadline passed while waiting for an identical call"
+                )
+            if call.error is None:
+                return call.result
+            if not isinstance(call.error, self.local_errors):
+                raise call.error
+            with self._lock:
+                self.calls += 1
+            return func(*args, **kwargs)
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the counters.
+
+        Returns:
+            dict: The number of calls made, the number of calls saved by
+                sharing the outcome of a call in flight and the current number
+                of calls in flight.
+        """
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls),
+            }
+
+    def reset_stats(self) -> None:
+        """Reset the counters."""
+        with self._lock:
+            self.calls = 0
+            self.coalesced = 0
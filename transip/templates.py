@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+"""
+Precompiled templates of the requests made to the TransIP API, to avoid
+rebuilding the same paths and headers for every request.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import string
+
+
+class PathTemplate:
+    """
+    A path of which the placeholders are located once, e.g.
+    ``/domains/{parent_id}/dns``, formatting it by concatenating its parts.
+
+    Args:
+        template (str): The path with placeholders in the ``str.format()``
+            syntax, without conversions or format specifications
+    """
+
+    __slots__ = ("template", "_literals", "_fields")
+
+    def __init__(self, template: str) -> None:
+        literals: List[str] = [""]
+        fields: List[str] = []
+        for literal, field, spec, conversion in string.Formatter().parse(
+            template
+        ):
+            literals[-1] += literal
+            if field is None:
+                continue
+            if not field or spec or conversion:
+                raise ValueError(f"Unsupported placeholder in '{template}'")
+            fields.append(field)
+            literals.append("")
+
+        self.template: str = template
+        self._literals: Tuple[str, ...] = tuple(literals)
+        self._fields: Tuple[str, ...] = tuple(fields)
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """Return the names of the placeholders in order."""
+        return self._fields
+
+    def format(self, **values: Any) -> str:
+        """
+        Return the path with the placeholders replaced by the values.
+
+        Raises:
+            KeyError: If the value of a placeholder is missing.
+        """
+        literals: Tuple[str, ...] = self._literals
+        if len(literals) == 2:
+            # Most paths only contain the ID of the parent object
+            return f"{literals[0]}{values[self._fields[0]]}{literals[1]}"
+        parts: List[str] = [literals[0]]
+        for field, literal in zip(self._fields, literals[1:]):
+            parts.append(str(values[field]))
+            parts.append(literal)
+        return "".join(parts)
+
+    def __repr__(self) -> str:
+        return f"<PathTemplate [{self.template}]>"
+
+
+class HeaderTemplate(dict):
+    """
+    The headers sent with every request, caching the complete set of headers
+    per content type.
+
+    The cached sets are dropped whenever the headers are changed. They are
+    shared by all requests with the same content type, and must not be
+    modified.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._sets: Dict[Optional[str], Dict[str, str]] = {}
+
+    def for_content_type(
+        self,
+        content_type: Optional[str] = None
+    ) -> Dict[str, str]:
+        """Return the headers of a request with the content type, if any."""
+        sets: Dict[Optional[str], Dict[str, str]] = self._sets
+        try:
+            return sets[content_type]
+        except KeyError:
+            pass
+        headers: Dict[str, str] = dict(self)
+        if content_type:
+            headers["Content-Type"] = content_type
+        sets[content_type] = headers
+        return headers
+
+    def _changed(self) -> None:
+        # Replace the cached sets at once, in case they're used by another
+        # thread
+        self._sets = {}
+
+    def __setitem__(self, key: str, value: str) -> None:
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self._changed()
+
+    def __ior__(self, other: Any) -> "HeaderTemplate":  # type: ignore
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        super().clear()
+        self._changed()
+
+    def pop(self, *args: Any) -> Any:
+        try:
+            return super().pop(*args)
+        finally:
+            self._changed()
+
+    def popitem(self) -> Tuple[str, str]:
+        try:
+            return super().popitem()
+        finally:
+            self._changed()
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        try:
+            return super().setdefault(key, default)
+        finally:
+            self._changed()
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        super().update(*args, **kwargs)
+        self._changed()
@@ -0,0 +1,919 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+"""
+A local, stateful stand-in for the TransIP API to run integration and load
+tests against, without network access or a TransIP account.
+"""
+
+from typing import (
+    Any, Callable, Dict, List, Optional, Pattern, Tuple, Union
+)
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import base64
+import datetime
+import json
+import random
+import re
+import socketserver
+import threading
+import time
+
+from transip.utils import get_token_expiration
+
+
+# Resource attributes returned for new objects, completed by the attributes
+# supplied when creating them
+_DOMAIN_DEFAULTS: Dict[str, Any] = {
+    "authCode": "kJqfuOXNOYQKqh/jO4bYSn54YDqgAt1ksCe+ZG4Ud4nfpzw8qBsfR2",
+    "isTransferLocked": False,
+    "renewalDate": "2030-01-01",
+    "isWhitelabel": False,
+    "cancellationDate": "",
+    "cancellationStatus": "",
+    "isDnsOnly": False,
+    "tags": [],
+    "canEditDns": True,
+    "hasAutoDns": False,
+    "hasDnsSec": False,
+    "status": "registered",
+}
+
+_PRODUCTS: Dict[str, List[Dict[str, Any]]] = {
+    "vps": [{
+        "name": "vps-bladevps-x1",
+        "description": "ssd disk",
+        "price": 499,
+        "recurringPrice": 799,
+    }],
+    "haip": [{
+        "name": "haip-pro-contract",
+        "description": "HA-IP Pro",
+        "price": 1000,
+        "recurringPrice": 1000,
+    }],
+}
+
+_PRODUCT_ELEMENTS: List[Dict[str, Any]] = [
+    {"name": "ipv4Addresses", "description": "amount of ipv4 addresses",
+     "amount": 1},
+    {"name": "diskSize", "description": "amount of disk space in MB",
+     "amount": 153600000},
+]
+
+_AVAILABILITY_ZONES: List[Dict[str, Any]] = [
+    {"name": "ams0", "country": "nl", "isDefault": True},
+    {"name": "rtm0", "country": "nl", "isDefault": False},
+]
+
+# The content of the PDF served for every invoice
+_PDF: bytes = b"%PDF-1.4\n% Fake invoice generated by python-transip\n%%EOF\n"
+
+
+def _today() -> str:
+    return datetime.date.today().isoformat()
+
+
+def make_access_token(expires: float) -> str:
+    """Return an unsigned JSON Web Token expiring at the given time."""
+
+    def _encode(data: Dict[str, Any]) -> str:
+        encoded = base64.urlsafe_b64encode(json.dumps(data).encode())
+        return encoded.decode().rstrip("=")
+
+    header = _encode({"typ": "JWT", "alg": "RS256"})
+    payload = _encode({
+        "iss": "api.transip.nl",
+        "exp": int(expires),
+        "jti": "%032x" % random.getrandbits(128),
+    })
+    return f"{header}.{payload}.signature"
+
+
+class FakeAPIError(Exception):
+    """Error returned by the fake API as response."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class FakeTransIPState:
+    """
+    The resources of the fake TransIP account.
+
+    The resources are stored by their identifier, in the order they've been
+    added. Use the lock when modifying the resources while the server is
+    running.
+    """
+
+    def __init__(self) -> None:
+        self.lock: threading.RLock = threading.RLock()
+        self.domains: Dict[str, Dict[str, Any]] = {}
+        self.dns_entries: Dict[str, List[Dict[str, Any]]] = {}
+        self.nameservers: Dict[str, List[Dict[str, Any]]] = {}
+        self.contacts: Dict[str, List[Dict[str, Any]]] = {}
+        self.vpss: Dict[str, Dict[str, Any]] = {}
+        self.invoices: Dict[str, Dict[str, Any]] = {}
+        self.invoice_items: Dict[str, List[Dict[str, Any]]] = {}
+        self.ssh_keys: Dict[str, Dict[str, Any]] = {}
+        self.colocations: Dict[str, Dict[str, Any]] = {}
+        self._next_ssh_key_id: int = 1
+
+    def add_domain(
+        self,
+        name: str,
+        dns_entries: Optional[List[Dict[str, Any]]] = None,
+        nameservers: Optional[List[Dict[str, Any]]] = None,
+        contacts: Optional[List[Dict[str, Any]]] = None,
+        **attrs: Any
+    ) -> Dict[str, Any]:
+        """Add a domain with its DNS entries, nameservers and contacts."""
+        with self.lock:
+            domain = dict(
+                _DOMAIN_DEFAULTS, name=name, registrationDate=_today()
+            )
+            domain.update(attrs)
+            self.domains[name] = domain
+            self.dns_entries[name] = [
+                dict(entry) for entry in dns_entries or []
+            ]
+            self.nameservers[name] = [
+                dict(nameserver) for nameserver in nameservers or [
+                    {"hostname": f"ns{i}.transip.net", "ipv4": "",
+                     "ipv6": ""}
+                    for i in range(3)
+                ]
+            ]
+            self.contacts[name] = [dict(contact) for contact in contacts or []]
+            return domain
+
+    def add_vps(self, name: str, **attrs: Any) -> Dict[str, Any]:
+        """Add a VPS."""
+        with self.lock:
+            vps = {
+                "name": name,
+                "description": "",
+                "productName": "vps-bladevps-x1",
+                "operatingSystem": "ubuntu-20.04",
+                "diskSize": 157286400,
+                "memorySize": 4194304,
+                "cpus": 2,
+                "status": "running",
+                "ipAddress": "37.97.254.6",
+                "isLocked": False,
+                "isBlocked": False,
+                "isCustomerLocked": False,
+                "availabilityZone": "ams0",
+                "tags": [],
+            }
+            vps.update(attrs)
+            self.vpss[name] = vps
+            return vps
+
+    def add_invoice(
+        self,
+        invoice_number: str,
+        items: Optional[List[Dict[str, Any]]] = None,
+        **attrs: Any
+    ) -> Dict[str, Any]:
+        """Add an invoice, along with its items."""
+        with self.lock:
+            invoice = {
+                "invoiceNumber": invoice_number,
+                "creationDate": _today(),
+                "payDate": _today(),
+                "dueDate": _today(),
+                "invoiceStatus": "paid",
+                "currency": "EUR",
+                "totalAmount": 1000,
+                "totalAmountInclVat": 1210,
+            }
+            invoice.update(attrs)
+            self.invoices[invoice_number] = invoice
+            self.invoice_items[invoice_number] = [
+                dict(item) for item in items or [{
+                    "product": "Big Storage Disk 2000 GB",
+                    "description": "Big Storage Disk 2000 GB",
+                    "isRecurring": False,
+                    "date": invoice["creationDate"],
+                    "quantity": 1,
+                    "price": 1000,
+                    "priceInclVat": 1210,
+                    "vat": 210,
+                    "vatPercentage": 21,
+                    "discounts": [],
+                }]
+            ]
+            return invoice
+
+    def add_ssh_key(
+        self,
+        key: str,
+        description: str = "",
+        **attrs: Any
+    ) -> Dict[str, Any]:
+        """Add an SSH key, assigning it the next identifier."""
+        with self.lock:
+            ssh_key = {
+                "id": self._next_ssh_key_id,
+                "key": key,
+                "description": description,
+                "creationDate": _today(),
+                "fingerprint": "bb:22:43:69:2b:0d:3e:16:58:91:27:8a:62:29:97",
+            }
+            ssh_key.update(attrs)
+            self._next_ssh_key_id += 1
+            self.ssh_keys[str(ssh_key["id"])] = ssh_key
+            return ssh_key
+
+    def add_colocation(self, name: str, **attrs: Any) -> Dict[str, Any]:
+        """Add a colocation."""
+        with self.lock:
+            colocation = {"name": name, "ipRanges": ["2a01:7c8:c038:6::/64"]}
+            colocation.update(attrs)
+            self.colocations[name] = colocation
+            return colocation
+
+    def populate(
+        self,
+        domains: int = 0,
+        dns_entries: int = 10,
+        vpss: int = 0,
+        invoices: int = 0,
+        ssh_keys: int = 0
+    ) -> None:
+        """
+        Add synthetic resources, e.g. to load test with a large account.
+
+        Args:
+            domains (int): The number of domains to add
+            dns_entries (int): The number of DNS entries per domain
+            vpss (int): The number of VPSs to add
+            invoices (int): The number of invoices to add
+            ssh_keys (int): The number of SSH keys to add
+        """
+        # Continue numbering after any resources added before
+        for i in range(len(self.domains), len(self.domains) + domains):
+            self.add_domain(f"example{i}.com", dns_entries=[
+                {"name": f"host{j}", "expire": 86400, "type": "A",
+                 "content": f"10.0.{j // 256 % 256}.{j % 256}"}
+                for j in range(dns_entries)
+            ])
+        for i in range(len(self.vpss), len(self.vpss) + vpss):
+            self.add_vps(f"example-vps{i}")
+        for i in range(len(self.invoices), len(self.invoices) + invoices):
+            self.add_invoice(f"F0000.2000.0000.{i:04d}")
+        for i in range(len(self.ssh_keys), len(self.ssh_keys) + ssh_keys):
+            self.add_ssh_key(f"ssh-rsa AAAAB3NzaC1yc2E{i} example{i}")
+
+
+# A route is a method, a path pattern and the name of the handler method of
+# the FakeTransIPServer
+_ROUTES: List[Tuple[str, Pattern[str], str]] = [
+    (method, re.compile(f"^{pattern}$"), handler)
+    for method, pattern, handler in [
+        ("POST", r"/auth", "_auth"),
+        ("GET", r"/api-test", "_api_test"),
+        ("GET", r"/products", "_list_products"),
+        ("GET", r"/products/([^/]+)/elements", "_list_product_elements"),
+        ("GET", r"/availability-zones", "_list_availability_zones"),
+        ("GET", r"/domains", "_list_domains"),
+        ("POST", r"/domains", "_create_domain"),
+        ("GET", r"/domains/([^/]+)", "_get_domain"),
+        ("DELETE", r"/domains/([^/]+)", "_delete_domain"),
+        ("GET", r"/domains/([^/]+)/dns", "_list_dns"),
+        ("POST", r"/domains/([^/]+)/dns", "_create_dns"),
+        ("PUT", r"/domains/([^/]+)/dns", "_replace_dns"),
+        ("PATCH", r"/domains/([^/]+)/dns", "_update_dns"),
+        ("DELETE", r"/domains/([^/]+)/dns", "_delete_dns"),
+        ("GET", r"/domains/([^/]+)/nameservers", "_list_nameservers"),
+        ("PUT", r"/domains/([^/]+)/nameservers", "_replace_nameservers"),
+        ("GET", r"/domains/([^/]+)/contacts", "_list_contacts"),
+        ("PUT", r"/domains/([^/]+)/contacts", "_replace_contacts"),
+        ("GET", r"/vps", "_list_vpss"),
+        ("GET", r"/vps/([^/]+)", "_get_vps"),
+        ("DELETE", r"/vps/([^/]+)", "_delete_vps"),
+        ("GET", r"/invoices", "_list_invoices"),
+        ("GET", r"/invoices/([^/]+)", "_get_invoice"),
+        ("GET", r"/invoices/([^/]+)/invoice-items", "_list_invoice_items"),
+        ("GET", r"/invoices/([^/]+)/pdf", "_get_invoice_pdf"),
+        ("GET", r"/ssh-keys", "_list_ssh_keys"),
+        ("POST", r"/ssh-keys", "_create_ssh_key"),
+        ("GET", r"/ssh-keys/([^/]+)", "_get_ssh_key"),
+        ("PUT", r"/ssh-keys/([^/]+)", "_update_ssh_key"),
+        ("DELETE", r"/ssh-keys/([^/]+)", "_delete_ssh_key"),
+        ("GET", r"/colocations", "_list_colocations"),
+        ("GET", r"/colocations/([^/]+)", "_get_colocation"),
+    ]
+]
+
+# The response of a handler, i.e. the status code and the JSON body
+_Response = Tuple[int, Any]
+
+
+class _HTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Pass all requests to the FakeTransIPServer."""
+
+    # Keep connections alive to exercise the connection pool of the client
+    protocol_version = "HTTP/1.1"
+    server: Any
+
+    def _handle(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body: bytes = self.rfile.read(length) if length else b""
+        status, headers, content = self.server.fake.handle(
+            self.command, self.path, dict(self.headers.items()), body
+        )
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        if content:
+            self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class FakeTransIPServer:
+    """
+    An in-process HTTP server acting like the TransIP API.
+
+    The server keeps the resources of a single account in memory, see
+    ``state``, and implements the endpoints used by the services of the
+    client. Access tokens are handed out by ``/auth`` without verifying the
+    signature of the request, any other bearer token is accepted as well.
+
+    Args:
+        host (str): The address to listen on
+        port (int): The port to listen on, a free port is picked by default
+        latency (float): The delay in seconds before every response, either a
+            fixed delay or a tuple with the minimum and maximum delay
+        error_rate (float): The fraction of the requests, between 0 and 1,
+            failing with a 503 status code
+        rate_limit (int): The number of requests allowed per period before
+            requests fail with a 429 status code, unlimited by default
+        rate_limit_period (float): The length of the rate-limit period in
+            seconds
+        token_expiration (float): The number of seconds the access tokens
+            handed out by ``/auth`` are valid
+        seed (int): The seed for the random latency and errors
+
+    Example:
+        >>> with FakeTransIPServer(latency=0.01) as server:
+        ...     server.state.populate(domains=100)
+        ...     client = TransIP(access_token="token", base_url=server.url)
+        ...     domains = client.domains.list()
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: Union[float, Tuple[float, float]] = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: Optional[int] = None,
+        rate_limit_period: float = 60.0,
+        token_expiration: float = 1800.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.latency: Union[float, Tuple[float, float]] = latency
+        self.error_rate: float = error_rate
+        self.rate_limit: Optional[int] = rate_limit
+        self.rate_limit_period: float = rate_limit_period
+        self.token_expiration: float = token_expiration
+        self.state: FakeTransIPState = FakeTransIPState()
+
+        self._random: random.Random = random.Random(seed)
+        self._lock: threading.Lock = threading.Lock()
+        self._window_start: float = time.time()
+        self._window_requests: int = 0
+        self.requests: int = 0
+        self.errors: int = 0
+        self.throttled: int = 0
+
+        self._server: _HTTPServer = _HTTPServer((host, port), _RequestHandler)
+        self._server.fake = self  # type: ignore
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Return the URL to pass as ``base_url`` to the client."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"  # type: ignore
+
+    @property
+    def url(self) -> str:
+        """Return the URL of the API."""
+        return f"{self.base_url}/v6"
+
+    def start(self) -> "FakeTransIPServer":
+        """Start serving requests in a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever, args=(0.05,),
+                daemon=True, name="transip-fake-server"
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving requests and close the socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeTransIPServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the counters.
+
+        Returns:
+            dict: The number of requests received, the number of injected
+                errors and the number of throttled requests.
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "throttled": self.throttled,
+            }
+
+    def _throttle(self) -> Tuple[Optional[float], Dict[str, str]]:
+        """
+        Count the request against the rate limit, returning the number of
+        seconds to wait if it's exceeded and the rate-limit headers.
+        """
+        with self._lock:
+            self.requests += 1
+            if self.rate_limit is None:
+                return None, {}
+            now = time.time()
+            if now - self._window_start >= self.rate_limit_period:
+                self._window_start = now
+                self._window_requests = 0
+            self._window_requests += 1
+            reset = self._window_start + self.rate_limit_period
+            headers = {
+                "X-Rate-Limit-Limit": str(self.rate_limit),
+                "X-Rate-Limit-Remaining": str(
+                    max(self.rate_limit - self._window_requests, 0)
+                ),
+                "X-Rate-Limit-Reset": str(int(reset)),
+            }
+            if self._window_requests > self.rate_limit:
+                self.throttled += 1
+                return reset - now, headers
+            return None, headers
+
+    def _delay(self) -> None:
+        latency = self.latency
+        if isinstance(latency, tuple):
+            with self._lock:
+                latency = self._random.uniform(*latency)
+        if latency > 0:
+            time.sleep(latency)
+
+    def _inject_error(self) -> bool:
+        if self.error_rate <= 0:
+            return False
+        with self._lock:
+            if self._random.random() >= self.error_rate:
+                return False
+            self.errors += 1
+            return True
+
+    def handle(
+        self,
+        method: str,
+        target: str,
+        headers: Dict[str, str],
+        body: bytes
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Handle a single request.
+
+        Returns:
+            tuple: The status code, headers and body of the response.
+        """
+        self._delay()
+        retry_after, response_headers = self._throttle()
+        response_headers["Content-Type"] = "application/json"
+        if retry_after is not None:
+            response_headers["Retry-After"] = str(max(int(retry_after), 1))
+            status, data = 429, {"error": "Rate limit exceeded"}
+        elif self._inject_error():
+            status, data = 503, {"error": "Service temporarily unavailable"}
+        else:
+            # The data may refer to the resources themselves, e.g. a page of
+            # the domains, so it's serialized before the lock is released
+            with self.state.lock:
+                status, data = self._dispatch(method, target, headers, body)
+                return status, response_headers, self._serialize(data)
+        return status, response_headers, self._serialize(data)
+
+    @staticmethod
+    def _serialize(data: Any) -> bytes:
+        return json.dumps(data).encode() if data is not None else b""
+
+    def _dispatch(
+        self,
+        method: str,
+        target: str,
+        headers: Dict[str, str],
+        body: bytes
+    ) -> _Response:
+        url = urlsplit(target)
+        if not url.path.startswith("/v6/"):
+            return 404, {"error": "Unknown API version"}
+        path = url.path[len("/v6"):]
+        params = {
+            key: values[-1] for key, values in parse_qs(url.query).items()
+        }
+
+        try:
+            if path != "/auth":
+                self._check_authorization(headers)
+            data: Any = json.loads(body) if body else {}
+            for route_method, pattern, name in _ROUTES:
+                match = pattern.match(path)
+                if match and route_method == method:
+                    handler: Callable[..., _Response] = getattr(self, name)
+                    return handler(*match.groups(), data=data, params=params)
+            if any(pattern.match(path) for _, pattern, _ in _ROUTES):
+                raise FakeAPIError(405, f"Method {method} not allowed")
+            raise FakeAPIError(404, f"Endpoint {path} not found")
+        except FakeAPIError as exc:
+            return exc.status, {"error": exc.message}
+        except (ValueError, KeyError, TypeError) as exc:
+            return 400, {"error": f"Invalid request: {exc}"}
+
+    def _check_authorization(self, headers: Dict[str, str]) -> None:
+        authorization: str = next(
+            (value for name, value in headers.items()
+             if name.lower() == "authorization"), ""
+        )
+        if not authorization.startswith("Bearer ") or not authorization[7:]:
+            raise FakeAPIError(401, "No access token provided")
+        # Tokens which aren't JSON Web Tokens don't expire
+        expiration = get_token_expiration(authorization[7:])
+        if expiration is not None and expiration <= time.time():
+            raise FakeAPIError(401, "Your access token has expired")
+
+    @staticmethod
+    def _paginate(objs: List[Any], params: Dict[str, str]) -> List[Any]:
+        if "pageSize" not in params:
+            return objs
+        page_size = int(params["pageSize"])
+        page = int(params.get("page", 1))
+        if page_size < 1 or page < 1:
+            raise FakeAPIError(406, "Invalid page or pageSize")
+        return objs[(page - 1) * page_size:page * page_size]
+
+    @staticmethod
+    def _get(objs: Dict[str, Any], key: str, kind: str) -> Any:
+        try:
+            return objs[key]
+        except KeyError:
+            raise FakeAPIError(404, f"{kind} with id '{key}' not found")
+
+    def _auth(self, data: Dict[str, Any], params: Dict[str, str]) -> _Response:
+        if not data.get("login") or not data.get("nonce"):
+            raise FakeAPIError(400, "The login and nonce are required")
+        token = make_access_token(time.time() + self.token_expiration)
+        return 201, {"token": token}
+
+    def _api_test(self, data: Any, params: Dict[str, str]) -> _Response:
+        return 200, {"ping": "pong"}
+
+    def _list_products(self, data: Any, params: Dict[str, str]) -> _Response:
+        return 200, {"products": _PRODUCTS}
+
+    def _list_product_elements(
+        self,
+        name: str,
+        data: Any,
+        params: Dict[str, str]
+    ) -> _Response:
+        if not any(p["name"] == name for ps in _PRODUCTS.values() for p in ps):
+            raise FakeAPIError(404, f"Product '{name}' not found")
+        return 200, {"productElements": _PRODUCT_ELEMENTS}
+
+    def _list_availability_zones(
+        self,
+        data: Any,
+        params: Dict[str, str]
+    ) -> _Response:
+        return 200, {"availabilityZones": _AVAILABILITY_ZONES}
+
+    def _list_domains(self, data: Any, params: Dict[str, str]) -> _Response:
+        domains = list(self.state.domains.values())
+        return 200, {"domains": self._paginate(domains, params)}
+
+    def _create_domain(
+        self,
+        data: Dict[str, Any],
+        params: Dict[str, str]
+    ) -> _Response:
+        name: str = data["domainName"]
+        if name in self.state.domains:
+            raise FakeAPIError(406, f"Domain '{name}' already exists")
+        self.state.add_domain(
+            name,
+            dns_entries=data.get("dnsEntries"),
+            nameservers=data.get("nameservers"),
+            contacts=data.get("contacts"),
+        )
+        return 201, None
+
+    def _get_domain(
+        self,
+        name: str,
+        data: Any,
+        params: Dict[str, str]
+    ) -> _Response:
+        return 200, {"domain": self._get(self.state.domains, name, "Domain")}
+
+    def _delete_domain(
+        self,
+        name: str,
+        data: Any,
+        params: Dict[str, str]
+    ) -> _Response:
+        self._get(self.state.domains, name, "Domain")
+        for objs in (self.state.domains, self.state.dns_entries,
+                     self.state.nameservers, self.state.contacts):
+            del objs[name]  # type: ignore
+        return 204, None
+
+    def _dns_entries(self, name: str) -> List[Dict[str, Any]]:
+        return self._get(self.state.dns_entries, name, "Domain")
+
+    @staticmethod
+    def _dns_entry(data: Dict[str, Any]) -> Dict[str, Any]:
+        entry = data["dnsEntry"]
+        return {
+            "name": str(entry["name"]),
+            "expire": int(entry["expire"]),
+            "type": str(entry["type"]),
+            "content": str(entry["content"]),
+        }
+
+    def _list_dns(
+        self,
+        name: str,
+        data: Any,
+        params: Dict[str, str]
+    ) -> _Response:
+        entries = self._dns_entries(name)
+        return 200, {"dnsEntries": self._paginate(entries, params)}
+
+    def _create_dns(
+        self,
+        name: str,
+        data: Dict[str, Any],
+        params: Dict[str, str]
+    ) -> _Response:
+        entries = self._dns_entries(name)
+        entry = self._dns_entry(data)
+        if entry in entries:
+            raise FakeAPIError(406, "The DNS entry already exists")
+        entries.append(entry)
+        return 201, None
+
+    def _replace_dns(
+        self,
+        name: str,
+        data: Dict[str, Any],
+        params: Dict[str, str]
+    ) -> _Response:
+        entries = [
+            self._dns_entry({"dnsEntry": entry})
+            for entry in data["dnsEntries"]
+        ]
+        self._dns_entries(name)[:] = entries
+        return 204, None
+
+    def _update_dns(
+        self,
+        name: str,
+        data: Dict[str, Any],
+        params: Dict[str, str]
+    ) -> _Response:
+        # A single DNS entry is identified by its name, expire and type, only
+        # its content can be updated
+        entry = self._dns_entry(data)
+        matches = [
+            existing for existing in self._dns_entries(name)
+            if (existing["name"], existing["expire"], existing["type"]) ==
+            (entry["name"], entry["expire"], entry["type"])
+        ]
+        if not matches:
+            raise FakeAPIError(404, "The DNS entry doesn't exist")
+        if len(matches) > 1:
+            raise FakeAPIError(406, "The DNS entry isn't unique")
+        matches[0]["content"] = entry["content"]
+        return 204, None
+
+    def _delete_dns(
+        self,
+        name: str,
+        data: Dict[str, Any],
+        params: Dict[str, str]
+    ) -> _Response:
+        entries = self._dns_entries(name)
+        entry = self._dns_entry(data)
+        if entry not in entries:
+            raise FakeAPIError(404, "The DNS entry doesn't exist")
+        entries.remove(entry)
+        return 204, None
+
+    def _list_nameservers(
+        self,
+        name: str,
+        data: Any,
+        params: Dict[str, str]
+    ) -> _Response:
+        nameservers = self._get(self.state.nameservers, name, "Domain")
+        return 200, {"nameservers": nameservers}
+
+    def _replace_nameservers(
+        self,
+        name: str,
+        data: Dict[str, Any],
+        params: Dict[str, str]
+    ) -> _Response:
+        self._get(self.state.nameservers, name, "Domain")
+        self.state.nameservers[name] = [
+            {"hostname": nameserver["hostname"],
+             "ipv4": nameserver.get("ipv4", ""),
+             "ipv6": nameserver.get("ipv6", "")}
+            for nameserver in data["nameservers"]
+        ]
+        return 204, None
+
+    def _list_contacts(
+        self,
+        name: str,
+        data: Any,
+        params: Dict[str, str]
+    ) -> _Response:
+        contacts = self._get(self.state.contacts, name, "Domain")
+        return 200, {"contacts": contacts}
+
+    def _replace_contacts(
+        self,
+        name: str,
+        data: Dict[str, Any],
+        params: Dict[str, str]
+    ) -> _Response:
+        self._get(self.state.contacts, name, "Domain")
+        self.state.contacts[name] = [
+            dict(contact) for contact in data["contacts"]
+        ]
+        return 204, None
+
+    def _list_vpss(self, data: Any, params: Dict[str, str]) -> _Response:
+        vpss = list(self.state.vpss.values())
+        return 200, {"vpss": self._paginate(vpss, params)}
+
+    def _get_vps(
+        self,
+        name: str,
+        data: Any,
+        params: Dict[str, str]
+    ) -> _Response:
+        return 200, {"vps": self._get(self.state.vpss, name, "VPS")}
+
+    def _delete_vps(
+        self,
+        name: str,
+        data: Any,
+        params: Dict[str, str]
+    ) -> _Response:
+        self._get(self.state.vpss, name, "VPS")
+        del self.state.vpss[name]
+        return 204, None
+
+    def _list_invoices(self, data: Any, params: Dict[str, str]) -> _Response:
+        invoices = list(self.state.invoices.values())
+        return 200, {"invoices": self._paginate(invoices, params)}
+
+    def _get_invoice(
+        self,
+        number: str,
+        data: Any,
+        params: Dict[str, str]
+    ) -> _Response:
+        invoice = self._get(self.state.invoices, number, "Invoice")
+        return 200, {"invoice": invoice}
+
+    def _list_invoice_items(
+        self,
+        number: str,
+        data: Any,
+        params: Dict[str, str]
+    ) -> _Response:
+        items = self._get(self.state.invoice_items, number, "Invoice")
+        return 200, {"invoiceItems": self._paginate(items, params)}
+
+    def _get_invoice_pdf(
+        self,
+        number: str,
+        data: Any,
+        params: Dict[str, str]
+    ) -> _Response:
+        self._get(self.state.invoices, number, "Invoice")
+        return 200, {"pdf": base64.b64encode(_PDF).decode("ascii")}
+
+    def _list_ssh_keys(self, data: Any, params: Dict[str, str]) -> _Response:
+        ssh_keys = list(self.state.ssh_keys.values())
+        return 200, {"sshKeys": self._paginate(ssh_keys, params)}
+
+    def _create_ssh_key(
+        self,
+        data: Dict[str, Any],
+        params: Dict[str, str]
+    ) -> _Response:
+        self.state.add_ssh_key(data["sshKey"], data.get("description", ""))
+        return 201, None
+
+    def _get_ssh_key(
+        self,
+        id: str,
+        data: Any,
+        params: Dict[str, str]
+    ) -> _Response:
+        return 200, {"sshKey": self._get(self.state.ssh_keys, id, "SSH key")}
+
+    def _update_ssh_key(
+        self,
+        id: str,
+        data: Dict[str, Any],
+        params: Dict[str, str]
+    ) -> _Response:
+        ssh_key = self._get(self.state.ssh_keys, id, "SSH key")
+        ssh_key["description"] = data["description"]
+        return 204, None
+
+    def _delete_ssh_key(
+        self,
+        id: str,
+        data: Any,
+        params: Dict[str, str]
+    ) -> _Response:
+        self._get(self.state.ssh_keys, id, "SSH key")
+        del self.state.ssh_keys[id]
+        return 204, None
+
+    def _list_colocations(
+        self,
+        data: Any,
+        params: Dict[str, str]
+    ) -> _Response:
+        colocations = list(self.state.colocations.values())
+        return 200, {"colocations": self._paginate(colocations, params)}
+
+    def _get_colocation(
+        self,
+        name: str,
+        data: Any,
+        params: Dict[str, str]
+    ) -> _Response:
+        colocation = self._get(self.state.colocations, name, "Colocation")
+        return 200, {"colocation": colocation}
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+
+from typing import Dict, Optional, Tuple
+from abc import ABC, abstractmethod
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+class TokenStore(ABC):
+    """
+    Base class of the stores used to reuse access tokens.
+
+    Tokens are stored together with their expiration time and are only
+    returned while they remain valid for longer than ``leeway`` seconds.
+
+    Args:
+        leeway (float): The minimal number of seconds a token should remain
+            valid to be reused
+    """
+
+    def __init__(self, leeway: float = 60.0) -> None:
+        self.leeway: float = leeway
+
+    @staticmethod
+    def make_key(
+        login: Optional[str],
+        private_key: str,
+        global_key: Optional[bool] = False,
+        read_only: bool = False
+    ) -> str:
+        """
+        Return the key identifying the tokens issued for the given login,
+        private key and token options.
+        """
+        fingerprint = hashlib.sha256(private_key.encode()).hexdigest()
+        key = f"{login}:{fingerprint}:{bool(global_key)}:{read_only}"
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored token for the key if it is still valid."""
+        entry = self._load(key)
+        if entry is None:
+            return None
+        token, expires = entry
+        if expires - self.leeway <= time.time():
+            return None
+        return token
+
+    @abstractmethod
+    def set(self, key: str, token: str, expires: float) -> None:
+        """Store the token for the key until the expiration time."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove the token stored for the key, if any."""
+
+    @abstractmethod
+    def _load(self, key: str) -> Optional[Tuple[str, float]]:
+        """Return the stored token and its expiration time, if any."""
+
+
+class MemoryTokenStore(TokenStore):
+    """Store access tokens in memory, shared by all clients using it."""
+
+    def __init__(self, leeway: float = 60.0) -> None:
+        super().__init__(leeway)
+        self._lock: threading.Lock = threading.Lock()
+        self._tokens: Dict[str, Tuple[str, float]] = {}
+
+    def set(self, key: str, token: str, expires: float) -> None:
+        with self._lock:
+            self._tokens[key] = (token, expires)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._tokens.pop(key, None)
+
+    def _load(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            return self._tokens.get(key)
+
+
+class FileTokenStore(TokenStore):
+    """
+    Store access tokens on disk, allowing them to be reused by subsequent
+    processes.
+
+    Each token is written to a separate file which is only readable by the
+    current user. Failures to read or write the files are ignored, resulting
+    in a new token being requested.
+
+    Args:
+        directory (str): The directory to store the tokens in, defaults to
+            ``$XDG_CACHE_HOME/python-transip`` or
+            ``~/.cache/python-transip``
+        leeway (float): The minimal number of seconds a token should remain
+            valid to be reused
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        leeway: float = 60.0
+    ) -> None:
+        super().__init__(leeway)
+        if directory is None:
+            cache_home = os.environ.get(
+                "XDG_CACHE_HOME", os.path.join("~", ".cache")
+            )
+            directory = os.path.join(cache_home, "python-transip")
+        self.directory: str = os.path.abspath(os.path.expanduser(directory))
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def set(self, key: str, token: str, expires: float) -> None:
+        try:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+            try:
+                with os.fdopen(fd, "w") as tmp_file:
+                    json.dump({"token": token, "expires": expires}, tmp_file)
+                os.chmod(tmp_path, 0o600)
+                # Atomically replace the existing token, if any
+                os.replace(tmp_path, self._get_path(key))
+            except OSError:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            pass
+
+    def delete(self, key: str) -> None:
+        try:
+            os.unlink(self._get_path(key))
+        except OSError:
+            pass
+
+    def _load(self, key: str) -> Optional[Tuple[str, float]]:
+        try:
+            with open(self._get_path(key)) as token_file:
+                entry = json.load(token_file)
+            return str(entry["token"]), float(entry["expires"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
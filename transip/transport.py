@@ -0,0 +1,793 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+"""
+The transports sending the HTTP requests of the client to the TransIP API.
+
+A transport takes the method, URL, headers and body of a request and returns
+the status code, headers and body of the response, allowing the HTTP stack to
+be replaced without changing the services.
+"""
+
+from typing import (
+    Any, Callable, Deque, Dict, Iterable, Iterator, List, Mapping, Optional,
+    Tuple
+)
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+
+import functools
+import json
+import socket
+import threading
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from requests.cookies import RequestsCookieJar
+from requests.hooks import default_hooks
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_netrc_auth, select_proxy
+
+from transip.codec import JSONCodec
+
+
+# The codec encoding JSON request bodies when no codec is given
+_DEFAULT_CODEC: JSONCodec = JSONCodec()
+
+# The number of seconds to wait for a connection and for every read, either
+# of which may be None to wait indefinitely
+Timeout = Tuple[Optional[float], Optional[float]]
+
+# The options set on the sockets of new connections
+SocketOptions = List[Tuple[int, int, int]]
+
+# The function answering the requests of the in-memory transport, e.g. the
+# handle() method of a ``transip.testing.FakeTransIPServer``
+Handler = Callable[
+    [str, str, Dict[str, str], bytes], Tuple[int, Mapping[str, str], bytes]
+]
+
+
+def keepalive_socket_options(
+    idle: float = 60.0,
+    interval: float = 10.0,
+    count: int = 6
+) -> SocketOptions:
+    """
+    Return the socket options enabling TCP keep-alive, in addition to the
+    default socket options of urllib3. The keep-alive timings are only set on
+    platforms supporting them.
+
+    Args:
+        idle (float): The number of seconds a connection is idle before the
+            first keep-alive probe is sent
+        interval (float): The number of seconds between keep-alive probes
+        count (int): The number of failed probes after which the connection
+            is dropped
+    """
+    options: SocketOptions = list(
+        urllib3.connection.HTTPConnection.default_socket_options
+    )
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    # macOS names the idle time TCP_KEEPALIVE instead of TCP_KEEPIDLE
+    idle_option: Optional[int] = getattr(
+        socket, "TCP_KEEPIDLE", getattr(socket, "TCP_KEEPALIVE", None)
+    )
+    for option, value in (
+        (idle_option, idle),
+        (getattr(socket, "TCP_KEEPINTVL", None), interval),
+        (getattr(socket, "TCP_KEEPCNT", None), count),
+    ):
+        if option is not None:
+            options.append((socket.IPPROTO_TCP, option, max(int(value), 1)))
+    return options
+
+
+def build_url(url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+    """
+    Return the URL with the parameters appended as query string, skipping
+    parameters of which the value is None.
+    """
+    if not params:
+        return url
+    query: str = urlencode(
+        [(key, value) for key, value in params.items() if value is not None],
+        doseq=True
+    )
+    if not query:
+        return url
+    return f"{url}{'&' if '?' in url else '?'}{query}"
+
+
+def encode_body(
+    data: Optional[Any] = None,
+    json_data: Optional[Any] = None,
+    codec: Optional[JSONCodec] = None
+) -> Tuple[Optional[bytes], Optional[str]]:
+    """
+    Return the encoded body of a request and its content type, the data takes
+    precedence over the JSON body which is encoded using the codec.
+    """
+    if data:
+        if isinstance(data, bytes):
+            return data, None
+        if isinstance(data, str):
+            return data.encode(), None
+        return (
+            urlencode(list(dict(data).items()), doseq=True).encode(),
+            "application/x-www-form-urlencoded"
+        )
+    if json_data is not None:
+        return (
+            (codec or _DEFAULT_CODEC).encode(json_data), "application/json"
+        )
+    return None, None
+
+
+class TransportRequest:
+    """
+    A HTTP request to send using a transport.
+
+    Args:
+        method (str): The HTTP method
+        url (str): The URL including the query string
+        headers (dict): The headers of the request
+        body (bytes): The body of the request, if any
+    """
+
+    __slots__ = ("method", "url", "headers", "body")
+
+    def __init__(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        body: Optional[bytes] = None
+    ) -> None:
+        self.method: str = method.upper()
+        self.url: str = url
+        self.headers: Dict[str, str] = headers if headers is not None else {}
+        self.body: Optional[bytes] = body
+
+    @property
+    def path_url(self) -> str:
+        """Return the path of the URL including the query string."""
+        url = urlsplit(self.url)
+        return f"{url.path}?{url.query}" if url.query else url.path
+
+    def __repr__(self) -> str:
+        return f"<TransportRequest [{self.method} {self.url}]>"
+
+
+class TransportResponse:
+    """
+    The response to a request sent using a transport.
+
+    The body of a streamed response is read when iterating over its content,
+    or when accessing the content.
+
+    Args:
+        status_code (int): The HTTP status code
+        headers (mapping): The headers of the response
+        content (bytes): The body of the response
+        chunks (iterable): The body of a streamed response in chunks, instead
+            of the content
+        reason (str): The reason phrase of the status code
+        close (callable): Called when the response is closed, e.g. to release
+            the connection
+    """
+
+    def __init__(
+        self,
+        status_code: int,
+        headers: Optional[Mapping[str, str]] = None,
+        content: bytes = b"",
+        chunks: Optional[Iterable[bytes]] = None,
+        reason: str = "",
+        close: Optional[Callable[[], Any]] = None
+    ) -> None:
+        self.status_code: int = status_code
+        self.headers: CaseInsensitiveDict = CaseInsensitiveDict(headers or {})
+        self.reason: str = reason
+        self._content: Optional[bytes] = content if chunks is None else None
+        self._chunks: Optional[Iterable[bytes]] = chunks
+        self._close: Optional[Callable[[], Any]] = close
+
+    @property
+    def content(self) -> bytes:
+        """Return the body of the response, reading it if streamed."""
+        if self._content is None:
+            self._content = b"".join(self._chunks or ())
+            self._chunks = None
+        return self._content
+
+    @property
+    def text(self) -> str:
+        """Return the body of the response decoded as UTF-8."""
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        """
+        Return the JSON decoded body of the response.
+
+        Raises:
+            ValueError: If the body isn't valid JSON.
+        """
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size: int = 1) -> Iterator[bytes]:
+        """Yield the body of the response in chunks as it's read."""
+        if self._chunks is not None:
+            chunks, self._chunks = self._chunks, None
+            self._content = b""
+            yield from chunks
+            return
+        content: bytes = self.content
+        for start in range(0, len(content), chunk_size):
+            yield content[start:start + chunk_size]
+
+    def close(self) -> None:
+        """Close the response, releasing its connection."""
+        if self._close is not None:
+            close, self._close = self._close, None
+            close()
+
+    def __repr__(self) -> str:
+        return f"<TransportResponse [{self.status_code}]>"
+
+
+class Transport:
+    """
+    Base class of the transports, sending a request and returning its
+    response.
+
+    Connection errors are raised as ``requests.ConnectionError`` by all
+    transports, allowing the client to retry the request.
+    """
+
+    def send(
+        self,
+        request: TransportRequest,
+        stream: bool = False,
+        timeout: Optional[Timeout] = None
+    ) -> TransportResponse:
+        """
+        Send a request and return its response.
+
+        The headers of the request may be shared with other requests, and
+        must not be modified.
+
+        Args:
+            request (TransportRequest): The request to send
+            stream (bool): Don't read the body of the response until its
+                content is iterated over
+            timeout (tuple): The number of seconds to wait for the connection
+                and for every read, defaults to the timeout of the transport
+
+        Raises:
+            requests.ConnectionError: If the request couldn't be sent.
+            requests.Timeout: If the server didn't respond in time.
+        """
+        raise NotImplementedError
+
+    def warm_up(
+        self,
+        url: str,
+        connections: int,
+        timeout: Optional[float] = None
+    ) -> int:
+        """
+        Open connections to the host of the URL in advance and keep them in
+        the connection pool, if the transport has one.
+
+        Args:
+            url (str): The URL of the host to connect to
+            connections (int): The number of connections to open, limited to
+                the size of the connection pool
+            timeout (float): The number of seconds to wait for a connection
+
+        Returns:
+            int: The number of connections opened.
+        """
+        return 0
+
+    def close(self) -> None:
+        """Close all connections of the transport."""
+
+    def __enter__(self) -> "Transport":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _warm_up_pool(
+    pool: Any,
+    connections: int,
+    timeout: Optional[float] = None
+) -> int:
+    """
+    Open connections of a urllib3 connection pool concurrently, returning
+    the number of connections opened.
+
+    The connections are taken from and returned to the pool using its private
+    methods, as available in urllib3 1.x and 2.x. No connections are opened
+    if the pool doesn't have these methods.
+    """
+    get_conn = getattr(pool, "_get_conn", None)
+    put_conn = getattr(pool, "_put_conn", None)
+    if get_conn is None or put_conn is None:
+        return 0
+
+    # Connections beyond the size of the pool would be discarded
+    size: Optional[int] = getattr(getattr(pool, "pool", None), "maxsize", None)
+    if size:
+        connections = min(connections, size)
+    conns: List[Any] = [get_conn() for _ in range(connections)]
+    # Connections kept alive already have a socket
+    idle: List[Any] = [conn for conn in conns if conn.sock is None]
+
+    def connect(conn: Any) -> bool:
+        if timeout is not None:
+            conn.timeout = timeout
+        try:
+            conn.connect()
+        except (OSError, urllib3.exceptions.HTTPError):
+            conn.close()
+            return False
+        return True
+
+    try:
+        if not idle:
+            return 0
+        with ThreadPoolExecutor(
+            max_workers=len(idle), thread_name_prefix="transip-warm-up"
+        ) as executor:
+            return sum(executor.map(connect, idle))
+    finally:
+        for conn in conns:
+            put_conn(conn)
+
+
+class PoolAdapter(HTTPAdapter):
+    """
+    Transport adapter of the requests library setting the socket options of
+    its connections, e.g. to enable TCP keep-alive.
+
+    Args:
+        socket_options (list): The options set on the sockets of new
+            connections, see ``keepalive_socket_options()``
+        **kwargs: Passed to ``requests.adapters.HTTPAdapter``
+    """
+
+    # The attributes restored when unpickling, before the pool manager is
+    # created
+    __attrs__ = HTTPAdapter.__attrs__ + ["socket_options"]
+
+    def __init__(
+        self,
+        socket_options: Optional[SocketOptions] = None,
+        **kwargs: Any
+    ) -> None:
+        # Set before the pool manager is created by the adapter
+        self.socket_options: Optional[SocketOptions] = socket_options
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        if self.socket_options is not None:
+            kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, proxy: str, **kwargs: Any) -> Any:
+        if self.socket_options is not None:
+            kwargs["socket_options"] = self.socket_options
+        return super().proxy_manager_for(proxy, **kwargs)
+
+
+@functools.lru_cache(maxsize=1024)
+def _prepare_url(url: str) -> str:
+    """Return the URL as prepared by the requests library."""
+    prepped = requests.PreparedRequest()
+    prepped.prepare_url(url, None)
+    return prepped.url  # type: ignore
+
+
+class RequestsTransport(Transport):
+    """
+    Transport sending requests using a session of the requests library, the
+    default transport of the client.
+
+    Unless the session has its own authentication, parameters, cookies or
+    hooks, the requests are prepared without merging the settings of the
+    session for every request. The proxies, CA bundle and client certificate
+    of the session and of the environment, e.g. ``HTTPS_PROXY`` and
+    ``REQUESTS_CA_BUNDLE``, are merged as done by the session, but only once
+    per host, as are the netrc credentials of the environment.
+
+    When any of the pool settings is given, a ``PoolAdapter`` with these
+    settings is mounted on the session.
+
+    Args:
+        session (requests.Session): The session to use, a new session is
+            created by default
+        pool_connections (int): The number of hosts to keep connections to
+        pool_maxsize (int): The maximum number of connections kept alive per
+            host, keep it at least as high as the number of threads making
+            requests
+        tcp_keepalive (float): Enable TCP keep-alive, sending the first
+            probe after a connection has been idle for the number of seconds
+        timeout (tuple): The default number of seconds to wait for the
+            connection and for every read
+    """
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+        tcp_keepalive: Optional[float] = None,
+        timeout: Optional[Timeout] = None
+    ) -> None:
+        self.session: requests.Session = (
+            session if session is not None else requests.Session()
+        )
+        self.timeout: Optional[Timeout] = timeout
+        if (pool_connections is not None or pool_maxsize is not None or
+                tcp_keepalive is not None):
+            adapter = PoolAdapter(
+                socket_options=(
+                    keepalive_socket_options(tcp_keepalive)
+                    if tcp_keepalive is not None else None
+                ),
+                pool_connections=pool_connections or 10,
+                pool_maxsize=pool_maxsize or 10
+            )
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+        # The settings to send the requests with and the netrc credentials of
+        # the environment by host
+        self._environment: Dict[
+            Tuple[Any, ...], Tuple[Dict[str, Any], Any]
+        ] = {}
+
+    def _get_environment(self, url: str) -> Tuple[Dict[str, Any], Any]:
+        """
+        Return the proxies, CA bundle and client certificate to send requests
+        to the prepared URL with, and the netrc credentials of the
+        environment.
+        """
+        session: requests.Session = self.session
+        origin: str = url[:url.find("/", url.find("//") + 2)]
+        key = (
+            origin, session.trust_env, tuple(session.proxies.items()),
+            session.verify, session.cert
+        )
+        try:
+            return self._environment[key]
+        except KeyError:
+            pass
+
+        # Merge the settings with the environment as done by the session
+        settings: Dict[str, Any] = dict(session.merge_environment_settings(
+            url, {}, None, None, None
+        ))
+        del settings["stream"]
+        auth: Any = get_netrc_auth(url) if session.trust_env else None
+        self._environment[key] = (settings, auth)
+        return settings, auth
+
+    def _prepare(
+        self,
+        request: TransportRequest
+    ) -> Tuple[requests.PreparedRequest, Dict[str, Any]]:
+        """
+        Return the prepared request and the proxies, CA bundle and client
+        certificate to send it with.
+        """
+        session: requests.Session = self.session
+        url: str = _prepare_url(request.url)
+        settings, auth = self._get_environment(url)
+        if (session.auth or session.params or session.cookies or
+                any(session.hooks.values())):
+            return session.prepare_request(
+                requests.Request(
+                    request.method, request.url, headers=request.headers,
+                    data=request.body
+                )
+            ), settings
+
+        headers: CaseInsensitiveDict = CaseInsensitiveDict(session.headers)
+        headers.update(request.headers)
+        if request.body is not None:
+            headers["Content-Length"] = str(len(request.body))
+        elif request.method not in ("GET", "HEAD"):
+            headers["Content-Length"] = "0"
+
+        prepped = requests.PreparedRequest()
+        prepped.method = request.method
+        prepped.url = url
+        prepped.headers = headers
+        prepped.body = request.body
+        prepped._cookies = RequestsCookieJar()  # type: ignore
+        prepped.hooks = default_hooks()
+        if auth:
+            prepped.prepare_auth(auth)
+        return prepped, settings
+
+    def send(
+        self,
+        request: TransportRequest,
+        stream: bool = False,
+        timeout: Optional[Timeout] = None
+    ) -> TransportResponse:
+        prepped, settings = self._prepare(request)
+        response: requests.Response = self.session.send(
+            prepped, stream=stream,
+            timeout=timeout if timeout is not None else self.timeout,
+            **settings
+        )
+        if not stream:
+            return TransportResponse(
+                response.status_code, response.headers, response.content,
+                reason=response.reason or ""
+            )
+        return TransportResponse(
+            response.status_code, response.headers,
+            chunks=response.iter_content(chunk_size=64 * 1024),
+            reason=response.reason or "", close=response.close
+        )
+
+    def _get_pool(self, url: str) -> Any:
+        """
+        Return the urllib3 connection pool used for requests to the URL, if
+        the requests aren't sent through a proxy.
+        """
+        url = _prepare_url(url)
+        adapter = self.session.get_adapter(url)
+        settings, _ = self._get_environment(url)
+        if not isinstance(adapter, HTTPAdapter) or select_proxy(
+                url, settings["proxies"]):
+            return None
+
+        verify: Any = settings["verify"]
+        cert: Any = settings["cert"]
+        if hasattr(adapter, "get_connection_with_tls_context"):
+            # Get the pool in the same way as the adapter sends requests
+            prepped = requests.PreparedRequest()
+            prepped.prepare(method="GET", url=url)
+            pool = adapter.get_connection_with_tls_context(
+                prepped, verify, None, cert
+            )
+        else:
+            pool = adapter.get_connection(url, None)
+        adapter.cert_verify(pool, url, verify, cert)
+        return pool
+
+    def warm_up(
+        self,
+        url: str,
+        connections: int,
+        timeout: Optional[float] = None
+    ) -> int:
+        pool = self._get_pool(url)
+        if pool is None:
+            # Connections through a proxy are established by the proxy
+            return 0
+        return _warm_up_pool(pool, connections, timeout)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class Urllib3Transport(Transport):
+    """
+    Transport sending requests using a pooled urllib3 connection manager,
+    skipping the overhead of the requests library.
+
+    Args:
+        pool_maxsize (int): The maximum number of connections kept alive per
+            host, keep it at least as high as the number of threads making
+            requests
+        timeout (float): The number of seconds to wait for the connection and
+            for every read, waits indefinitely by default
+        pool_connections (int): The number of hosts to keep connections to
+        tcp_keepalive (float): Enable TCP keep-alive, sending the first
+            probe after a connection has been idle for the number of seconds
+        **kwargs: Passed to ``urllib3.PoolManager``
+    """
+
+    def __init__(
+        self,
+        pool_maxsize: int = 10,
+        timeout: Optional[float] = None,
+        pool_connections: int = 10,
+        tcp_keepalive: Optional[float] = None,
+        **kwargs: Any
+    ) -> None:
+        if tcp_keepalive is not None:
+            kwargs.setdefault(
+                "socket_options", keepalive_socket_options(tcp_keepalive)
+            )
+        self.pool: urllib3.PoolManager = urllib3.PoolManager(
+            num_pools=pool_connections, maxsize=pool_maxsize, **kwargs
+        )
+        self.timeout: Optional[float] = timeout
+
+    def send(
+        self,
+        request: TransportRequest,
+        stream: bool = False,
+        timeout: Optional[Timeout] = None
+    ) -> TransportResponse:
+        if timeout is not None:
+            pool_timeout: Any = urllib3.Timeout(
+                connect=timeout[0], read=timeout[1]
+            )
+        elif self.timeout is not None:
+            pool_timeout = urllib3.Timeout(self.timeout)
+        else:
+            pool_timeout = None
+        try:
+            response: Any = self.pool.urlopen(
+                request.method, request.url, body=request.body,
+                headers=request.headers, redirect=False, retries=False,
+                preload_content=not stream, timeout=pool_timeout
+            )
+        except urllib3.exceptions.ReadTimeoutError as exc:
+            raise requests.ReadTimeout(exc) from exc
+        except urllib3.exceptions.NewConnectionError as exc:
+            # Subclasses the timeout error, although the connection failed
+            raise requests.ConnectionError(exc) from exc
+        except urllib3.exceptions.ConnectTimeoutError as exc:
+            raise requests.ConnectTimeout(exc) from exc
+        except urllib3.exceptions.HTTPError as exc:
+            raise requests.ConnectionError(exc) from exc
+
+        if not stream:
+            return TransportResponse(
+                response.status, response.headers, response.data,
+                reason=response.reason or ""
+            )
+        return TransportResponse(
+            response.status, response.headers,
+            chunks=self._iter_chunks(response),
+            reason=response.reason or "", close=response.release_conn
+        )
+
+    @staticmethod
+    def _iter_chunks(response: Any) -> Iterator[bytes]:
+        try:
+            yield from response.stream(64 * 1024)
+        except urllib3.exceptions.HTTPError as exc:
+            raise requests.ConnectionError(exc) from exc
+
+    def warm_up(
+        self,
+        url: str,
+        connections: int,
+        timeout: Optional[float] = None
+    ) -> int:
+        return _warm_up_pool(
+            self.pool.connection_from_url(url), connections, timeout
+        )
+
+    def close(self) -> None:
+        self.pool.clear()
+
+
+class MemoryTransport(Transport):
+    """
+    Transport answering requests from memory without any network access, for
+    tests and benchmarks.
+
+    The responses are added by their method and URL. A URL without query
+    string matches all requests to the URL. Multiple responses added for the
+    same request are returned in order, after which the last one is repeated.
+    Requests without response are passed to the handler, if any, and answered
+    with a 404 response otherwise.
+
+    Args:
+        handler (callable): Called with the method, URL, headers and body of
+            requests without response, returning the status code, headers and
+            body of the response, e.g. ``FakeTransIPServer(...).handle``
+    """
+
+    def __init__(self, handler: Optional[Handler] = None) -> None:
+        self.handler: Optional[Handler] = handler
+        # The requests sent using the transport
+        self.requests: List[TransportRequest] = []
+        self._responses: Dict[
+            Tuple[str, str], Deque[Tuple[int, Dict[str, str], bytes]]
+        ] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def add(
+        self,
+        method: str,
+        url: str,
+        status: int = 200,
+        json: Optional[Any] = None,
+        body: bytes = b"",
+        headers: Optional[Mapping[str, str]] = None
+    ) -> None:
+        """
+        Add the response to a request.
+
+        Args:
+            method (str): The HTTP method of the request
+            url (str): The URL of the request
+            status (int): The HTTP status code of the response
+            json (dict): The JSON body of the response
+            body (bytes): The body of the response, if no JSON body is given
+            headers (dict): The headers of the response
+        """
+        response_headers: Dict[str, str] = dict(headers or {})
+        if json is not None:
+            body = _dumps(json)
+            response_headers.setdefault("Content-Type", "application/json")
+        with self._lock:
+            self._responses.setdefault(
+                (method.upper(), url), deque()
+            ).append((status, response_headers, body))
+
+    def reset(self) -> None:
+        """Remove all responses and sent requests."""
+        with self._lock:
+            self._responses.clear()
+            self.requests.clear()
+
+    def send(
+        self,
+        request: TransportRequest,
+        stream: bool = False,
+        timeout: Optional[Timeout] = None
+    ) -> TransportResponse:
+        with self._lock:
+            self.requests.append(request)
+            responses = (
+                self._responses.get((request.method, request.url)) or
+                self._responses.get(
+                    (request.method, request.url.split("?", 1)[0])
+                )
+            )
+            response: Optional[Tuple[int, Mapping[str, str], bytes]] = None
+            if responses:
+                response = (
+                    responses.popleft() if len(responses) > 1
+                    else responses[0]
+                )
+
+        if response is None:
+            if self.handler is None:
+                response = (
+                    404, {"Content-Type": "application/json"},
+                    b'{"error": "Not found"}'
+                )
+            else:
+                response = self.handler(
+                    request.method, request.url, dict(request.headers),
+                    request.body or b""
+                )
+        status, headers, body = response
+        return TransportResponse(status, headers, body)
+
+
+def _dumps(data: Any) -> bytes:
+    return json.dumps(data).encode()
@@ -17,9 +17,13 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
 
-from typing import Union
+from typing import (
+    Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+)
 
 import base64
+import codecs
+import json
 import secrets
 import string
 
@@ -52,6 +56,58 @@ def load_rsa_private_key(key: Union[bytes, str]) -> RSAPrivateKey:
     return private_key
 
 
+class MessageSigner:
+    """
+    Sign messages using a RSA private key.
+
+    The private key is parsed once, when creating the signer, and reused for
+    signing all messages.
+
+    Args:
+        private_key (str): The private key content, or the private RSA key,
+            used to sign the messages.
+    """
+
+    def __init__(self, private_key: Union[RSAPrivateKey, str]) -> None:
+        if isinstance(private_key, str):
+            private_key = load_rsa_private_key(private_key)
+        self._private_key: RSAPrivateKey = private_key
+
+    def sign(self, message: Union[str, bytes]) -> str:
+        """Return the BASE64 encoded SHA514 signature of a message.
+
+        Args:
+            message (str): The message to sign.
+
+        Returns:
+            str: The BASE64 encoded SHA514 signature of a message.
+        """
+        # Convert the message string to bytes
+        if isinstance(message, str):
+            message = message.encode()
+
+        # Sign the message using the private key
+        signature: bytes = self._private_key.sign(
+            message, PKCS1v15(), SHA512()
+        )
+
+        # Return the BASE64 encoded SHA512 signature
+        b64_bytes: bytes = base64.b64encode(signature)
+        return b64_bytes.decode('ascii')
+
+    def sign_many(self, messages: Iterable[Union[str, bytes]]) -> List[str]:
+        """Return the BASE64 encoded SHA514 signatures of multiple messages.
+
+        Args:
+            messages (iterable): The messages to sign.
+
+        Returns:
+            list: The BASE64 encoded SHA514 signatures in the same order as the
+                messages.
+        """
+        return [self.sign(message) for message in messages]
+
+
 def generate_message_signature(
     message: Union[str, bytes],
     private_key: Union[RSAPrivateKey, str]
@@ -65,20 +121,7 @@ def generate_message_signature(
     Returns:
         str: The BASE64 encoded SHA514 signature of a message.
     """
-    # Convert the message string to bytes
-    if isinstance(message, str):
-        message = message.encode()
-
-    # Convert the private key content to an asymmetric private key type
-    if isinstance(private_key, str):
-        private_key = load_rsa_private_key(private_key)
-
-    # Sign the message using the private key
-    signature: bytes = private_key.sign(message, PKCS1v15(), SHA512())
-
-    # Return the BASE64 encoded SHA512 signature
-    b64_bytes: bytes = base64.b64encode(signature)
-    return b64_bytes.decode('ascii')
+    return MessageSigner(private_key).sign(message)
 
 
 def generate_nonce(length: int, alphabet: str = None) -> str:
@@ -100,3 +143,289 @@ def generate_nonce(length: int, alphabet: str = None) -> str:
 
     alphabet = alphabet or (string.ascii_letters + string.digits)
     return ''.join(secrets.choice(alphabet) for i in range(length))
+
+
+def get_token_expiration(token: str) -> Optional[float]:
+    """
+    Return the expiration time of an access token.
+
+    Args:
+        token (str): The access token in the form of a JSON Web Token.
+
+    Returns:
+        float: The expiration time as UNIX timestamp, or None if the
+            expiration time couldn't be extracted from the token.
+    """
+    try:
+        payload = token.split(".")[1]
+        # Restore the padding stripped from the base64url encoded payload
+        payload += "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload.encode()))
+        return float(claims["exp"])
+    except (IndexError, ValueError, TypeError, KeyError):
+        return None
+
+
+def freeze_params(
+    params: Optional[Dict[str, Any]] = None
+) -> Tuple[Tuple[str, Any], ...]:
+    """
+    Return the URL parameters as a hashable tuple sorted by name, e.g. to use
+    them as part of a key. Lists of values are turned into tuples.
+
+    Args:
+        params (dict): The URL parameters of a request.
+
+    Returns:
+        tuple: The names and values of the parameters.
+    """
+    return tuple(sorted(
+        (name, tuple(value) if isinstance(value, list) else value)
+        for name, value in (params or {}).items()
+    ))
+
+
+# Decodes the content of a JSON string, using the C implementation if any. It
+# isn't part of the type stubs of the json module.
+_scanstring: Callable[[str, int], Tuple[str, int]] = getattr(
+    json.decoder, "scanstring"
+)
+
+
+class _JSONStreamReader:
+    """Read JSON values from a stream of bytes, one value at a time."""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks: Iterator[bytes] = iter(chunks)
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder: json.JSONDecoder = json.JSONDecoder()
+        self._buffer: str = ""
+        self._pos: int = 0
+        self._eof: bool = False
+
+    def _fill(self) -> bool:
+        """
+        Append the next chunk to the buffer, dropping the consumed part of the
+        buffer. Returns False if the end of the stream has been reached.
+        """
+        if self._eof:
+            return False
+        for chunk in self._chunks:
+            text = self._text_decoder.decode(chunk)
+            if text:
+                self._buffer = self._buffer[self._pos:] + text
+                self._pos = 0
+                return True
+        self._buffer += self._text_decoder.decode(b"", final=True)
+        self._eof = True
+        return False
+
+    def peek(self) -> str:
+        """
+        Return the next non-whitespace character without consuming it, or an
+        empty string at the end of the stream.
+        """
+        while True:
+            while (self._pos < len(self._buffer) and
+                    self._buffer[self._pos] in " \t\n\r"):
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        """
+        Consume and return the next non-whitespace character.
+
+        Raises:
+            ValueError: If the character isn't one of the expected characters.
+        """
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(
+                f"Expected one of '{chars}' but found '{char or 'EOF'}'"
+            )
+        self._pos += 1
+        return char
+
+    def decode(self) -> Any:
+        """
+        Consume and return the next JSON value.
+
+        Raises:
+            ValueError: If the value isn't valid JSON.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(
+                    self._buffer, self._pos
+                )
+            except ValueError:
+                # The value may not have been read completely
+                if not self._fill():
+                    raise
+                continue
+            # A value which isn't followed by a delimiter, e.g. a number at the
+            # end of the buffer, may continue in the next chunk
+            if (end == len(self._buffer) or
+                    self._buffer[end] not in " \t\n\r,:]}"):
+                if self._fill():
+                    continue
+            self._pos = end
+            return value
+
+    def iter_string(self) -> Iterator[str]:
+        """
+        Consume the next JSON string, yielding its content in parts as soon as
+        they are read from the stream.
+
+        Raises:
+            ValueError: If the value isn't a valid JSON string.
+        """
+        self.expect('"')
+        while True:
+            buffer, pos = self._buffer, self._pos
+            quote = buffer.find('"', pos)
+            while quote >= 0 and _is_escaped(buffer, quote, pos):
+                quote = buffer.find('"', quote + 1)
+            end = quote if quote >= 0 else _get_complete_end(buffer, pos)
+
+            # Decode all characters and escape sequences read so far at once
+            if end > pos:
+                part = buffer[pos:end]
+                yield _scanstring(part + '"', 0)[0] if "\\" in part else part
+                self._pos = end
+            if quote >= 0:
+                self._pos = quote + 1
+                return
+            if not self._fill():
+                raise ValueError("Unterminated string")
+
+
+def _is_escaped(buffer: str, index: int, start: int) -> bool:
+    """
+    Return whether the character at the index is escaped by a backslash,
+    looking back no further than the start.
+    """
+    count: int = 0
+    while index - count > start and buffer[index - count - 1] == "\\":
+        count += 1
+    return count % 2 == 1
+
+
+def _get_complete_end(buffer: str, start: int) -> int:
+    """
+    Return the end of the content of a JSON string in the buffer, excluding
+    an incomplete escape sequence at the end of the buffer. A high surrogate
+    at the end is excluded as well, to be decoded along with the low
+    surrogate following it.
+    """
+    end: int = len(buffer)
+    while True:
+        # An escape sequence, or a surrogate pair, is at most 12 characters
+        index = buffer.rfind("\\", max(start, end - 11), end)
+        if index < 0 or _is_escaped(buffer, index, start):
+            return end
+        length: int = 6 if buffer[index + 1:index + 2] == "u" else 2
+        if (index + length <= end and not (
+                length == 6 and
+                "d800" <= buffer[index + 2:index + 6].lower() < "dc00")):
+            return end
+        end = index
+
+
+def _find_json_key(reader: _JSONStreamReader, key: str) -> None:
+    """
+    Consume the JSON object up to the value stored under the key.
+
+    Raises:
+        ValueError: If the stream doesn't contain a valid JSON object.
+        KeyError: If the JSON object doesn't contain the key.
+    """
+    reader.expect("{")
+    if reader.peek() == "}":
+        raise KeyError(key)
+
+    while True:
+        name = reader.decode()
+        reader.expect(":")
+        if name == key:
+            return
+        # Skip the values of all other keys
+        reader.decode()
+        if reader.expect(",}") == "}":
+            raise KeyError(key)
+
+
+def iter_json_array(chunks: Iterable[bytes], key: str) -> Iterator[Any]:
+    """
+    Incrementally parse a JSON object from a stream of bytes, yielding the
+    elements of the array stored under the key as soon as they are decoded.
+
+    Only the element being decoded is held in memory, the stream isn't read
+    any further after the end of the array.
+
+    Args:
+        chunks (iterable): The UTF-8 encoded JSON object in chunks.
+        key (str): The key of the array in the JSON object.
+
+    Raises:
+        ValueError: If the stream doesn't contain a valid JSON object.
+        KeyError: If the JSON object doesn't contain the key.
+    """
+    reader = _JSONStreamReader(chunks)
+    _find_json_key(reader, key)
+    reader.expect("[")
+    if reader.peek() == "]":
+        return
+    while True:
+        yield reader.decode()
+        if reader.expect(",]") == "]":
+            return
+
+
+def iter_json_string(chunks: Iterable[bytes], key: str) -> Iterator[str]:
+    """
+    Incrementally parse a JSON object from a stream of bytes, yielding the
+    content of the string stored under the key in parts as soon as they are
+    decoded.
+
+    Args:
+        chunks (iterable): The UTF-8 encoded JSON object in chunks.
+        key (str): The key of the string in the JSON object.
+
+    Raises:
+        ValueError: If the stream doesn't contain a valid JSON object.
+        KeyError: If the JSON object doesn't contain the key.
+    """
+    reader = _JSONStreamReader(chunks)
+    _find_json_key(reader, key)
+    if reader.peek() != '"':
+        raise ValueError(f"The value of '{key}' isn't a string")
+    yield from reader.iter_string()
+
+
+def iter_base64_decode(chunks: Iterable[str]) -> Iterator[bytes]:
+    """
+    Decode base64 encoded data in chunks, without holding all data in memory.
+
+    Args:
+        chunks (iterable): The base64 encoded data in chunks of any size.
+
+    Raises:
+        ValueError: If the data isn't correctly base64 encoded.
+    """
+    pending: str = ""
+    for chunk in chunks:
+        # Drop whitespace, e.g. line breaks, which isn't part of any group
+        pending += "".join(chunk.split())
+        # Only decode complete groups of four characters
+        size: int = len(pending) - len(pending) % 4
+        if size:
+            yield base64.b64decode(pending[:size])
+            pending = pending[size:]
+    # Ignore any excess padding
+    if pending.strip("="):
+        yield base64.b64decode(pending)
@@ -18,9 +18,15 @@
 # along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
 
 import os
-import base64
+import datetime
+import tempfile
+import time
 
-from typing import Optional, Type, List, Dict, Any
+from typing import (
+    Optional, Type, List, Dict, Any, Iterator, Iterable, Mapping, NamedTuple,
+    Tuple, Union
+)
+from collections import defaultdict
 
 from transip.base import ApiService, ApiObject
 from transip.mixins import (
@@ -29,6 +35,8 @@ from transip.mixins import (
     AttrsTuple
 )
 from transip.exceptions import TransIPIOError
+from transip.v6 import schema
+from transip.utils import iter_base64_decode
 
 
 class ApiTestService(ApiService):
@@ -50,6 +58,9 @@ class ApiTestService(ApiService):
 
 class ProductElement(ApiObject):
 
+    __slots__ = ()
+    _fields = schema.PRODUCT_ELEMENT
+
     _id_attr: str = "name"
 
 
@@ -64,6 +75,9 @@ class ProductElementService(ListMixin, ApiService):
 
 class Product(ApiObject):
 
+    __slots__ = ()
+    _fields = schema.PRODUCT
+
     _id_attr: Optional[str] = "name"
 
     @property
@@ -83,15 +97,19 @@ class ProductService(ListMixin, ApiService):
 
     _resp_list_attr: str = "products"
 
-    def list(self) -> List[Type[ApiObject]]:
+    def list(
+        self,
+        page_size: Optional[int] = None
+    ) -> List[ApiObject]:
         """
         Retrieve a list of products.
 
         Overwrites the default list() method of the ListMixin as the products
-        are stored in further down in the result dictionary.
+        are stored in further down in the result dictionary. The products are
+        always retrieved at once.
         """
-        objs: List[Type[ApiObject]] = []
-        data = self.client.get(self.path)[self._resp_list_attr]
+        objs: List[ApiObject] = []
+        data = self.client.get(self.path, cache=True)[self._resp_list_attr]
         # Loop over the individual product lists of all product categories,
         # e.g. vps, haip
         for obj_list in data.values():
@@ -99,9 +117,34 @@ class ProductService(ListMixin, ApiService):
                 objs.append(self._obj_cls(self, obj))  # type: ignore
         return objs
 
+    def iter(
+        self,
+        page_size: int = 100,
+        prefetch: bool = False
+    ) -> Iterator[ApiObject]:
+        """
+        Iterate over the products.
+
+        Overwrites the default iter() method of the ListMixin as the products
+        can't be retrieved page by page.
+        """
+        return iter(self.list())
+
+    def stream(self) -> Iterator[ApiObject]:
+        """
+        Iterate over the products.
+
+        Overwrites the default stream() method of the ListMixin as the
+        products are stored in further down in the result dictionary.
+        """
+        return iter(self.list())
+
 
 class AvailabilityZone(ApiObject):
 
+    __slots__ = ()
+    _fields = schema.AVAILABILITY_ZONE
+
     _id_attr: str = "name"
 
 
@@ -115,6 +158,9 @@ class AvailabilityZoneService(ListMixin, ApiService):
 
 class SshKey(ObjectDeleteMixin, ObjectUpdateMixin, ApiObject):
 
+    __slots__ = ()
+    _fields = schema.SSH_KEY
+
     _id_attr: str = "id"
 
 
@@ -139,6 +185,9 @@ class SshKeyService(GetMixin, CreateMixin, UpdateMixin, DeleteMixin, ListMixin,
 
 class WhoisContact(ApiObject):
 
+    __slots__ = ()
+    _fields = schema.WHOIS_CONTACT
+
     _id_attr: Optional[str] = None
 
 
@@ -151,10 +200,65 @@ class WhoisContactService(ListMixin, ApiService):
     _resp_list_attr: str = "contacts"
 
 
+class DnsEntryKey(NamedTuple):
+    """The identity of a DNS entry, see DnsEntry.key."""
+
+    name: str
+    type: str
+    content: str
+    expire: int
+
+
+class DnsSyncReport(NamedTuple):
+    """
+    The changes made to the DNS entries of a domain by DnsEntryService.sync().
+
+    Attributes:
+        created: The DNS entries which have been added.
+        updated: The DNS entries of which the content has been updated, as
+            tuples of the old and the new DNS entry.
+        deleted: The DNS entries which have been removed.
+        unchanged: The number of DNS entries which were left as is.
+        replaced: Whether all DNS entries have been replaced at once, instead
+            of making a request for every change.
+    """
+
+    created: List[DnsEntryKey]
+    updated: List[Tuple[DnsEntryKey, DnsEntryKey]]
+    deleted: List[DnsEntryKey]
+    unchanged: int
+    replaced: bool
+
+    @property
+    def changed(self) -> bool:
+        """Whether any DNS entry has been changed."""
+        return bool(self.created or self.updated or self.deleted)
+
+    @property
+    def calls(self) -> int:
+        """The number of requests made to apply the changes."""
+        if not self.changed:
+            return 0
+        if self.replaced:
+            return 1
+        return len(self.created) + len(self.updated) + len(self.deleted)
+
+
 class DnsEntry(ObjectUpdateMixin, ApiObject):
 
+    __slots__ = ()
+    _fields = schema.DNS_ENTRY
+
     _id_attr: Optional[str] = None
 
+    @property
+    def key(self) -> DnsEntryKey:
+        """
+        Return the identity of the DNS entry, which can be used to compare DNS
+        entries or to store them in a set.
+        """
+        return DnsEntryKey(self.name, self.type, self.content, self.expire)
+
     def delete(self) -> None:
         """
         Delete a single DNS entry by calling the delete() method on its service
@@ -164,7 +268,7 @@ class DnsEntry(ObjectUpdateMixin, ApiObject):
         as the deletion of a DNS entry requires all attributes of a single DNS
         entry and the DnsEntry does not have an ID.
         """
-        self.service.delete(self.attrs)  # type: ignore
+        self.service.delete(dict(self.attrs))  # type: ignore
 
     def update(self) -> None:
         """
@@ -243,7 +347,7 @@ class DnsEntryService(CreateMixin, ListMixin, ReplaceMixin, ApiService):
 
     def _check_required_attrs(
         self,
-        attrs: Dict[str, Any],
+        attrs: Mapping[str, Any],
         expected_attrs: AttrsTuple,
     ) -> None:
         """
@@ -267,13 +371,15 @@ class DnsEntryService(CreateMixin, ListMixin, ReplaceMixin, ApiService):
                 f"attribute{'s'[:len(missing)!=1]} '{attrs_str}'"
             ))
 
-    def delete(self, data: Optional[Dict[str, Any]] = None) -> None:
+    def _get_delete_data(
+        self,
+        data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
-        Delete a DNS entry.
+        Return the request body for deleting a DNS entry.
 
-        This is different from the delete() method from the DeleteMixin as the
-        deletion of a DNS entry requires all attributes of a single DNS entry
-        and the DNS entries do not have an ID.
+        Raises:
+            AttributeError: If any of the required attributes is missing.
         """
         if data is None:
             data = {}
@@ -282,18 +388,17 @@ class DnsEntryService(CreateMixin, ListMixin, ReplaceMixin, ApiService):
         self._check_required_attrs(data, self.get_delete_attrs())
 
         # Requires the endpoint to be packed in dictionary with a specific key
-        data = {self._req_delete_attr: data}
-
-        if self.path:
-            self.client.delete(f"{self.path}", json=data)
+        return {self._req_delete_attr: data}
 
-    def update(self, data: Optional[Dict[str, Any]] = None) -> None:
+    def _get_update_data(
+        self,
+        data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
-        Update a single DnsEntry.
+        Return the request body for updating a DNS entry.
 
-        This is different from the update() method from the UpdateMixin because
-        a DnsEntry doesn't have a ID and the HTTP method needs to be PATCH
-        instead of PUT.
+        Raises:
+            AttributeError: If any of the required attributes is missing.
         """
         if data is None:
             data = {}
@@ -302,8 +407,176 @@ class DnsEntryService(CreateMixin, ListMixin, ReplaceMixin, ApiService):
         self._check_required_attrs(data, self.get_update_attrs())
 
         # Requires the endpoint to be packed in dictionary with a specific key
-        data = {self._req_update_attr: data}
+        return {self._req_update_attr: data}
+
+    # The fraction of the desired DNS entries which has to change before all
+    # DNS entries are replaced at once when syncing
+    _sync_replace_threshold: float = 0.5
 
+    def _get_dns_entry_key(
+        self,
+        entry: Union[DnsEntry, Mapping[str, Any]]
+    ) -> DnsEntryKey:
+        """
+        Return the identity of a DNS entry given as DnsEntry or dictionary.
+
+        Raises:
+            AttributeError: If any of the required attributes is missing.
+        """
+        if isinstance(entry, DnsEntry):
+            return entry.key
+        self._check_required_attrs(entry, self.get_create_attrs())
+        return DnsEntryKey(
+            entry["name"], entry["type"], entry["content"], entry["expire"]
+        )
+
+    def _get_sync_report(
+        self,
+        current: Iterable[Mapping[str, Any]],
+        entries: Iterable[Union[DnsEntry, Mapping[str, Any]]],
+        replace: Optional[bool] = None
+    ) -> DnsSyncReport:
+        """
+        Return the changes needed to turn the current DNS entries into the
+        desired DNS entries, and whether to replace all entries at once.
+        """
+        current_keys = {self._get_dns_entry_key(entry) for entry in current}
+        desired_keys = {self._get_dns_entry_key(entry) for entry in entries}
+
+        created = desired_keys - current_keys
+        deleted = current_keys - desired_keys
+        updated: List[Tuple[DnsEntryKey, DnsEntryKey]] = []
+
+        # The content of a DNS entry can be updated in place, as long as it's
+        # the only entry with the same name, expire and type, both before and
+        # after the update
+        groups: Dict[Tuple[str, int, str], List[List[DnsEntryKey]]] = (
+            defaultdict(lambda: [[], []])
+        )
+        for key in current_keys:
+            groups[(key.name, key.expire, key.type)][0].append(key)
+        for key in desired_keys:
+            groups[(key.name, key.expire, key.type)][1].append(key)
+        for old, new in groups.values():
+            if (len(old) == 1 and len(new) == 1 and
+                    old[0] in deleted and new[0] in created):
+                updated.append((old[0], new[0]))
+                deleted.remove(old[0])
+                created.remove(new[0])
+
+        calls = len(created) + len(updated) + len(deleted)
+        if replace is None:
+            # A single request uploading the whole zone is cheaper than a lot
+            # of small requests, but it rewrites every entry, so it's only
+            # done when most of the zone changes anyway
+            replace = calls > max(
+                1, len(desired_keys) * self._sync_replace_threshold
+            )
+
+        return DnsSyncReport(
+            created=sorted(created),
+            updated=sorted(updated),
+            deleted=sorted(deleted),
+            unchanged=len(current_keys & desired_keys),
+            replaced=replace and calls > 0
+        )
+
+    def _get_sync_requests(
+        self,
+        report: DnsSyncReport,
+        entries: Iterable[Union[DnsEntry, Mapping[str, Any]]]
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Return the HTTP method and the request body of every request needed to
+        apply the changes of the report.
+        """
+        if not report.changed:
+            return []
+        if report.replaced:
+            keys = sorted(
+                {self._get_dns_entry_key(entry) for entry in entries}
+            )
+            return [("PUT", {
+                self._req_replace_attr: [dict(key._asdict()) for key in keys]
+            })]
+
+        # Delete the entries first, as new entries may conflict with them,
+        # e.g. when replacing an A record with a CNAME record
+        requests: List[Tuple[str, Dict[str, Any]]] = []
+        for key in report.deleted:
+            requests.append(
+                ("DELETE", self._get_delete_data(dict(key._asdict())))
+            )
+        for old, new in report.updated:
+            requests.append(
+                ("PATCH", self._get_update_data(dict(new._asdict())))
+            )
+        for key in report.created:
+            requests.append(
+                ("POST", self._get_create_data(dict(key._asdict())))
+            )
+        return requests
+
+    def sync(
+        self,
+        entries: Iterable[Union[DnsEntry, Mapping[str, Any]]],
+        replace: Optional[bool] = None
+    ) -> DnsSyncReport:
+        """
+        Make the DNS entries of the domain match the given DNS entries, using
+        as few requests as possible.
+
+        The current DNS entries are compared to the given entries, after which
+        the differences are either applied one by one, updating the content of
+        entries in place where possible, or, when the number of changes
+        exceeds half the number of given entries, all entries are replaced at
+        once.
+
+        Args:
+            entries: The desired DNS entries, as DnsEntry objects or
+                dictionaries containing the name, expire, type and content.
+            replace (bool): Always (True) or never (False) replace all entries
+                at once, instead of depending on the number of changes.
+
+        Returns:
+            DnsSyncReport: The changes made to the DNS entries.
+
+        Raises:
+            AttributeError: If any of the required attributes is missing.
+            TransIPTimeoutError: If the deadline of the current context, see
+                TransIP.within(), passes before all changes are made. The
+                remaining changes aren't made.
+        """
+        entries = list(entries)
+        # Bypass the response cache, as the changes are based upon the current
+        # DNS entries
+        current = self.client.get(self.path)[self._resp_list_attr]
+        report = self._get_sync_report(current, entries, replace)
+        for method, data in self._get_sync_requests(report, entries):
+            self.client.request(method, self.path, json=data)
+        return report
+
+    def delete(self, data: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Delete a DNS entry.
+
+        This is different from the delete() method from the DeleteMixin as the
+        deletion of a DNS entry requires all attributes of a single DNS entry
+        and the DNS entries do not have an ID.
+        """
+        data = self._get_delete_data(data)
+        if self.path:
+            self.client.delete(f"{self.path}", json=data)
+
+    def update(self, data: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Update a single DnsEntry.
+
+        This is different from the update() method from the UpdateMixin because
+        a DnsEntry doesn't have a ID and the HTTP method needs to be PATCH
+        instead of PUT.
+        """
+        data = self._get_update_data(data)
         if self.path:
             # Use the PATCH method to update a single DnsEntry.
             self.client.patch(f"{self.path}", json=data)
@@ -311,6 +584,9 @@ class DnsEntryService(CreateMixin, ListMixin, ReplaceMixin, ApiService):
 
 class Nameserver(ApiObject):
 
+    __slots__ = ()
+    _fields = schema.NAMESERVER
+
     _id_attr: Optional[str] = "hostname"
 
 
@@ -333,6 +609,9 @@ class NameserverService(ListMixin, ReplaceMixin, ApiService):
 
 class Domain(ApiObject):
 
+    __slots__ = ()
+    _fields = schema.DOMAIN
+
     _id_attr: str = "name"
 
     @property
@@ -376,7 +655,9 @@ class DomainService(CreateMixin, GetMixin, DeleteMixin, ListMixin, ApiService):
 
 
 class InvoiceItem(ApiObject):
-    pass
+
+    __slots__ = ()
+    _fields = schema.INVOICE_ITEM
 
 
 class InvoiceItemService(ListMixin, ApiService):
@@ -390,6 +671,9 @@ class InvoiceItemService(ListMixin, ApiService):
 
 class Invoice(ApiObject):
 
+    __slots__ = ()
+    _fields = schema.INVOICE
+
     _id_attr: str = "invoiceNumber"
 
     @property
@@ -418,25 +702,84 @@ class Invoice(ApiObject):
         if not invoice_id:
             return None
 
-        # Retrieve the base64 encoded PDF data
-        encoded = self.service.client.get(f"/invoices/{invoice_id}/pdf")["pdf"]
-        data = base64.b64decode(encoded.encode('ascii'))
-
         file_path = os.path.abspath(file_path)
         if os.path.isdir(file_path):
             file_path = os.path.join(file_path, f"{invoice_id}.pdf")
         if os.path.exists(file_path):
             raise TransIPIOError(f"File {file_path} already exists")
 
+        self._download_pdf(file_path)
+        return file_path
+
+    def _download_pdf(self, file_path: str) -> int:
+        """
+        Stream the PDF data of the invoice to file, decoding the base64 encoded
+        PDF data as it's received.
+
+        The PDF data is written to a temporary file in the same directory,
+        which is renamed once complete. An existing file is replaced.
+
+        Returns:
+            int: The number of bytes written.
+
+        Raises:
+            TransIPIOError: If the PDF data couldn't be written to file.
+        """
+        invoice_id = self.get_id()
+        encoded = self.service.client.stream_string(
+            f"/invoices/{invoice_id}/pdf", "pdf"
+        )
+
+        size: int = 0
+        try:
+            fd, tmp_path = tempfile.mkstemp(
+                prefix=f".{invoice_id}.", suffix=".part",
+                dir=os.path.dirname(file_path)
+            )
+        except OSError as exc:
+            raise TransIPIOError(
+                f"Unable to write PDF file {file_path}"
+            ) from exc
         try:
-            with open(file_path, 'wb') as pdf_file:
-                pdf_file.write(data)
+            with os.fdopen(fd, 'wb') as pdf_file:
+                for data in iter_base64_decode(encoded):
+                    pdf_file.write(data)
+                    size += len(data)
+            os.replace(tmp_path, file_path)
         except OSError as exc:
+            os.unlink(tmp_path)
             raise TransIPIOError(
                 f"Unable to write PDF file {file_path}"
             ) from exc
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return size
+
+
+class InvoiceDownloadReport(NamedTuple):
+    """
+    The outcome of downloading invoices by InvoiceService.download_all().
+
+    Attributes:
+        downloaded: The paths of the PDF files which have been written.
+        skipped: The paths of the PDF files which already existed.
+        failed: The exception raised for each invoice that failed to download,
+            by invoice number.
+        bytes: The number of bytes written.
+        seconds: The time taken to download the invoices.
+    """
+
+    downloaded: List[str]
+    skipped: List[str]
+    failed: Dict[str, Exception]
+    bytes: int
+    seconds: float
 
-        return file_path
+    @property
+    def bytes_per_second(self) -> float:
+        """Return the number of bytes written per second."""
+        return self.bytes / self.seconds if self.seconds > 0 else 0.0
 
 
 class InvoiceService(GetMixin, ListMixin, ApiService):
@@ -447,9 +790,107 @@ class InvoiceService(GetMixin, ListMixin, ApiService):
     _resp_list_attr: str = "invoices"
     _resp_get_attr: str = "invoice"
 
+    def download_all(
+        self,
+        directory: str,
+        since: Optional[Union[datetime.date, str]] = None,
+        max_workers: int = 4
+    ) -> InvoiceDownloadReport:
+        """
+        Download the PDF files of all invoices to a directory, named by their
+        invoice number.
+
+        The invoices are downloaded concurrently, and the PDF data is decoded
+        while it's received instead of holding it in memory. Invoices of which
+        the PDF file already exists are skipped.
+
+        Args:
+            directory (str): The directory to save the PDF files in.
+            since (date): Only download the invoices created on or after this
+                date, either a date or a string in the form of 'YYYY-MM-DD'.
+            max_workers (int): The maximum number of concurrent downloads.
+
+        Returns:
+            InvoiceDownloadReport: The invoices that have been downloaded,
+                skipped or failed, and the download speed.
+
+        Raises:
+            TransIPIOError: If the directory doesn't exist.
+        """
+        pending, skipped = self._get_download_targets(
+            self.list(), directory, since
+        )
+        start: float = time.monotonic()
+        results = self.client.map(
+            lambda target: target[0]._download_pdf(target[1]),
+            pending, max_workers=max_workers
+        )
+        return self._get_download_report(
+            pending, skipped, results, time.monotonic() - start
+        )
+
+    @staticmethod
+    def _get_download_targets(
+        invoices: Iterable[ApiObject],
+        directory: str,
+        since: Optional[Union[datetime.date, str]] = None
+    ) -> Tuple[List[Tuple[Invoice, str]], List[str]]:
+        """
+        Return the invoices to download with the paths of their PDF files, and
+        the paths of the PDF files that already exist.
+
+        Raises:
+            TransIPIOError: If the directory doesn't exist.
+        """
+        directory = os.path.abspath(directory)
+        if not os.path.isdir(directory):
+            raise TransIPIOError(f"Directory {directory} doesn't exist")
+        if isinstance(since, datetime.date):
+            since = since.isoformat()
+
+        pending: List[Tuple[Invoice, str]] = []
+        skipped: List[str] = []
+        for invoice in invoices:
+            if not isinstance(invoice, Invoice):
+                continue
+            # The creation date is formatted as 'YYYY-MM-DD', which sorts the
+            # same as the dates themselves
+            if since and (invoice.creationDate or "") < since:
+                continue
+            file_path = os.path.join(directory, f"{invoice.get_id()}.pdf")
+            if os.path.exists(file_path):
+                skipped.append(file_path)
+            else:
+                pending.append((invoice, file_path))
+        return pending, skipped
+
+    @staticmethod
+    def _get_download_report(
+        pending: List[Tuple[Invoice, str]],
+        skipped: List[str],
+        results: List[Union[int, Exception]],
+        seconds: float
+    ) -> InvoiceDownloadReport:
+        """Return the report of the downloaded invoices."""
+        downloaded: List[str] = []
+        failed: Dict[str, Exception] = {}
+        size: int = 0
+        for (invoice, file_path), result in zip(pending, results):
+            if isinstance(result, Exception):
+                failed[str(invoice.get_id())] = result
+            else:
+                downloaded.append(file_path)
+                size += result
+        return InvoiceDownloadReport(
+            downloaded, skipped, failed, size, seconds
+        )
+
 
 class Vps(ApiObject):
 
+    __slots__ = ()
+    _fields = schema.VPS
+
     _id_attr: str = "name"
 
 
@@ -464,6 +905,9 @@ class VpsService(GetMixin, DeleteMixin, ListMixin, ApiService):
 
 class Colocation(ApiObject):
 
+    __slots__ = ()
+    _fields = schema.COLOCATION
+
     _id_attr: str = "name"
 
 
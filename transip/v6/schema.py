@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020, 2021 Roald Nefs <info@roaldnefs.com>
+#
+# This file is part of python-transip.
+#
+# python-transip is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-transip is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-transip.  If not, see <https://www.gnu.org/licenses/>.
+"""
+The fields of the resources of the TransIP API v6, see
+https://api.transip.nl/rest/docs.html.
+
+The ApiObject classes declaring these fields store them as real attributes,
+any other field returned by the API is still available as attribute of the
+object.
+"""
+
+from typing import Tuple
+
+
+Fields = Tuple[str, ...]
+
+PRODUCT: Fields = ("name", "description", "price", "recurringPrice")
+
+PRODUCT_ELEMENT: Fields = ("name", "description", "amount")
+
+AVAILABILITY_ZONE: Fields = ("name", "country", "isDefault")
+
+SSH_KEY: Fields = (
+    "id", "key", "description", "creationDate", "fingerprint"
+)
+
+WHOIS_CONTACT: Fields = (
+    "type", "firstName", "lastName", "companyName", "companyKvk",
+    "companyType", "street", "number", "postalCode", "city", "phoneNumber",
+    "faxNumber", "email", "country"
+)
+
+DNS_ENTRY: Fields = ("name", "expire", "type", "content")
+
+NAMESERVER: Fields = ("hostname", "ipv4", "ipv6")
+
+DOMAIN: Fields = (
+    "name", "authCode", "isTransferLocked", "registrationDate",
+    "renewalDate", "isWhitelabel", "cancellationDate", "cancellationStatus",
+    "isDnsOnly", "tags", "canEditDns", "hasAutoDns", "hasDnsSec", "status"
+)
+
+INVOICE_ITEM: Fields = (
+    "product", "description", "isRecurring", "date", "quantity", "price",
+    "priceInclVat", "vat", "vatPercentage", "discounts"
+)
+
+INVOICE: Fields = (
+    "invoiceNumber", "creationDate", "payDate", "dueDate", "invoiceStatus",
+    "currency", "totalAmount", "totalAmountInclVat"
+)
+
+VPS: Fields = (
+    "name", "uuid", "description", "productName", "operatingSystem",
+    "diskSize", "memorySize", "cpus", "status", "ipAddress", "macAddress",
+    "currentSnapshots", "maxSnapshots", "isLocked", "isBlocked",
+    "isCustomerLocked", "availabilityZone", "tags"
+)
+
+COLOCATION: Fields = ("name", "ipRanges")